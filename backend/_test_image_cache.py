@@ -0,0 +1,110 @@
+"""
+Content-addressed cache for the image test scripts
+
+Maps a generation request (prompt, NSFW level, size, backend) to an image
+already saved in IMAGES_DIR, so re-running a test skips inference for
+requests that did not change. Pass --no-cache to a test script to bypass it.
+
+Index: IMAGES_DIR/.cache/index.json, LRU-capped at MAX_ENTRIES. An entry
+whose image is older than TTL_SECONDS (file mtime) or gone is a miss.
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from config import settings
+
+MAX_ENTRIES = 200
+TTL_SECONDS = 7 * 86400
+
+_IMAGES_DIR = Path(settings.IMAGES_DIR)
+_INDEX_PATH = _IMAGES_DIR / ".cache" / "index.json"
+
+_index: Optional[dict] = None
+# get/put may be called from a worker thread (gradio_client tests run in to_thread)
+_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    """False when the running script was given --no-cache"""
+    return "--no-cache" not in sys.argv
+
+
+def make_key(prompt: str, nsfw_level: int, width: int, height: int, backend: str = "") -> str:
+    """backend tells apart scripts that can generate the same request on several backends"""
+    payload = json.dumps({"p": prompt, "n": nsfw_level, "w": width, "h": height, "b": backend}, sort_keys=True)
+    return hashlib.blake2b(payload.encode()).hexdigest()
+
+
+def _load() -> dict:
+    global _index
+    if _index is None:
+        try:
+            _index = json.loads(_INDEX_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+
+def _save():
+    _INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = _INDEX_PATH.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(_index), encoding="utf-8")
+    os.replace(tmp_path, _INDEX_PATH)
+
+
+def get(key: str) -> Optional[Path]:
+    """Path of the cached image for key, or None"""
+    with _lock:
+        index = _load()
+        entry = index.get(key)
+        if entry is None:
+            return None
+
+        path = _IMAGES_DIR / entry["file"]
+        try:
+            fresh = time.time() - path.stat().st_mtime < TTL_SECONDS
+        except OSError:
+            fresh = False
+
+        if not fresh:
+            del index[key]
+            _save()
+            return None
+
+        entry["used"] = time.time()
+        _save()
+        return path
+
+
+def put(key: str, path: Path):
+    """Remember the image generated for key, evicting least recently used entries"""
+    with _lock:
+        index = _load()
+        index[key] = {"file": Path(path).name, "used": time.time()}
+
+        if len(index) > MAX_ENTRIES:
+            oldest = sorted(index, key=lambda k: index[k]["used"])[:len(index) - MAX_ENTRIES]
+            for old_key in oldest:
+                del index[old_key]
+
+        _save()
+
+
+async def cached_generate(key: str, generate: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+    """Filename from the cache, else await generate() and cache the filename it returns"""
+    if enabled():
+        path = get(key)
+        if path is not None:
+            print(f"   (cached) {path.name}")
+            return path.name
+
+    filename = await generate()
+    if filename and enabled():
+        put(key, _IMAGES_DIR / filename)
+    return filename
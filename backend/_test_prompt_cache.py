@@ -0,0 +1,162 @@
+"""
+Prompt caches for the intent extraction validator
+
+ExactPromptCache maps (user request, character, pipeline fingerprint) to
+the generate_image_prompt result produced for exactly that input, so CI
+re-runs make no LLM calls until the agents' models or system prompts
+change. SemanticPromptCache sits beneath it and maps a user request to a
+result already produced for a near-identical request (cosine >= THRESHOLD)
+in the same category. Both are tied to the pipeline fingerprint, so a
+change of agent model or system prompt invalidates them together.
+Pass --no-cache to the validator to bypass both.
+
+Storage, rewritten after each put:
+- .cache/prompts/exact.json (results by key)
+- .cache/prompts/semantic.npz (embeddings per category) and
+  semantic.json (fingerprint, results per category)
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    EMBEDDINGS_AVAILABLE = False
+
+CACHE_DIR = Path(".cache") / "prompts"
+
+# Same multilingual model as vector memory: the corpus mixes fr/en/es
+EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+THRESHOLD = 0.92
+
+# Bump to drop exact entries after changing a user prompt template in the
+# agents (system prompts and models are already covered by the fingerprint)
+EXACT_CACHE_VERSION = 1
+
+
+def cache_fingerprint(fingerprint: str) -> str:
+    """Pipeline fingerprint qualified by the cache format version"""
+    return f"{EXACT_CACHE_VERSION}:{fingerprint}"
+
+
+def enabled() -> bool:
+    """False when the running script was given --no-cache"""
+    return "--no-cache" not in sys.argv
+
+
+class ExactPromptCache:
+    """Exact-match cache of prompt results, keyed by request and pipeline"""
+
+    def __init__(self, fingerprint: str, cache_dir: Path = CACHE_DIR):
+        self._fingerprint = cache_fingerprint(fingerprint).encode("utf-8")
+        self._path = cache_dir / "exact.json"
+        try:
+            self._results: Dict[str, Dict[str, Any]] = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._results = {}
+
+    def make_key(self, user_request_utf8: bytes, character_data: Mapping[str, Any]) -> str:
+        digest = hashlib.sha256(self._fingerprint)
+        digest.update(b"\0" + user_request_utf8 + b"\0")
+        digest.update(json.dumps(dict(character_data), sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._results.get(key) if enabled() else None
+
+    def put(self, key: str, result: Dict[str, Any]):
+        if not enabled():
+            return
+        self._results[key] = result
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._results, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self._path)
+
+
+class SemanticPromptCache:
+    """Nearest-neighbour cache of prompt results, partitioned by category"""
+
+    def __init__(self, fingerprint: str, cache_dir: Path = CACHE_DIR, threshold: float = THRESHOLD):
+        self.threshold = threshold
+        self._fingerprint = cache_fingerprint(fingerprint)
+        self._npz_path = cache_dir / "semantic.npz"
+        self._json_path = cache_dir / "semantic.json"
+        self._model = None
+        self._model_lock = threading.Lock()
+        # category -> (N, dim) float32 matrix of unit vectors, and the N results
+        self._matrices: Dict[str, np.ndarray] = {}
+        self._results: Dict[str, List[Dict[str, Any]]] = {}
+        self._load()
+
+    @property
+    def available(self) -> bool:
+        return EMBEDDINGS_AVAILABLE and enabled()
+
+    def _load(self):
+        try:
+            stored = json.loads(self._json_path.read_text(encoding="utf-8"))
+            if stored["fingerprint"] != self._fingerprint:
+                # Produced by another pipeline: start over, overwritten on the next put
+                raise ValueError("stale semantic cache")
+            self._results = stored["results"]
+            with np.load(self._npz_path) as data:
+                self._matrices = {category: data[category] for category in data.files}
+        except (OSError, ValueError, KeyError, TypeError):
+            self._matrices, self._results = {}, {}
+            return
+
+        # Drop categories whose two files disagree (interrupted save)
+        for category in list(self._results):
+            matrix = self._matrices.get(category)
+            if matrix is None or len(matrix) != len(self._results[category]):
+                self._results.pop(category)
+                self._matrices.pop(category, None)
+
+    def _save(self):
+        self._npz_path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(self._npz_path, **self._matrices)
+        tmp_path = self._json_path.with_suffix(".tmp")
+        stored = {"fingerprint": self._fingerprint, "results": self._results}
+        tmp_path.write_text(json.dumps(stored, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self._json_path)
+
+    def _embed(self, text: str) -> np.ndarray:
+        with self._model_lock:
+            if self._model is None:
+                self._model = SentenceTransformer(EMBEDDING_MODEL)
+            return self._model.encode(text, normalize_embeddings=True).astype(np.float32)
+
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """Unit embedding of text, or None when the cache is unavailable"""
+        return self._embed(text) if self.available else None
+
+    def get(self, category: str, embedding: Optional[np.ndarray]) -> Optional[Dict[str, Any]]:
+        """Result stored for the closest request in category, if close enough"""
+        matrix = self._matrices.get(category)
+        if embedding is None or matrix is None:
+            return None
+
+        similarities = matrix @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return self._results[category][best]
+
+    def put(self, category: str, embedding: Optional[np.ndarray], result: Dict[str, Any]):
+        if embedding is None:
+            return
+        matrix = self._matrices.get(category)
+        self._matrices[category] = (
+            embedding[None, :] if matrix is None else np.vstack([matrix, embedding])
+        )
+        self._results.setdefault(category, []).append(result)
+        self._save()
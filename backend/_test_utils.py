@@ -0,0 +1,34 @@
+"""
+Shared helpers for the test scripts
+
+banner() prints section headers; use_fast_event_loop() picks the event loop
+policy (selector loop on Windows, uvloop elsewhere when installed). Call it
+before asyncio.run(). make_image_filename() names images saved to IMAGES_DIR.
+"""
+import asyncio
+import sys
+import time
+
+
+def banner(title: str, width: int = 70):
+    """Print a section banner in a single write"""
+    rule = "=" * width
+    sys.stdout.write(f"\n{rule}\n{title}\n{rule}\n")
+
+
+def use_fast_event_loop():
+    """Selector loop on Windows, else uvloop (shipped with uvicorn[standard]) when available"""
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        return
+
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+
+def make_image_filename(prefix: str, ext: str = ".png") -> str:
+    """Unique image filename from wall-clock ns (monotonic ns restarts at boot, IMAGES_DIR does not)"""
+    return f"{prefix}_{time.time_ns():x}{ext}"
@@ -169,7 +169,7 @@ async def start_story(request: StoryStartRequest):
     if not V2_AVAILABLE or not story_mode:
         raise HTTPException(status_code=503, detail="Story mode not available")
 
-    result = story_mode.start_scenario(
+    result = await story_mode.start_scenario(
         scenario_id=request.scenario_id,
         character_id=request.character_id
     )
@@ -186,7 +186,7 @@ async def make_story_choice(request: StoryChoiceRequest):
     if not V2_AVAILABLE or not story_mode:
         raise HTTPException(status_code=503, detail="Story mode not available")
 
-    result = story_mode.make_choice(
+    result = await story_mode.make_choice(
         session_id=request.session_id,
         choice_id=request.choice_id,
         language=request.language
@@ -204,7 +204,7 @@ async def get_story_state(session_id: str):
     if not V2_AVAILABLE or not story_mode:
         raise HTTPException(status_code=503, detail="Story mode not available")
 
-    result = story_mode.get_session_state(session_id)
+    result = await story_mode.get_session_state(session_id)
     if not result:
         raise HTTPException(status_code=404, detail="Session not found")
 
@@ -217,7 +217,7 @@ async def end_story_session(session_id: str):
     if not V2_AVAILABLE or not story_mode:
         raise HTTPException(status_code=503, detail="Story mode not available")
 
-    story_mode.end_session(session_id)
+    await story_mode.end_session(session_id)
     return {"status": "ended", "session_id": session_id}
 
 
@@ -533,3 +533,12 @@ def include_v2_routes(app):
     """Include V2 routes in the main FastAPI app"""
     app.include_router(router)
     print("[API V2] Routes registered")
+
+
+async def initialize_v2_services():
+    """Connect V2 services that need the running event loop"""
+    if V2_AVAILABLE and story_mode:
+        await story_mode.initialize()
+    if V2_AVAILABLE and vector_memory:
+        # Load the embedding model now rather than inside the first request
+        await vector_memory.warm_up()
@@ -1,5 +1,7 @@
 """Image Generation Service v10.0 - Multi-Space with Retry & Fallback"""
 import os
+import glob
+import hashlib
 import uuid
 import asyncio
 import shutil
@@ -84,6 +86,10 @@ class ImageService:
         self.retry_delay = 5  # seconds between retries
         self.quota_wait_time = 30  # seconds to wait if quota exceeded
 
+        # Cache of seeded results (IMAGES_DIR/cache_<key>.<ext>), see generate()
+        self.cache_max_entries = 200
+        self.cache_ttl = 7 * 86400  # seconds since last use
+
         # Quality settings
         self.default_steps = 18
         self.default_width = 1024
@@ -119,6 +125,18 @@ class ImageService:
         width = max(512, min(2048, width))
         height = max(512, min(2048, height))
 
+        # A fixed seed makes the output deterministic: reuse the image from a previous identical request
+        cache_key = None
+        if seed is not None:
+            cache_key = self._cache_key(
+                enhanced_prompt, negative_prompt or "", seed, style, width, height,
+                nsfw_level, steps, guidance or 7.0
+            )
+            cached = self._from_cache(cache_key)
+            if cached:
+                logger.info(f">>> Cache hit ({cache_key}): {cached}")
+                return cached
+
         logger.info("=" * 50)
         logger.info("Image Generation Starting (with retry & fallback)")
         logger.info(f"NSFW Level: {nsfw_level}")
@@ -150,6 +168,8 @@ class ImageService:
                     )
 
                     logger.info(f">>> SUCCESS with {space_name}")
+                    if cache_key:
+                        self._to_cache(cache_key, result)
                     return result
 
                 except Exception as e:
@@ -174,6 +194,69 @@ class ImageService:
         logger.error(f"All spaces failed:\n{error_summary}")
         raise Exception(f"All image generation spaces failed. Errors:\n{error_summary}")
 
+    @staticmethod
+    def _cache_key(prompt: str, negative_prompt: str, seed: int, style: str, width: int, height: int,
+                   nsfw_level: int, steps: Optional[int], guidance: float) -> str:
+        payload = f"{prompt}|{negative_prompt}|{seed}|{style}|{width}|{height}|{nsfw_level}|{steps}|{guidance}"
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _link(self, src: str, dest: str):
+        """Hardlink src to dest, copying when links are not supported"""
+        try:
+            os.link(src, dest)
+        except OSError:
+            shutil.copyfile(src, dest)
+
+    def _cache_files(self) -> List[str]:
+        return glob.glob(os.path.join(self.images_dir, "cache_*"))
+
+    def _from_cache(self, cache_key: str) -> Optional[str]:
+        """
+        New filename for the cached image of cache_key, or None.
+        Each hit gets its own name so delete_image() never removes a shared file.
+        """
+        for cache_path in glob.glob(os.path.join(self.images_dir, f"cache_{cache_key}.*")):
+            try:
+                if time.time() - os.path.getmtime(cache_path) >= self.cache_ttl:
+                    os.remove(cache_path)
+                    continue
+                ext = os.path.splitext(cache_path)[1]
+                filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}{ext}"
+                self._link(cache_path, os.path.join(self.images_dir, filename))
+                # mtime doubles as the last use time for LRU eviction
+                os.utime(cache_path)
+            except OSError:
+                continue
+            return filename
+        return None
+
+    def _to_cache(self, cache_key: str, filename: str):
+        ext = os.path.splitext(filename)[1] or ".png"
+        try:
+            self._link(self.get_image_path(filename), os.path.join(self.images_dir, f"cache_{cache_key}{ext}"))
+        except OSError as e:
+            logger.warning(f"Could not cache {filename}: {e}")
+            return
+        self._evict_cache()
+
+    def _evict_cache(self):
+        """Drop cache entries past cache_ttl, then the least recently used beyond cache_max_entries"""
+        entries = []
+        for cache_path in self._cache_files():
+            try:
+                entries.append((os.path.getmtime(cache_path), cache_path))
+            except OSError:
+                pass
+        entries.sort(reverse=True)
+
+        now = time.time()
+        for i, (used, cache_path) in enumerate(entries):
+            if i >= self.cache_max_entries or now - used >= self.cache_ttl:
+                try:
+                    os.remove(cache_path)
+                except OSError:
+                    pass
+
     async def _generate_with_space(
         self,
         space_config: Dict[str, Any],
@@ -544,6 +627,13 @@ class ImageService:
     def delete_image(self, filename: str) -> bool:
         filepath = os.path.join(self.images_dir, filename)
         if os.path.exists(filepath):
+            # Drop the cache entry holding the same image, so a deleted image is not served again
+            for cache_path in self._cache_files():
+                try:
+                    if os.path.samefile(cache_path, filepath):
+                        os.remove(cache_path)
+                except OSError:
+                    pass
             os.remove(filepath)
             return True
         return False
@@ -552,7 +642,7 @@ class ImageService:
         if not os.path.exists(self.images_dir):
             return []
         return [f for f in os.listdir(self.images_dir)
-                if f.endswith(('.png', '.jpg', '.jpeg', '.webp'))]
+                if f.endswith(('.png', '.jpg', '.jpeg', '.webp')) and not f.startswith("cache_")]
 
     async def generate_multiple(
         self,
@@ -568,6 +658,17 @@ class ImageService:
             tasks.append(self.generate(prompt, style=style, seed=img_seed, **kwargs))
         return await asyncio.gather(*tasks, return_exceptions=True)
 
+    async def generate_many(self, requests: List[Dict[str, Any]]) -> list:
+        """
+        Generate several images at once, one dict of generate() kwargs per image.
+        The spaces have no batch endpoint, so the requests run concurrently;
+        results keep request order, with the exception in place of a failed image.
+        """
+        return await asyncio.gather(
+            *(self.generate(**request) for request in requests),
+            return_exceptions=True
+        )
+
     async def generate_with_agents(
         self,
         user_message: str,
@@ -9,6 +9,8 @@ import asyncio
 import aiohttp
 import urllib.parse
 import logging
+from contextlib import asynccontextmanager, nullcontext
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Optional, Dict
 from config import settings
@@ -20,6 +22,44 @@ if sys.platform == 'win32':
 
 logger = logging.getLogger("ImageServiceV2")
 
+# Session opened by ImageServiceV2.session(), visible to tasks started inside it
+_shared_session: ContextVar[Optional[aiohttp.ClientSession]] = ContextVar("image_v2_session", default=None)
+
+
+class AdaptiveRateLimiter:
+    """
+    Spaces out requests only as much as the backend asks for (AIMD)
+
+    Starts with no gap between requests (or interval, if given). A throttled
+    response (HTTP 429/503) doubles the gap; each success shrinks it by a
+    fixed step.
+    """
+
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, backoff_start: float = 1.0, max_interval: float = 30.0, recovery_step: float = 0.5,
+                 interval: float = 0.0):
+        self.backoff_start = backoff_start
+        self.max_interval = max_interval
+        self.recovery_step = recovery_step
+        self.interval = interval
+        self._next_slot = 0.0
+
+    async def acquire(self):
+        """Wait for the next request slot"""
+        now = asyncio.get_running_loop().time()
+        wait = self._next_slot - now
+        self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        self.interval = max(0.0, self.interval - self.recovery_step)
+
+    def on_throttled(self):
+        self.interval = min(self.max_interval, max(self.backoff_start, self.interval * 2))
+        logger.warning(f"⏱️  Backend throttling, spacing requests {self.interval:.1f}s apart")
+
 
 class ImageServiceV2:
     """
@@ -48,6 +88,9 @@ class ImageServiceV2:
         self.previous_prompts = []
         self.max_history = 50  # Remember last 50 prompts
 
+        # Shared by all concurrent generations: only waits once Pollinations throttles
+        self.rate_limiter = AdaptiveRateLimiter()
+
     async def generate(
         self,
         prompt: str = None,
@@ -182,18 +225,40 @@ class ImageServiceV2:
 
         return url
 
+    @asynccontextmanager
+    async def session(self):
+        """
+        Share one aiohttp session (keep-alive connections, DNS cache) across
+        every generation started inside the block, e.g. several batches:
+
+            async with image_service_v2.session():
+                await asyncio.gather(image_service_v2.generate_batch(...), ...)
+        """
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=8, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            token = _shared_session.set(session)
+            try:
+                yield session
+            finally:
+                _shared_session.reset(token)
+
     async def _fetch_image(self, url: str) -> Optional[bytes]:
         """Fetch image from Pollinations.ai"""
         try:
             timeout = aiohttp.ClientTimeout(total=120)
 
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url) as response:
+            await self.rate_limiter.acquire()
+            shared = _shared_session.get()
+            async with (nullcontext(shared) if shared else aiohttp.ClientSession(timeout=timeout)) as session:
+                async with session.get(url, timeout=timeout) as response:
                     if response.status == 200:
                         image_data = await response.read()
+                        self.rate_limiter.on_success()
                         logger.info(f"✅ Image received ({len(image_data)} bytes)")
                         return image_data
                     else:
+                        if response.status in AdaptiveRateLimiter.THROTTLE_STATUSES:
+                            self.rate_limiter.on_throttled()
                         text = await response.text()
                         logger.error(f"❌ Error: {response.status} - {text[:200]}")
                         return None
@@ -231,7 +296,7 @@ class ImageServiceV2:
         nsfw_level: int = 0,
         width: int = 1024,
         height: int = 1024,
-        delay: int = 3
+        delay: int = 0
     ) -> list:
         """
         Generate multiple diverse images with validation
@@ -241,7 +306,8 @@ class ImageServiceV2:
             nsfw_level: NSFW level
             width: Image width
             height: Image height
-            delay: Seconds between requests (rate limiting)
+            delay: Extra fixed seconds between requests (rate limiting is adaptive,
+                see AdaptiveRateLimiter)
 
         Returns:
             List of generated filenames
@@ -273,8 +339,8 @@ class ImageServiceV2:
                 results.append(None)
                 print(f"❌ Failed")
 
-            # Rate limiting
-            if i < count - 1:
+            # Extra fixed gap, if asked for
+            if delay and i < count - 1:
                 print(f"⏱️  Waiting {delay}s...")
                 await asyncio.sleep(delay)
 
@@ -337,8 +403,7 @@ async def test_batch_generation():
         count=10,
         nsfw_level=2,  # Topless
         width=1024,
-        height=1024,
-        delay=3
+        height=1024
     )
 
     print(f"\n✅ Generated {len([r for r in results if r])}/10 images")
@@ -0,0 +1,46 @@
+"""Local Z-Image-Turbo pipeline (diffusers on CUDA, bf16 weights)"""
+import threading
+from typing import Optional
+
+MODEL_ID = "Tongyi-MAI/Z-Image-Turbo"
+
+_pipe = None
+_pipe_lock = threading.Lock()
+
+
+def get_pipeline():
+    """Lazy load the pipeline on first use, once per process"""
+    global _pipe
+    with _pipe_lock:
+        if _pipe is None:
+            import torch
+            from diffusers import ZImagePipeline
+
+            if not torch.cuda.is_available():
+                raise RuntimeError("CANDIES_LOCAL_GPU is set but CUDA is not available")
+
+            print(f"Loading {MODEL_ID} on cuda (bfloat16)...")
+            _pipe = ZImagePipeline.from_pretrained(MODEL_ID, torch_dtype=torch.bfloat16).to("cuda")
+        return _pipe
+
+
+def text_to_image(
+    prompt: str,
+    width: int = 1024,
+    height: int = 1024,
+    num_inference_steps: int = 8,
+    seed: Optional[int] = None
+):
+    """Generate one PIL image; blocking, run it in a thread from async code"""
+    import torch
+
+    pipe = get_pipeline()
+    generator = torch.Generator("cuda").manual_seed(seed) if seed is not None else None
+    return pipe(
+        prompt,
+        width=width,
+        height=height,
+        num_inference_steps=num_inference_steps,
+        guidance_scale=0.0,  # Turbo is distilled for CFG-free sampling
+        generator=generator
+    ).images[0]
@@ -32,7 +32,7 @@ else:
 
 # Import V2 API routes
 try:
-    from api_v2 import include_v2_routes
+    from api_v2 import include_v2_routes, initialize_v2_services
     V2_AVAILABLE = True
     print("V2 Features: AVAILABLE")
 except ImportError as e:
@@ -480,6 +480,7 @@ async def startup_event():
     # Register V2 routes if available
     if V2_AVAILABLE:
         include_v2_routes(app)
+        await initialize_v2_services()
         print("V2 API routes registered at /api/v2/*")
 
     # Register V3 routes if available (Immersive Chat)
@@ -9,7 +9,31 @@ for intent extraction with real-time visual inspection.
 import asyncio
 import sys
 from typing import List, Dict
-from services.image_prompt_agents import generate_image_prompt
+from services.image_prompt_agents import generate_image_prompt, image_prompt_orchestrator
+from _test_prompt_cache import CACHE_DIR, ExactPromptCache
+
+# Results are reused until the agent pipeline changes (--no-cache to bypass).
+# Own file: the intent extraction validator caches a different (batched) prompt
+prompt_cache = ExactPromptCache(image_prompt_orchestrator.pipeline_fingerprint(), cache_dir=CACHE_DIR / "qa")
+
+# Character every QA request is addressed to
+QA_CHARACTER = {
+    "name": "QA Test Character",
+    "personality": "friendly, helpful",
+    "age": "25",
+    "ethnicity": "european"
+}
+
+
+async def cached_generate_image_prompt(user_message: str, character_data: Dict) -> Dict:
+    """generate_image_prompt (default mood, context and style) through the prompt cache"""
+    key = prompt_cache.make_key(user_message.encode("utf-8"), character_data)
+    result = prompt_cache.get(key)
+    if result is None:
+        result = await generate_image_prompt(user_message=user_message, character_data=character_data)
+        prompt_cache.put(key, result)
+    return result
+
 
 # Add encoding for Windows
 if sys.platform == 'win32':
@@ -167,22 +191,8 @@ class QAValidator:
         # Run extraction
         print(f"\n⏳ Running intent extraction...")
 
-        character_data = {
-            "name": "QA Test Character",
-            "personality": "friendly, helpful",
-            "age": "25",
-            "ethnicity": "european"
-        }
-
         try:
-            result = await generate_image_prompt(
-                user_message=request,
-                character_data=character_data,
-                relationship_level=0,
-                current_mood="neutral",
-                conversation_context="",
-                style="realistic"
-            )
+            result = await cached_generate_image_prompt(request, QA_CHARACTER)
 
             extracted_objects = result.get("objects", [])
             extracted_action = result.get("action", "")
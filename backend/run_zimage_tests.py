@@ -0,0 +1,53 @@
+"""Run the three Z-Image-Turbo tests concurrently"""
+import asyncio
+import sys
+import os
+import time
+
+# Only when missing: running a script already puts its directory first
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from test_zimage import test_generation
+from test_zimage_debug import test_direct
+from test_zimage_nsfw import test_nsfw_generation
+
+SEP = "=" * 60
+
+
+async def timed(name: str, coro):
+    """Await coro, returning (name, result, seconds)"""
+    start = time.perf_counter()
+    try:
+        result = await coro
+    except Exception as e:
+        result = e
+    return name, result, time.perf_counter() - start
+
+
+async def run_all():
+    """Run the tests at once: fal-ai and the Gradio Space are independent endpoints"""
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        timed("test_generation", test_generation()),
+        timed("test_direct", test_direct()),
+        # gradio_client is synchronous: run it on the default executor
+        timed("test_nsfw_generation", asyncio.to_thread(test_nsfw_generation)),
+    )
+    total = time.perf_counter() - start
+
+    print("\n" + SEP)
+    print("Z-IMAGE TEST SUMMARY")
+    print(SEP)
+    for name, result, seconds in results:
+        ok = bool(result) and not isinstance(result, Exception)
+        print(f"  {'✅' if ok else '❌'} {name:22s} {seconds:6.1f}s")
+    print(f"  Wall clock: {total:.1f}s (sum of tests: {sum(r[2] for r in results):.1f}s)")
+
+    return all(r[1] and not isinstance(r[1], Exception) for r in results)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(run_all())
+    sys.exit(0 if success else 1)
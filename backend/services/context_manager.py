@@ -350,7 +350,7 @@ REGLES:
         conversation: List[Dict[str, str]]
     ) -> int:
         """Simple pattern-based fact extraction"""
-        stored = 0
+        facts = []
 
         # Name patterns
         name_patterns = [
@@ -383,30 +383,27 @@ REGLES:
                 match = re.search(pattern, content, re.IGNORECASE)
                 if match:
                     name = match.group(1)
-                    success = await vector_memory.store_fact(
-                        character_id,
-                        f"L'utilisateur s'appelle {name}",
-                        fact_type,
-                        importance
-                    )
-                    if success:
-                        stored += 1
+                    facts.append({
+                        "content": f"L'utilisateur s'appelle {name}",
+                        "type": fact_type,
+                        "importance": importance
+                    })
 
             # Check preference patterns
             for pattern, fact_type, importance in pref_patterns:
                 match = re.search(pattern, content, re.IGNORECASE)
                 if match:
                     pref = match.group(1)[:100]  # Limit length
-                    success = await vector_memory.store_fact(
-                        character_id,
-                        f"L'utilisateur: {pref}",
-                        fact_type,
-                        importance
-                    )
-                    if success:
-                        stored += 1
-
-        return stored
+                    facts.append({
+                        "content": f"L'utilisateur: {pref}",
+                        "type": fact_type,
+                        "importance": importance
+                    })
+
+        # One batched write instead of a store round trip per fact
+        if not facts:
+            return 0
+        return await vector_memory.store_facts_batch(character_id, facts)
 
     def clear_summary_cache(self, conversation_id: Optional[int] = None):
         """Clear summary cache"""
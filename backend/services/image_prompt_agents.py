@@ -17,7 +17,9 @@ Key Principles:
 """
 
 import asyncio
-from typing import Dict, Any, Optional, List
+import hashlib
+import re
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from huggingface_hub import InferenceClient
@@ -304,6 +306,49 @@ What kind of image is the user asking for?"""
         response = await self.llm.generate(self.SYSTEM_PROMPT, user_prompt, max_tokens=250)
         return self._parse_response(response, user_message)
 
+    # Requests per batched call, so the combined answer fits the model's context
+    BATCH_SIZE = 8
+    _BATCH_HEADER_RE = re.compile(r"^\W*REQUEST\s+(\d+)\W*$", re.IGNORECASE | re.MULTILINE)
+
+    async def analyze_batch(self, user_messages: List[str], character_info: str = "") -> List[IntentionResult]:
+        """Analyze several requests with one LLM call per BATCH_SIZE requests"""
+        chunks = [user_messages[i:i + self.BATCH_SIZE] for i in range(0, len(user_messages), self.BATCH_SIZE)]
+        results = await asyncio.gather(*(self._analyze_chunk(chunk, character_info) for chunk in chunks))
+        return [intention for chunk_results in results for intention in chunk_results]
+
+    async def _analyze_chunk(self, user_messages: List[str], character_info: str) -> List[IntentionResult]:
+        numbered = "\n".join(f'{i}. "{message}"' for i, message in enumerate(user_messages, 1))
+        user_prompt = f"""Analyze these {len(user_messages)} independent image requests:
+
+{numbered}
+{f'Character context: {character_info}' if character_info else ''}
+
+IMPORTANT: Be precise about NSFW level. Only use high levels (3-5) if nudity is EXPLICITLY requested.
+"Sexy" = clothed but seductive (level 1)
+"Lingerie/bikini" = revealing but not nude (level 2)
+"Topless" = partial nudity (level 3)
+"Nue/nude/naked" = full nudity (level 4)
+
+For EACH request, write a line "### REQUEST <number>" followed by the fields in the exact format."""
+
+        response = await self.llm.generate(self.SYSTEM_PROMPT, user_prompt, max_tokens=250 * len(user_messages))
+
+        # Split the answer on its "### REQUEST n" headers
+        blocks = {}
+        headers = list(self._BATCH_HEADER_RE.finditer(response))
+        for header, next_header in zip(headers, headers[1:] + [None]):
+            end = next_header.start() if next_header else len(response)
+            blocks[int(header.group(1))] = response[header.end():end]
+
+        results = []
+        for i, message in enumerate(user_messages, 1):
+            if i in blocks:
+                results.append(self._parse_response(blocks[i], message))
+            else:
+                # Block missing from the batched answer: analyze this one alone
+                results.append(await self.analyze(message, character_info=character_info))
+        return results
+
     def _parse_response(self, response: str, request: str) -> IntentionResult:
         """Parse LLM response into IntentionResult"""
         lines = response.strip().split('\n')
@@ -911,6 +956,24 @@ class ImagePromptOrchestrator:
         logger.info("  Agent 3 (Composer): novita/Llama-3.1-8B-Instruct")
         logger.info("  Agent 4 (Validator): novita/Sao10K/L3-8B-Stheno-v3.2")
 
+    def pipeline_fingerprint(self) -> str:
+        """Hash of each agent's provider, model and system prompt; changes when the pipeline does"""
+        digest = hashlib.sha256()
+        for agent in (self.intention_analyzer, self.character_agent, self.composer_agent, self.validator_agent):
+            for part in (agent.llm.provider, agent.llm.model, getattr(agent, "SYSTEM_PROMPT", "")):
+                digest.update(part.encode("utf-8"))
+                digest.update(b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def _character_context(character_data: Dict[str, Any]) -> str:
+        """Short character summary given to the intention analyzer"""
+        if not character_data:
+            return ""
+        char_name = character_data.get("name", "")
+        char_personality = character_data.get("personality", "")
+        return f"Character: {char_name}. {char_personality[:100] if char_personality else ''}"
+
     async def generate_prompt(
         self,
         user_message: str,
@@ -933,11 +996,7 @@ class ImagePromptOrchestrator:
         logger.info(f"[Orchestrator] Starting 4-agent pipeline for: {user_message[:50]}...")
 
         # Build character context string for intention analyzer
-        char_context = ""
-        if character_data:
-            char_name = character_data.get("name", "")
-            char_personality = character_data.get("personality", "")
-            char_context = f"Character: {char_name}. {char_personality[:100] if char_personality else ''}"
+        char_context = self._character_context(character_data)
 
         # ========== AGENT 1: Analyze Intent ==========
         logger.info("[Orchestrator] Agent 1: Analyzing intention...")
@@ -949,6 +1008,72 @@ class ImagePromptOrchestrator:
         char_description = self.character_agent.build_description(character_data)
         logger.info(f"  -> Physical: {char_description.physical_prompt[:80]}...")
 
+        return await self._compose_and_validate(intention, char_description, style)
+
+    async def generate_prompts(
+        self,
+        user_messages: List[str],
+        character_data: Dict[str, Any],
+        style: str = "realistic",
+        max_concurrency: int = 8
+    ) -> List[Any]:
+        """
+        Batch pipeline for many requests to the same character
+
+        Returns one result dict per message, in order, or the exception
+        raised for that message. See iter_prompts.
+        """
+        results: List[Any] = [None] * len(user_messages)
+        async for i, result in self.iter_prompts(user_messages, character_data, style, max_concurrency):
+            results[i] = result
+        return results
+
+    async def iter_prompts(
+        self,
+        user_messages: List[str],
+        character_data: Dict[str, Any],
+        style: str = "realistic",
+        max_concurrency: int = 8
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Batch pipeline yielding (index, result) as each request finishes
+
+        Agent 1 analyzes the requests in batched LLM calls and Agent 2 runs
+        once; Agents 3 and 4 still run per request, at most max_concurrency
+        at a time. result is the exception raised for that request, if any.
+        Requests still running when the iterator is closed are cancelled.
+        """
+        logger.info(f"[Orchestrator] Starting batch pipeline for {len(user_messages)} requests")
+
+        char_context = self._character_context(character_data)
+        intentions = await self.intention_analyzer.analyze_batch(user_messages, char_context)
+        char_description = self.character_agent.build_description(character_data)
+
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def _bounded(i: int, intention: IntentionResult) -> Tuple[int, Any]:
+            async with sem:
+                try:
+                    return i, await self._compose_and_validate(intention, char_description, style)
+                except Exception as e:
+                    return i, e
+
+        tasks = [asyncio.ensure_future(_bounded(i, intention)) for i, intention in enumerate(intentions)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _compose_and_validate(
+        self,
+        intention: IntentionResult,
+        char_description: CharacterDescription,
+        style: str
+    ) -> Dict[str, Any]:
+        """Agents 3 and 4: compose the prompt, then validate and refine it"""
+
         # ========== AGENT 3: Compose Prompt ==========
         logger.info("[Orchestrator] Agent 3: Composing prompt...")
         raw_prompt = await self.composer_agent.compose_prompt(
@@ -1027,3 +1152,42 @@ async def generate_image_prompt(
         conversation_context=conversation_context,
         style=style
     )
+
+
+async def batch_generate_image_prompt(
+    user_messages: List[str],
+    character_data: Dict[str, Any],
+    style: str = "realistic",
+    max_concurrency: int = 8
+) -> List[Any]:
+    """
+    Batched generate_image_prompt for many requests to one character.
+
+    Intent analysis is batched into a few LLM calls; see
+    ImagePromptOrchestrator.generate_prompts. Each item is a result dict,
+    or the exception raised for that request.
+    """
+    return await image_prompt_orchestrator.generate_prompts(
+        user_messages=user_messages,
+        character_data=character_data,
+        style=style,
+        max_concurrency=max_concurrency
+    )
+
+
+def iter_image_prompts(
+    user_messages: List[str],
+    character_data: Dict[str, Any],
+    style: str = "realistic",
+    max_concurrency: int = 8
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Streaming batch_generate_image_prompt: yields (index, result) in
+    completion order. See ImagePromptOrchestrator.iter_prompts.
+    """
+    return image_prompt_orchestrator.iter_prompts(
+        user_messages=user_messages,
+        character_data=character_data,
+        style=style,
+        max_concurrency=max_concurrency
+    )
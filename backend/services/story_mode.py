@@ -10,13 +10,32 @@ Provides interactive storytelling with:
 5. Multiple endings
 """
 
+import sys
 import json
 import random
+import asyncio
 from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass, field, asdict
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps(obj: Any) -> Any:
+    """Serialize for Redis (orjson bytes when available)"""
+    return orjson.dumps(obj) if ORJSON_AVAILABLE else json.dumps(obj)
+
+
+def _loads(data: Any) -> Any:
+    """Deserialize a value read back from Redis"""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
 
 class StoryStage(Enum):
     """Story progression stages"""
@@ -27,7 +46,7 @@ class StoryStage(Enum):
     ENDING = "ending"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StoryChoice:
     """A choice the user can make"""
     id: str
@@ -38,7 +57,7 @@ class StoryChoice:
     mood_shift: str = "neutral"  # positive, negative, romantic, sexual, neutral
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StoryBeat:
     """A single story beat/moment"""
     id: str
@@ -54,7 +73,7 @@ class StoryBeat:
     ending_type: Optional[str] = None  # romantic, sexual, sweet, dramatic
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Scenario:
     """A complete story scenario"""
     id: str
@@ -70,7 +89,7 @@ class Scenario:
     character_requirements: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class StorySession:
     """Active story session state"""
     session_id: str
@@ -82,9 +101,98 @@ class StorySession:
     current_nsfw_level: int
     started_at: str
     images_generated: List[str]
+    current_beat_idx: int = -1  # Index into the compiled ScenarioGraph (runtime only)
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # Shallow copy: asdict() would recurse and deep-copy every history entry
+        return {
+            "session_id": self.session_id,
+            "scenario_id": self.scenario_id,
+            "character_id": self.character_id,
+            "current_beat_id": self.current_beat_id,
+            "history": list(self.history),
+            "choices_made": list(self.choices_made),
+            "current_nsfw_level": self.current_nsfw_level,
+            "started_at": self.started_at,
+            "images_generated": list(self.images_generated)
+        }
+
+    def to_redis_meta(self) -> Dict[str, Any]:
+        """Scalar fields stored in the session's Redis meta hash"""
+        return {
+            "scenario_id": self.scenario_id,
+            "character_id": self.character_id,
+            "current_beat_id": self.current_beat_id,
+            "current_nsfw_level": self.current_nsfw_level,
+            "started_at": self.started_at,
+            "images_generated": _dumps(self.images_generated)
+        }
+
+    @classmethod
+    def from_redis(
+        cls,
+        session_id: str,
+        meta: Dict[str, str],
+        history: List[str],
+        choice_ids: List[str]
+    ) -> "StorySession":
+        """Rebuild a session from its meta hash and history/choice lists"""
+        # Decoded IDs are fresh strings; intern them so they share the
+        # scenario graph's key objects and compare by identity
+        history = [sys.intern(beat_id) for beat_id in history]
+        choice_ids = [sys.intern(choice_id) for choice_id in choice_ids]
+
+        # history[i] is the beat on which choice_ids[i] was made
+        return cls(
+            session_id=session_id,
+            scenario_id=sys.intern(meta["scenario_id"]),
+            character_id=int(meta["character_id"]),
+            current_beat_id=sys.intern(meta["current_beat_id"]),
+            history=history,
+            choices_made=list(zip(history, choice_ids)),
+            current_nsfw_level=int(meta["current_nsfw_level"]),
+            started_at=meta["started_at"],
+            images_generated=_loads(meta["images_generated"])
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class ScenarioGraph:
+    """A scenario compiled to int-indexed beats and transitions"""
+    beats: List[StoryBeat]
+    beat_index: Dict[str, int]  # Beat ID -> index
+    transitions: List[Dict[str, Tuple[int, StoryChoice]]]  # [beat index][choice ID] -> (next index, choice)
+    start_idx: int
+
+    @classmethod
+    def compile(cls, scenario: Scenario) -> "ScenarioGraph":
+        """Validate the beat graph and build its transition table"""
+        beat_index = {}
+        for idx, (beat_id, beat) in enumerate(scenario.beats.items()):
+            if beat.id != beat_id:
+                raise ValueError(f"Scenario '{scenario.id}': beat '{beat.id}' registered as '{beat_id}'")
+            beat_index[sys.intern(beat_id)] = idx
+
+        if scenario.starting_beat not in beat_index:
+            raise ValueError(f"Scenario '{scenario.id}': unknown starting beat '{scenario.starting_beat}'")
+
+        transitions = []
+        for beat in scenario.beats.values():
+            table = {}
+            for choice in beat.choices:
+                if choice.leads_to not in beat_index:
+                    # Kept visible in responses, but choosing it is rejected
+                    print(f"[StoryMode] {scenario.id}/{beat.id}: choice '{choice.id}' leads to unknown beat '{choice.leads_to}'")
+                    continue
+                table[sys.intern(choice.id)] = (beat_index[choice.leads_to], choice)
+            transitions.append(table)
+
+        return cls(
+            beats=list(scenario.beats.values()),
+            beat_index=beat_index,
+            transitions=transitions,
+            start_idx=beat_index[scenario.starting_beat]
+        )
 
 
 # Pre-built scenarios
@@ -557,36 +665,94 @@ SCENARIOS: Dict[str, Scenario] = {
 class StoryModeService:
     """Service for managing story mode interactions"""
 
+    SESSION_TTL = 86400  # 24h
+    FLUSH_INTERVAL = 0.05  # Seconds between coalesced Redis writes
+    MAX_ACTIVE_SESSIONS = 2048  # In-memory LRU bound, Redis stays the source of truth
+
     def __init__(self, redis_url: str = "redis://localhost:6379"):
         self.scenarios = SCENARIOS
-        self.active_sessions: Dict[str, StorySession] = {}
+        self.active_sessions: "OrderedDict[str, StorySession]" = OrderedDict()
+
+        # Sessions changed since the last Redis flush
+        self._dirty: Dict[str, StorySession] = {}
+        # Sessions in the pipeline currently being executed
+        self._flushing: Dict[str, StorySession] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # Number of choices already pushed to Redis, per session
+        self._synced: Dict[str, int] = {}
+
+        # Scenario graphs compiled to int-indexed transition tables
+        self._graphs = {
+            scenario_id: ScenarioGraph.compile(scenario)
+            for scenario_id, scenario in self.scenarios.items()
+        }
+
+        # Language-resolved scenario fields and static beat responses
+        self._scenario_views = self._build_scenario_views()
+        self._beat_responses = self._build_beat_responses()
+        self._available_cache: Dict[str, List[Dict]] = {}
 
-        # Try Redis for persistence
+        # Redis persistence is connected in initialize()
+        self.redis_url = redis_url
         self.redis_client = None
+
+        print(f"[StoryMode] Initialized with {len(self.scenarios)} scenarios")
+
+    async def initialize(self):
+        """Connect to Redis for persistence (called on app startup)"""
         try:
-            import redis
-            self.redis_client = redis.from_url(redis_url, decode_responses=True)
-            self.redis_client.ping()
+            from redis.asyncio import Redis as AsyncRedis
+            client = AsyncRedis.from_url(self.redis_url, decode_responses=True)
+            await client.ping()
+            self.redis_client = client
             print("[StoryMode] Redis connected")
         except Exception as e:
             print(f"[StoryMode] Redis not available: {e}")
 
-        print(f"[StoryMode] Initialized with {len(self.scenarios)} scenarios")
+    @staticmethod
+    def _language_key(language: str) -> str:
+        """Anything other than French falls back to English"""
+        return "fr" if language == "fr" else "en"
+
+    def _build_scenario_views(self) -> Dict[str, Dict[str, Dict]]:
+        """Resolve each scenario's translated fields once per language"""
+        views = {}
+        for scenario in self.scenarios.values():
+            views[scenario.id] = {
+                language: {
+                    "id": scenario.id,
+                    "title": scenario.title_fr if language == "fr" else scenario.title,
+                    "description": scenario.description_fr if language == "fr" else scenario.description,
+                    "setting": scenario.setting,
+                    "mood": scenario.mood,
+                    "nsfw_max_level": scenario.nsfw_max_level
+                }
+                for language in ("en", "fr")
+            }
+        return views
 
     def get_available_scenarios(self, language: str = "en") -> List[Dict]:
-        """Get list of available scenarios"""
+        """Get list of available scenarios (built once per language)"""
+        language = self._language_key(language)
+        cached = self._available_cache.get(language)
+        if cached is not None:
+            return cached
+
         scenarios = []
-        for scenario in self.scenarios.values():
+        for views in self._scenario_views.values():
+            view = views[language]
             scenarios.append({
-                "id": scenario.id,
-                "title": scenario.title_fr if language == "fr" else scenario.title,
-                "description": scenario.description_fr if language == "fr" else scenario.description,
-                "mood": scenario.mood,
-                "nsfw_max_level": scenario.nsfw_max_level
+                "id": view["id"],
+                "title": view["title"],
+                "description": view["description"],
+                "mood": view["mood"],
+                "nsfw_max_level": view["nsfw_max_level"]
             })
+
+        self._available_cache[language] = scenarios
         return scenarios
 
-    def start_scenario(
+    async def start_scenario(
         self,
         scenario_id: str,
         character_id: int,
@@ -611,46 +777,32 @@ class StoryModeService:
             choices_made=[],
             current_nsfw_level=0,
             started_at=datetime.now().isoformat(),
-            images_generated=[]
+            images_generated=[],
+            current_beat_idx=self._graphs[scenario_id].start_idx
         )
 
-        # Store session
-        self.active_sessions[session_id] = session
-        self._save_session(session)
-
-        # Get first beat
-        first_beat = scenario.beats[scenario.starting_beat]
+        # Store session (persisted write-behind with the next flush)
+        self._cache_session(session)
+        self._mark_dirty(session)
 
-        return self._format_beat_response(scenario, first_beat, session)
+        return self._format_beat_response(session)
 
-    def make_choice(
+    async def make_choice(
         self,
         session_id: str,
         choice_id: str,
         language: str = "en"
     ) -> Optional[Dict]:
         """Process a player's choice"""
-        session = self._get_session(session_id)
+        session = await self._get_session(session_id)
         if not session:
             return None
 
-        scenario = self.scenarios.get(session.scenario_id)
-        if not scenario:
-            return None
-
-        current_beat = scenario.beats.get(session.current_beat_id)
-        if not current_beat:
-            return None
-
-        # Find the chosen choice
-        chosen = None
-        for choice in current_beat.choices:
-            if choice.id == choice_id:
-                chosen = choice
-                break
-
-        if not chosen:
+        # Resolve the choice and the next beat in one table lookup
+        transition = self._graphs[session.scenario_id].transitions[session.current_beat_idx].get(choice_id)
+        if not transition:
             return None
+        next_idx, chosen = transition
 
         # Record choice
         session.choices_made.append((session.current_beat_id, choice_id))
@@ -659,113 +811,206 @@ class StoryModeService:
         session.current_nsfw_level = max(session.current_nsfw_level, chosen.nsfw_level)
 
         # Move to next beat
-        next_beat = scenario.beats.get(chosen.leads_to)
-        if not next_beat:
-            return None
-
+        session.current_beat_idx = next_idx
         session.current_beat_id = chosen.leads_to
         session.history.append(chosen.leads_to)
 
-        # Save session
-        self._save_session(session)
+        # Save session (coalesced with other writes)
+        self._mark_dirty(session)
 
-        return self._format_beat_response(scenario, next_beat, session, language)
+        return self._format_beat_response(session, language)
 
-    def _format_beat_response(
-        self,
-        scenario: Scenario,
-        beat: StoryBeat,
-        session: StorySession,
-        language: str = "en"
-    ) -> Dict:
-        """Format a beat for API response"""
-        is_french = language == "fr"
+    def _build_beat_responses(self) -> Dict[str, Dict[str, List[Dict]]]:
+        """Pre-build the immutable scenario/beat/choices subtree of each response"""
+        responses = {}
+        for scenario_id, graph in self._graphs.items():
+            responses[scenario_id] = {}
+            for language in ("en", "fr"):
+                is_french = language == "fr"
+                view = self._scenario_views[scenario_id][language]
+                responses[scenario_id][language] = [
+                    {
+                        "scenario": {
+                            "id": view["id"],
+                            "title": view["title"],
+                            "setting": view["setting"]
+                        },
+                        "beat": {
+                            "id": beat.id,
+                            "stage": beat.stage.value,
+                            "description": beat.description_fr if is_french else beat.description,
+                            "dialogue": beat.ai_dialogue_fr if is_french else beat.ai_dialogue,
+                            "nsfw_level": beat.nsfw_level,
+                            "is_ending": beat.is_ending,
+                            "ending_type": beat.ending_type
+                        },
+                        "choices": [
+                            {
+                                "id": c.id,
+                                "text": c.text_fr if is_french else c.text,
+                                "nsfw_level": c.nsfw_level
+                            }
+                            for c in beat.choices
+                        ],
+                        "image_prompt": beat.image_prompt
+                    }
+                    for beat in graph.beats
+                ]
+        return responses
+
+    def _format_beat_response(self, session: StorySession, language: str = "en") -> Dict:
+        """Format the session's current beat for API response"""
+        template = self._beat_responses[session.scenario_id][self._language_key(language)][session.current_beat_idx]
 
-        response = {
+        return {
             "session_id": session.session_id,
-            "scenario": {
-                "id": scenario.id,
-                "title": scenario.title_fr if is_french else scenario.title,
-                "setting": scenario.setting
-            },
-            "beat": {
-                "id": beat.id,
-                "stage": beat.stage.value,
-                "description": beat.description_fr if is_french else beat.description,
-                "dialogue": beat.ai_dialogue_fr if is_french else beat.ai_dialogue,
-                "nsfw_level": beat.nsfw_level,
-                "is_ending": beat.is_ending,
-                "ending_type": beat.ending_type
-            },
-            "choices": [
-                {
-                    "id": c.id,
-                    "text": c.text_fr if is_french else c.text,
-                    "nsfw_level": c.nsfw_level
-                }
-                for c in beat.choices
-            ],
-            "image_prompt": beat.image_prompt,
+            **template,
             "session_nsfw_level": session.current_nsfw_level,
             "history_length": len(session.history)
         }
 
-        return response
-
-    def get_session_state(self, session_id: str) -> Optional[Dict]:
+    async def get_session_state(self, session_id: str) -> Optional[Dict]:
         """Get current session state"""
-        session = self._get_session(session_id)
+        session = await self._get_session(session_id)
         if not session:
             return None
 
-        scenario = self.scenarios.get(session.scenario_id)
-        if not scenario:
-            return None
+        return self._format_beat_response(session)
 
-        current_beat = scenario.beats.get(session.current_beat_id)
-        if not current_beat:
-            return None
+    def _session_keys(self, session_id: str) -> Tuple[str, str, str]:
+        """Redis keys for a session's metadata, visited beats and choice ids"""
+        base = f"casdy:story:{session_id}"
+        return f"{base}:meta", f"{base}:history", f"{base}:choices"
 
-        return self._format_beat_response(scenario, current_beat, session)
+    def _cache_session(self, session: StorySession):
+        """Keep a session in the memory cache, evicting the least recently used"""
+        self.active_sessions[session.session_id] = session
+        self.active_sessions.move_to_end(session.session_id)
+        while len(self.active_sessions) > self.MAX_ACTIVE_SESSIONS:
+            evicted_id, _ = self.active_sessions.popitem(last=False)
+            # Forces a full rewrite if the session is still pending a flush
+            self._synced.pop(evicted_id, None)
 
-    def _get_session(self, session_id: str) -> Optional[StorySession]:
+    async def _get_session(self, session_id: str) -> Optional[StorySession]:
         """Get session from cache or Redis"""
         # Check memory cache
-        if session_id in self.active_sessions:
-            return self.active_sessions[session_id]
+        session = self.active_sessions.get(session_id)
+        if session:
+            self.active_sessions.move_to_end(session_id)
+            return session
+
+        # Evicted from the cache but not (fully) written yet: Redis would be behind
+        session = self._dirty.get(session_id) or self._flushing.get(session_id)
+        if session:
+            self._cache_session(session)
+            return session
 
         # Check Redis
         if self.redis_client:
             try:
-                key = f"casdy:story:{session_id}"
-                data = self.redis_client.get(key)
-                if data:
-                    session_dict = json.loads(data)
-                    session = StorySession(**session_dict)
-                    self.active_sessions[session_id] = session
+                meta_key, history_key, choices_key = self._session_keys(session_id)
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.hgetall(meta_key)
+                pipe.lrange(history_key, 0, -1)
+                pipe.lrange(choices_key, 0, -1)
+                meta, history, choice_ids = await pipe.execute()
+                if meta:
+                    session = StorySession.from_redis(session_id, meta, history, choice_ids)
+                    graph = self._graphs.get(session.scenario_id)
+                    if not graph or session.current_beat_id not in graph.beat_index:
+                        return None
+                    session.current_beat_idx = graph.beat_index[session.current_beat_id]
+                    self._cache_session(session)
+                    self._synced[session_id] = len(choice_ids)
                     return session
             except Exception as e:
                 print(f"[StoryMode] Redis load error: {e}")
 
         return None
 
-    def _save_session(self, session: StorySession):
-        """Save session to Redis"""
-        if self.redis_client:
-            try:
-                key = f"casdy:story:{session.session_id}"
-                self.redis_client.set(key, json.dumps(session.to_dict()), ex=86400)  # 24h TTL
-            except Exception as e:
-                print(f"[StoryMode] Redis save error: {e}")
+    def _queue_session_write(self, pipe, session: StorySession) -> int:
+        """
+        Queue the choices made since the last write, plus the session metadata.
+
+        Returns the number of choices persisted once the pipeline executes.
+        """
+        meta_key, history_key, choices_key = self._session_keys(session.session_id)
+
+        # history is appended last in make_choice, so it bounds what is complete
+        made = len(session.history) - 1
+        synced = self._synced.get(session.session_id)
+        if synced is None:
+            pipe.delete(history_key, choices_key)
+            history = session.history[:made + 1]
+            choices = session.choices_made[:made]
+        else:
+            history = session.history[synced + 1:made + 1]
+            choices = session.choices_made[synced:made]
 
-    def end_session(self, session_id: str) -> bool:
+        if history:
+            pipe.rpush(history_key, *history)
+        if choices:
+            pipe.rpush(choices_key, *(choice_id for _, choice_id in choices))
+        pipe.hset(meta_key, mapping=session.to_redis_meta())
+        for key in (meta_key, history_key, choices_key):
+            pipe.expire(key, self.SESSION_TTL)
+
+        return made
+
+    def _mark_dirty(self, session: StorySession):
+        """Queue a session for the next batched Redis write"""
+        if not self.redis_client:
+            return
+
+        self._dirty[session.session_id] = session
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_sessions())
+
+    async def _flush_sessions(self):
+        """
+        Write all dirty sessions to Redis in a single pipeline.
+
+        _flush_task stays set until the pipeline has executed, so flushes never
+        overlap: a second one would re-read the same _synced offsets and push the
+        same choices again. Sessions dirtied meanwhile are written by the next round.
+        """
+        try:
+            while True:
+                await asyncio.sleep(self.FLUSH_INTERVAL)
+                dirty, self._dirty = self._dirty, {}
+                if not dirty:
+                    return
+                self._flushing = dirty
+
+                try:
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    written = {
+                        session_id: self._queue_session_write(pipe, session)
+                        for session_id, session in dirty.items()
+                    }
+                    await pipe.execute()
+                    self._synced.update(written)
+                except Exception as e:
+                    print(f"[StoryMode] Redis save error: {e}")
+                    # Part of the pipeline may have run: rewrite these sessions in full next time
+                    for session_id in dirty:
+                        self._synced.pop(session_id, None)
+                finally:
+                    self._flushing = {}
+        finally:
+            self._flush_task = None
+
+    async def end_session(self, session_id: str) -> bool:
         """End and clean up a session"""
         if session_id in self.active_sessions:
             del self.active_sessions[session_id]
 
+        self._dirty.pop(session_id, None)
+        self._synced.pop(session_id, None)
+
         if self.redis_client:
             try:
-                self.redis_client.delete(f"casdy:story:{session_id}")
+                await self.redis_client.delete(*self._session_keys(session_id))
             except Exception:
                 pass
 
@@ -777,19 +1022,14 @@ class StoryModeService:
         if not scenario:
             return None
 
-        is_french = language == "fr"
+        view = self._scenario_views[scenario.id][self._language_key(language)]
 
         # Count endings
         endings = [b for b in scenario.beats.values() if b.is_ending]
         ending_types = set(b.ending_type for b in endings if b.ending_type)
 
         return {
-            "id": scenario.id,
-            "title": scenario.title_fr if is_french else scenario.title,
-            "description": scenario.description_fr if is_french else scenario.description,
-            "setting": scenario.setting,
-            "mood": scenario.mood,
-            "nsfw_max_level": scenario.nsfw_max_level,
+            **view,
             "total_beats": len(scenario.beats),
             "total_endings": len(endings),
             "ending_types": list(ending_types)
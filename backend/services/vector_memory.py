@@ -9,15 +9,25 @@ This service provides:
 4. Importance-based recall
 """
 
+import os
+import re
 import json
 import hashlib
+import logging
 import asyncio
+import time
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import numpy as np
 
+logger = logging.getLogger("VectorMemory")
+
 try:
+    import torch
     from sentence_transformers import SentenceTransformer
     EMBEDDINGS_AVAILABLE = True
 except ImportError:
@@ -38,6 +48,67 @@ try:
 except ImportError:
     REDIS_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _dumps(obj: Any) -> Any:
+    """Serialize for Redis (orjson bytes when available)"""
+    return orjson.dumps(obj) if ORJSON_AVAILABLE else json.dumps(obj)
+
+
+def _loads(data: Any) -> Any:
+    """Deserialize a value read back from Redis"""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+# Fact type importance weights
+IMPORTANCE_WEIGHTS = {
+    "personal": 5,      # Name, age, job, location
+    "intimate": 5,      # Sexual preferences, fantasies, boundaries
+    "preference": 4,    # Likes, dislikes, hobbies
+    "relationship": 4,  # Relationship status, feelings about user
+    "emotional": 3,     # Moods, feelings expressed
+    "event": 2,         # Things that happened
+    "casual": 1         # Minor details
+}
+
+# Section labels for the LLM context string
+TYPE_LABELS = {
+    "personal": "INFO PERSONNELLE",
+    "intimate": "PREFERENCES INTIMES",
+    "preference": "PREFERENCES",
+    "relationship": "RELATION",
+    "emotional": "EMOTIONS",
+    "event": "EVENEMENTS",
+    "casual": "DIVERS"
+}
+
+# "My name is X" style phrases, capturing the word that follows
+_NAME_RE = re.compile(
+    r"\b(?:my name(?: is)?|name is|mon nom(?: est)?|s'appelle|called|je suis|i am|prénom)[\s:]+([\w'-]+)",
+    re.IGNORECASE
+)
+
+# Bound lookups for the per-fact hot paths
+_IMPORTANCE_GET = IMPORTANCE_WEIGHTS.get
+_TYPE_LABEL_GET = TYPE_LABELS.get
+
 
 @dataclass
 class MemoryFact:
@@ -56,6 +127,161 @@ class MemoryFact:
         return cls(**data)
 
 
+def _object_array(values: List[Any]) -> np.ndarray:
+    """1-D object array (np.array would try to broadcast nested sequences)"""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _overlap_counts_merge(query: np.ndarray, data: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Per-fact count of query tokens, by merging sorted token id runs (compiled with numba)"""
+    n = len(offsets) - 1
+    counts = np.zeros(n, dtype=np.int32)
+    for f in range(n):
+        i = 0
+        j = offsets[f]
+        end = offsets[f + 1]
+        count = 0
+        while i < len(query) and j < end:
+            if query[i] == data[j]:
+                count += 1
+                i += 1
+                j += 1
+            elif query[i] < data[j]:
+                i += 1
+            else:
+                j += 1
+        counts[f] = count
+    return counts
+
+
+def _overlap_counts_isin(query: np.ndarray, data: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Per-fact count of query tokens, vectorized with NumPy"""
+    cumulative = np.concatenate(([0], np.cumsum(np.isin(data, query))))
+    return (cumulative[offsets[1:]] - cumulative[offsets[:-1]]).astype(np.int32)
+
+
+_overlap_counts = njit(cache=True)(_overlap_counts_merge) if NUMBA_AVAILABLE else _overlap_counts_isin
+
+
+class CharacterMemory:
+    """
+    Fallback fact store for one character, as parallel arrays
+
+    Rows are kept ordered by importance (highest first) and capped at
+    MAX_FACTS; MemoryFact objects are only built for returned facts.
+    """
+
+    MAX_FACTS = 200
+
+    def __init__(self):
+        self.contents = _object_array([])
+        self.fact_types = _object_array([])
+        self.timestamps = _object_array([])
+        self.sources = _object_array([])
+        self.hashes = _object_array([])
+        self.importances = np.empty(0, dtype=np.int8)
+        # Sorted unique word ids per fact, for keyword scoring
+        self.tokens = _object_array([])
+        # (N, D) float32 fact embeddings aligned with the rows, built lazily
+        self.embeddings: Optional[np.ndarray] = None
+        self._hash_set = set()
+        self._vocab: Dict[str, int] = {}
+        # (token ids, row offsets) of all facts' tokens, built lazily
+        self._token_index: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.importances)
+
+    @classmethod
+    def from_items(cls, items: List[Tuple[MemoryFact, str]]) -> "CharacterMemory":
+        """Rebuild from stored (fact, hash) pairs, oldest first among equal importance"""
+        memory = cls()
+        memory.extend(sorted(items, key=lambda item: item[0].timestamp))
+        return memory
+
+    def extend(self, items: List[Tuple[MemoryFact, str]]) -> Tuple[List[Tuple[MemoryFact, str]], List[str]]:
+        """
+        Add new facts, skipping known hashes
+
+        Returns the (fact, hash) pairs added and the hashes dropped by the cap
+        """
+        new = []
+        for fact, content_hash in items:
+            if content_hash in self._hash_set:
+                continue
+            self._hash_set.add(content_hash)
+            new.append((fact, content_hash))
+
+        if not new:
+            return [], []
+
+        facts = [fact for fact, _ in new]
+        importances = np.concatenate((
+            self.importances,
+            np.fromiter((f.importance for f in facts), dtype=np.int8, count=len(facts))
+        ))
+
+        # One stable reorder keeps earlier facts ahead of later ones at equal importance
+        order = np.argsort(-importances, kind="stable")
+        order, dropped = order[:self.MAX_FACTS], order[self.MAX_FACTS:]
+        hashes = np.concatenate((self.hashes, _object_array([h for _, h in new])))
+        evicted = hashes[dropped].tolist()
+
+        self.importances = importances[order]
+        self.contents = np.concatenate((self.contents, _object_array([f.content for f in facts])))[order]
+        self.fact_types = np.concatenate((self.fact_types, _object_array([f.fact_type for f in facts])))[order]
+        self.timestamps = np.concatenate((self.timestamps, _object_array([f.timestamp for f in facts])))[order]
+        self.sources = np.concatenate((self.sources, _object_array([f.source for f in facts])))[order]
+        self.hashes = hashes[order]
+        self.tokens = np.concatenate((self.tokens, _object_array([self._tokenize(f.content) for f in facts])))[order]
+        self.embeddings = None
+        self._token_index = None
+
+        # Facts dropped by the cap may be stored again later
+        if evicted:
+            self._hash_set.difference_update(evicted)
+
+        return new, evicted
+
+    def _tokenize(self, text: str) -> np.ndarray:
+        """Sorted unique word ids of a fact, growing the vocabulary"""
+        vocab = self._vocab
+        return np.unique(np.fromiter(
+            (vocab.setdefault(word, len(vocab)) for word in text.lower().split()),
+            dtype=np.int32
+        ))
+
+    def keyword_overlaps(self, query: str) -> np.ndarray:
+        """Number of distinct query words found in each fact"""
+        vocab = self._vocab
+        query_ids = np.unique(np.fromiter(
+            (vocab[word] for word in query.lower().split() if word in vocab),
+            dtype=np.int32
+        ))
+
+        if self._token_index is None:
+            offsets = np.zeros(len(self.tokens) + 1, dtype=np.int64)
+            np.cumsum([len(t) for t in self.tokens], out=offsets[1:])
+            data = np.concatenate(self.tokens) if len(self.tokens) else np.empty(0, dtype=np.int32)
+            self._token_index = (data, offsets)
+
+        return _overlap_counts(query_ids, *self._token_index)
+
+    def fact(self, i: int) -> MemoryFact:
+        return MemoryFact(
+            content=self.contents[i],
+            fact_type=self.fact_types[i],
+            importance=int(self.importances[i]),
+            timestamp=self.timestamps[i],
+            source=self.sources[i]
+        )
+
+    def facts(self, indices) -> List[MemoryFact]:
+        return [self.fact(i) for i in indices]
+
+
 class VectorMemoryService:
     """
     Advanced vector-based memory system with semantic search
@@ -69,29 +295,49 @@ class VectorMemoryService:
     # Embedding model - multilingual for French/English support
     EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
 
-    # Fact type importance weights
-    IMPORTANCE_WEIGHTS = {
-        "personal": 5,      # Name, age, job, location
-        "intimate": 5,      # Sexual preferences, fantasies, boundaries
-        "preference": 4,    # Likes, dislikes, hobbies
-        "relationship": 4,  # Relationship status, feelings about user
-        "emotional": 3,     # Moods, feelings expressed
-        "event": 2,         # Things that happened
-        "casual": 1         # Minor details
+    # Embedding runtime: "onnx" (int8-quantized ONNX Runtime export) or "st" (PyTorch)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "onnx")
+    EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+
+    # Embeddings kept in memory (as float16), keyed by normalized content hash
+    EMBEDDING_CACHE_SIZE = 4096
+
+    # Seconds a character's critical facts are served from memory
+    CRITICAL_CACHE_TTL = 30
+
+    # HNSW sized for small per-character corpora (a few hundred facts at most).
+    # Embeddings are unit-normalized, so inner product ranks like cosine.
+    HNSW_PARAMS = {
+        "hnsw:space": "ip",
+        "hnsw:M": 8,
+        "hnsw:construction_ef": 32,
+        "hnsw:search_ef": 40
     }
+    HNSW_RETRY_SEARCH_EF = 100
+
+    # Redis TTL of the fallback fact store (30 days)
+    FALLBACK_TTL = 86400 * 30
+
+    # Fact type importance weights
+    IMPORTANCE_WEIGHTS = IMPORTANCE_WEIGHTS
 
     def __init__(self, redis_url: str = "redis://localhost:6379", persist_dir: str = "./vector_db"):
         self.persist_dir = persist_dir
         self.redis_url = redis_url
 
-        # Initialize embedding model
-        self.embedder = None
-        if EMBEDDINGS_AVAILABLE:
-            try:
-                self.embedder = SentenceTransformer(self.EMBEDDING_MODEL)
-                print(f"[VectorMemory] Loaded embedding model: {self.EMBEDDING_MODEL}")
-            except Exception as e:
-                print(f"[VectorMemory] Failed to load embedder: {e}")
+        # Embedding model, loaded on first use (see the embedder property)
+        self._embedder = None
+        self._embedder_loaded = False
+        self._embedder_lock = threading.Lock()
+        self.embedder_backend: Optional[str] = None
+
+        # Encoding is CPU-bound: keep it off the event loop
+        self._encode_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vmem-encode")
+
+        # Concurrent CPU encodes oversubscribe torch's intra-op threads, so
+        # serialize them on CPU (widened once a GPU model is loaded)
+        self._embed_sem = asyncio.Semaphore(1)
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
 
         # Initialize ChromaDB for vector storage
         self.chroma_client = None
@@ -99,11 +345,13 @@ class VectorMemoryService:
 
         if CHROMA_AVAILABLE:
             try:
-                self.chroma_client = chromadb.Client(ChromaSettings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                ))
-                print("[VectorMemory] ChromaDB initialized (in-memory mode)")
+                # Persisted so collections (and their HNSW indexes) survive restarts
+                os.makedirs(persist_dir, exist_ok=True)
+                self.chroma_client = chromadb.PersistentClient(
+                    path=persist_dir,
+                    settings=ChromaSettings(anonymized_telemetry=False, allow_reset=True)
+                )
+                print(f"[VectorMemory] ChromaDB initialized (persistent mode: {persist_dir})")
             except Exception as e:
                 print(f"[VectorMemory] ChromaDB init failed: {e}")
 
@@ -118,10 +366,68 @@ class VectorMemoryService:
                 print(f"[VectorMemory] Redis connection failed: {e}")
 
         # In-memory fallback
-        self.memory_cache: Dict[int, List[MemoryFact]] = {}
+        self.memory_cache: Dict[int, CharacterMemory] = {}
+        # character_id -> (fetched at, critical facts)
+        self._critical_cache: Dict[int, Tuple[float, List[MemoryFact]]] = {}
+        # character_id -> ids already in the Chroma collection
+        self._known_ids: Dict[int, set] = {}
 
         print("[VectorMemory] Service initialized")
 
+    @property
+    def embedder(self):
+        """The SentenceTransformer model, loaded on first access (None if unavailable)"""
+        if not self._embedder_loaded:
+            with self._embedder_lock:
+                if not self._embedder_loaded:
+                    if EMBEDDINGS_AVAILABLE:
+                        self._embedder = self._load_embedder()
+                    self._embedder_loaded = True
+        return self._embedder
+
+    async def _embedder_async(self):
+        """The embedder, loaded on the encode thread pool so a first access never blocks the event loop"""
+        if self._embedder_loaded:
+            return self._embedder
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._encode_executor, lambda: self.embedder)
+
+    async def warm_up(self):
+        """Load the embedding model ahead of the first request (called on app startup)"""
+        await self._embedder_async()
+
+    def _load_embedder(self):
+        """Load the embedding model, preferring the quantized ONNX Runtime export"""
+        if self.EMBEDDING_BACKEND == "onnx":
+            try:
+                # Needs sentence-transformers>=3.2 with optimum[onnxruntime]
+                embedder = SentenceTransformer(
+                    self.EMBEDDING_MODEL,
+                    backend="onnx",
+                    model_kwargs={"file_name": self.EMBEDDING_ONNX_FILE, "provider": "CPUExecutionProvider"}
+                )
+                self.embedder_backend = "onnx"
+                torch.set_num_threads(os.cpu_count() or 1)
+                print(f"[VectorMemory] Loaded embedding model: {self.EMBEDDING_MODEL} (ONNX {self.EMBEDDING_ONNX_FILE})")
+                return embedder
+            except Exception as e:
+                logger.warning(f"[VectorMemory] ONNX embedder unavailable ({self.EMBEDDING_ONNX_FILE}), falling back to PyTorch: {e}")
+
+        try:
+            embedder = SentenceTransformer(self.EMBEDDING_MODEL)
+            embedder.eval()
+            self.embedder_backend = "st"
+            if embedder.device.type == "cuda":
+                # A few encodes in flight keep the GPU busy
+                self._embed_sem = asyncio.Semaphore(4)
+            else:
+                torch.set_num_threads(os.cpu_count() or 1)
+            print(f"[VectorMemory] Loaded embedding model: {self.EMBEDDING_MODEL}")
+            return embedder
+        except Exception as e:
+            print(f"[VectorMemory] Failed to load embedder: {e}")
+            return None
+
     def _get_collection(self, character_id: int):
         """Get or create a ChromaDB collection for a character"""
         if not self.chroma_client:
@@ -132,7 +438,7 @@ class VectorMemoryService:
             try:
                 self.collections[character_id] = self.chroma_client.get_or_create_collection(
                     name=collection_name,
-                    metadata={"character_id": character_id}
+                    metadata={**self.HNSW_PARAMS, "character_id": character_id}
                 )
             except Exception as e:
                 print(f"[VectorMemory] Collection creation failed: {e}")
@@ -140,22 +446,138 @@ class VectorMemoryService:
 
         return self.collections[character_id]
 
-    def _compute_embedding(self, text: str) -> Optional[List[float]]:
+    def _get_known_ids(self, character_id: int, collection) -> set:
+        """Ids stored in the character's collection, fetched once then tracked locally"""
+        known = self._known_ids.get(character_id)
+        if known is None:
+            known = self._known_ids[character_id] = set(collection.get(include=[])["ids"])
+        return known
+
+    def _compute_embedding(self, text: str) -> Optional[np.ndarray]:
         """Compute embedding for text"""
         if not self.embedder:
             return None
 
         try:
-            embedding = self.embedder.encode(text, convert_to_numpy=True)
-            return embedding.tolist()
+            with torch.inference_mode():
+                embedding = self.embedder.encode(text, convert_to_numpy=True, normalize_embeddings=True)
+            return np.ascontiguousarray(embedding, dtype=np.float32)
         except Exception as e:
             print(f"[VectorMemory] Embedding error: {e}")
             return None
 
+    def _compute_embeddings(self, texts: List[str]) -> Optional[np.ndarray]:
+        """Compute embeddings for several texts in one batched forward pass"""
+        if not self.embedder:
+            return None
+
+        try:
+            # encode() already length-sorts internally to minimize padding
+            with torch.inference_mode():
+                embeddings = self.embedder.encode(
+                    texts,
+                    batch_size=32,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False
+                )
+            return np.ascontiguousarray(embeddings, dtype=np.float32)
+        except Exception as e:
+            print(f"[VectorMemory] Batch embedding error: {e}")
+            return None
+
+    def _get_cached_embedding(self, key: str) -> Optional[np.ndarray]:
+        """Look up a cached embedding, refreshing its LRU position"""
+        embedding = self._embedding_cache.get(key)
+        if embedding is None:
+            return None
+        self._embedding_cache.move_to_end(key)
+        return embedding.astype(np.float32)
+
+    def _cache_embedding(self, key: str, embedding: np.ndarray):
+        """Cache an embedding as float16, evicting the least recently used"""
+        self._embedding_cache[key] = embedding.astype(np.float16)
+        self._embedding_cache.move_to_end(key)
+        if len(self._embedding_cache) > self.EMBEDDING_CACHE_SIZE:
+            self._embedding_cache.popitem(last=False)
+
+    async def _compute_embeddings_async(self, texts: List[str]) -> Optional[np.ndarray]:
+        """(N, D) float32 embeddings computed on the encode thread pool, encoding cache misses only"""
+        if not texts or not await self._embedder_async():
+            return None
+
+        keys = [self._hash_content(text) for text in texts]
+        embeddings = [self._get_cached_embedding(key) for key in keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+
+        if missing:
+            async with self._embed_sem:
+                loop = asyncio.get_running_loop()
+                computed = await loop.run_in_executor(
+                    self._encode_executor,
+                    self._compute_embeddings,
+                    [texts[i] for i in missing]
+                )
+            if computed is None:
+                return None
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding
+                self._cache_embedding(keys[i], embedding)
+
+        return np.stack(embeddings)
+
+    async def _compute_embedding_async(self, text: str) -> Optional[np.ndarray]:
+        """Compute embedding on the encode thread pool (cached by content hash)"""
+        if not await self._embedder_async():
+            return None
+
+        key = self._hash_content(text)
+        embedding = self._get_cached_embedding(key)
+        if embedding is not None:
+            return embedding
+
+        async with self._embed_sem:
+            loop = asyncio.get_running_loop()
+            embedding = await loop.run_in_executor(self._encode_executor, self._compute_embedding, text)
+
+        if embedding is not None:
+            self._cache_embedding(key, embedding)
+        return embedding
+
     def _hash_content(self, content: str) -> str:
-        """Generate hash for deduplication"""
+        """Generate hash for deduplication (not a security boundary, so non-cryptographic)"""
         normalized = content.lower().strip()
-        return hashlib.md5(normalized.encode()).hexdigest()
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_64_hexdigest(normalized)
+        return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+
+    def _make_fact(
+        self,
+        content: str,
+        fact_type: str,
+        importance: Optional[int],
+        source: str
+    ) -> MemoryFact:
+        """Create a fact, using the type's default importance if none given"""
+        if importance is None:
+            importance = _IMPORTANCE_GET(fact_type, 2)
+
+        return MemoryFact(
+            content=content,
+            fact_type=fact_type,
+            importance=importance,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            source=source
+        )
+
+    def _invalidate_critical(self, character_id: int, importance: int):
+        """
+        Drop the cached critical facts once a fact with importance >= 4 is written.
+        Called after the Chroma write: a recall_critical that ran during the
+        encode await would otherwise re-cache the list without the new fact.
+        """
+        if importance >= 4:
+            self._critical_cache.pop(character_id, None)
 
     async def store_fact(
         self,
@@ -178,18 +600,8 @@ class VectorMemoryService:
         Returns:
             True if stored, False if duplicate or error
         """
-        # Calculate importance
-        if importance is None:
-            importance = self.IMPORTANCE_WEIGHTS.get(fact_type, 2)
-
-        # Create fact object
-        fact = MemoryFact(
-            content=content,
-            fact_type=fact_type,
-            importance=importance,
-            timestamp=datetime.now(timezone.utc).isoformat(),
-            source=source
-        )
+        fact = self._make_fact(content, fact_type, importance, source)
+        importance = fact.importance
 
         # Check for duplicates
         content_hash = self._hash_content(content)
@@ -197,33 +609,42 @@ class VectorMemoryService:
         # Try to store in ChromaDB
         collection = self._get_collection(character_id)
         if collection:
+            known = None
             try:
                 # Check if exists
-                existing = collection.get(ids=[content_hash])
-                if existing and existing['ids']:
+                known = self._get_known_ids(character_id, collection)
+                if content_hash in known:
                     # Update if new importance is higher
-                    old_importance = existing['metadatas'][0].get('importance', 0)
+                    existing = collection.get(ids=[content_hash])
+                    old_importance = existing['metadatas'][0].get('importance', 0) if existing['ids'] else 0
                     if importance > old_importance:
                         collection.update(
                             ids=[content_hash],
                             metadatas=[fact.to_dict()]
                         )
+                        self._invalidate_critical(character_id, importance)
                     return False  # Already exists
 
+                # Claimed before encoding so a concurrent store of the same fact sees it
+                known.add(content_hash)
+
                 # Compute embedding
-                embedding = self._compute_embedding(content)
+                embedding = await self._compute_embedding_async(content)
 
                 # Store new fact
                 collection.add(
                     ids=[content_hash],
-                    embeddings=[embedding] if embedding else None,
+                    embeddings=[embedding] if embedding is not None else None,
                     documents=[content],
                     metadatas=[fact.to_dict()]
                 )
+                self._invalidate_critical(character_id, importance)
                 print(f"[VectorMemory] Stored fact for char {character_id}: {content[:50]}...")
                 return True
 
             except Exception as e:
+                if known is not None:
+                    known.discard(content_hash)
                 print(f"[VectorMemory] ChromaDB store error: {e}")
 
         # Fallback to in-memory + Redis
@@ -231,51 +652,166 @@ class VectorMemoryService:
 
     async def _store_fallback(self, character_id: int, fact: MemoryFact, content_hash: str) -> bool:
         """Fallback storage using Redis/memory"""
-        # In-memory storage
-        if character_id not in self.memory_cache:
-            self.memory_cache[character_id] = []
+        return await self._store_fallback_batch(character_id, [(fact, content_hash)]) > 0
 
-        # Check duplicates
-        existing_hashes = {self._hash_content(f.content) for f in self.memory_cache[character_id]}
-        if content_hash in existing_hashes:
-            return False
-
-        self.memory_cache[character_id].append(fact)
+    async def _store_fallback_batch(
+        self,
+        character_id: int,
+        items: List[Tuple[MemoryFact, str]]
+    ) -> int:
+        """Fallback storage for several facts, with a single sort and Redis write"""
+        # In-memory storage (deduplicated, sorted by importance, limited to 200 facts)
+        memory = self._load_fallback(character_id)
+        if memory is None:
+            memory = self.memory_cache[character_id] = CharacterMemory()
 
-        # Keep sorted by importance and limit to 200 facts
-        self.memory_cache[character_id].sort(key=lambda x: x.importance, reverse=True)
-        self.memory_cache[character_id] = self.memory_cache[character_id][:200]
+        stored, evicted = memory.extend(items)
+        if not stored:
+            return 0
 
-        # Also store in Redis if available
+        # Also store in Redis if available: only the new facts and the evictions
         if self.redis_client:
             try:
-                key = f"casdy:vmem:{character_id}"
-                data = json.dumps([f.to_dict() for f in self.memory_cache[character_id]])
-                self.redis_client.set(key, data, ex=86400 * 30)  # 30 days TTL
+                evicted_set = set(evicted)
+                self._write_fallback(
+                    character_id,
+                    [(fact, content_hash) for fact, content_hash in stored if content_hash not in evicted_set],
+                    evicted
+                )
+            except Exception as e:
+                print(f"[VectorMemory] Redis fallback error: {e}")
+
+        return len(stored)
+
+    def _write_fallback(
+        self,
+        character_id: int,
+        facts: List[Tuple[MemoryFact, str]],
+        evicted: List[str]
+    ):
+        """Write facts to the character's Redis hash (one field per content hash)"""
+        key = f"casdy:vmem:{character_id}"
+        pipe = self.redis_client.pipeline(transaction=False)
+        if facts:
+            pipe.hset(key, mapping={content_hash: _dumps(fact.to_dict()) for fact, content_hash in facts})
+        if evicted:
+            pipe.hdel(key, *evicted)
+        pipe.expire(key, self.FALLBACK_TTL)
+        pipe.execute()
+
+    def _load_fallback(self, character_id: int) -> Optional[CharacterMemory]:
+        """The character's fallback facts, from memory or else Redis (None if there are none)"""
+        memory = self.memory_cache.get(character_id)
+        if memory or not self.redis_client:
+            return memory
+
+        key = f"casdy:vmem:{character_id}"
+        try:
+            try:
+                data = self.redis_client.hgetall(key)
+                items = [(MemoryFact.from_dict(_loads(value)), field) for field, value in data.items()]
+                legacy = False
+            except redis.ResponseError:
+                # Whole-list JSON blob written by older versions
+                items = [
+                    (MemoryFact.from_dict(d), self._hash_content(d["content"]))
+                    for d in _loads(self.redis_client.get(key))
+                ]
+                legacy = True
+        except Exception:
+            return memory
+
+        if not items:
+            return memory
+
+        memory = self.memory_cache[character_id] = CharacterMemory.from_items(items)
+
+        if legacy:
+            try:
+                self.redis_client.delete(key)
+                self._write_fallback(character_id, list(zip(memory.facts(range(len(memory))), memory.hashes)), [])
             except Exception as e:
                 print(f"[VectorMemory] Redis fallback error: {e}")
 
-        return True
+        return memory
 
     async def store_facts_batch(
         self,
         character_id: int,
         facts: List[Dict[str, Any]]
     ) -> int:
-        """Store multiple facts at once"""
-        stored_count = 0
+        """Store multiple facts at once, encoding all new ones in a single batch"""
+        # Build facts, deduplicating within the batch (highest importance wins)
+        batch: Dict[str, MemoryFact] = {}
         for fact_data in facts:
-            success = await self.store_fact(
-                character_id=character_id,
-                content=fact_data.get("content", ""),
-                fact_type=fact_data.get("type", "casual"),
-                importance=fact_data.get("importance"),
-                source=fact_data.get("source", "conversation")
+            content = fact_data.get("content", "")
+            fact = self._make_fact(
+                content,
+                fact_data.get("type", "casual"),
+                fact_data.get("importance"),
+                fact_data.get("source", "conversation")
             )
-            if success:
-                stored_count += 1
+            content_hash = self._hash_content(content)
+            if content_hash not in batch or fact.importance > batch[content_hash].importance:
+                batch[content_hash] = fact
+
+        if not batch:
+            return 0
+
+        collection = self._get_collection(character_id)
+        if collection:
+            new_ids = []
+            known = None
+            try:
+                # Only facts we already know need their metadata fetched
+                known = self._get_known_ids(character_id, collection)
+                duplicates = [fact_id for fact_id in batch if fact_id in known]
+                existing = collection.get(ids=duplicates) if duplicates else None
+                existing_importance = {
+                    fact_id: (metadata or {}).get("importance", 0)
+                    for fact_id, metadata in zip(existing["ids"], existing["metadatas"])
+                } if existing and existing["ids"] else {}
+
+                # Raise importance of facts we already know
+                upgrades = [
+                    fact_id for fact_id, old_importance in existing_importance.items()
+                    if batch[fact_id].importance > old_importance
+                ]
+                if upgrades:
+                    collection.update(
+                        ids=upgrades,
+                        metadatas=[batch[fact_id].to_dict() for fact_id in upgrades]
+                    )
+                    self._invalidate_critical(character_id, max(batch[fact_id].importance for fact_id in upgrades))
+
+                new_ids = [fact_id for fact_id in batch if fact_id not in known]
+                if not new_ids:
+                    return 0
+                known.update(new_ids)
+
+                documents = [batch[fact_id].content for fact_id in new_ids]
+                embeddings = await self._compute_embeddings_async(documents)
 
-        return stored_count
+                collection.add(
+                    ids=new_ids,
+                    embeddings=embeddings,
+                    documents=documents,
+                    metadatas=[batch[fact_id].to_dict() for fact_id in new_ids]
+                )
+                self._invalidate_critical(character_id, max(batch[fact_id].importance for fact_id in new_ids))
+                print(f"[VectorMemory] Stored {len(new_ids)} facts for char {character_id}")
+                return len(new_ids)
+
+            except Exception as e:
+                if known is not None:
+                    known.difference_update(new_ids)
+                print(f"[VectorMemory] ChromaDB batch store error: {e}")
+
+        # Fallback to in-memory + Redis
+        return await self._store_fallback_batch(
+            character_id,
+            [(fact, content_hash) for content_hash, fact in batch.items()]
+        )
 
     async def recall_relevant(
         self,
@@ -298,26 +834,32 @@ class VectorMemoryService:
         """
         # Try ChromaDB semantic search
         collection = self._get_collection(character_id)
-        if collection and self.embedder:
+        if collection and await self._embedder_async():
             try:
-                query_embedding = self._compute_embedding(query)
-
-                results = collection.query(
-                    query_embeddings=[query_embedding] if query_embedding else None,
-                    query_texts=[query] if not query_embedding else None,
-                    n_results=limit * 2,  # Get more, then filter
-                    where={"importance": {"$gte": min_importance}} if min_importance > 1 else None
-                )
+                query_embedding = await self._compute_embedding_async(query)
+
+                # Importance is filtered inside Chroma; results come back in similarity order
+                def run_query():
+                    return collection.query(
+                        query_embeddings=[query_embedding] if query_embedding is not None else None,
+                        query_texts=[query] if query_embedding is None else None,
+                        n_results=limit,
+                        where={"importance": {"$gte": min_importance}}
+                    )
+
+                try:
+                    results = run_query()
+                except RuntimeError as e:
+                    # "Cannot return the results in a contiguous 2D array": ef_search
+                    # too small for the filtered candidate set, widen it and retry
+                    if "contiguous" not in str(e):
+                        raise
+                    collection.modify(configuration={"hnsw": {"ef_search": self.HNSW_RETRY_SEARCH_EF}})
+                    results = run_query()
 
-                facts = []
                 if results and results['metadatas']:
-                    for metadata in results['metadatas'][0]:
-                        if metadata.get('importance', 0) >= min_importance:
-                            facts.append(MemoryFact.from_dict(metadata))
-
-                # Sort by importance and limit
-                facts.sort(key=lambda x: x.importance, reverse=True)
-                return facts[:limit]
+                    return [MemoryFact.from_dict(metadata) for metadata in results['metadatas'][0]]
+                return []
 
             except Exception as e:
                 print(f"[VectorMemory] ChromaDB query error: {e}")
@@ -332,44 +874,82 @@ class VectorMemoryService:
         limit: int,
         min_importance: int
     ) -> List[MemoryFact]:
-        """Fallback recall using keyword matching"""
+        """Fallback recall: cosine similarity if an embedder is loaded, else keyword matching"""
         # Load from cache or Redis
-        facts = self.memory_cache.get(character_id, [])
+        memory = self._load_fallback(character_id)
 
-        if not facts and self.redis_client:
-            try:
-                key = f"casdy:vmem:{character_id}"
-                data = self.redis_client.get(key)
-                if data:
-                    facts = [MemoryFact.from_dict(d) for d in json.loads(data)]
-                    self.memory_cache[character_id] = facts
-            except Exception:
-                pass
-
-        if not facts:
+        if not memory:
             return []
 
-        # Filter by importance
-        facts = [f for f in facts if f.importance >= min_importance]
+        if await self._embedder_async():
+            ranked = await self._rank_by_similarity(memory, query, limit, min_importance)
+            if ranked is not None:
+                return ranked
 
-        # Simple keyword matching
-        query_words = set(query.lower().split())
+        # Filter by importance
+        eligible = np.flatnonzero(memory.importances >= min_importance)
 
-        def relevance_score(fact: MemoryFact) -> float:
-            fact_words = set(fact.content.lower().split())
-            overlap = len(query_words & fact_words)
-            return overlap * fact.importance
+        # Simple keyword matching: word overlap x importance
+        scores = memory.keyword_overlaps(query)[eligible] * memory.importances[eligible]
 
         # Sort by relevance
-        facts.sort(key=relevance_score, reverse=True)
+        top = eligible[np.argsort(-scores, kind="stable")[:limit]]
+        return memory.facts(top)
+
+    async def _get_fact_matrix(self, memory: CharacterMemory) -> Optional[np.ndarray]:
+        """(N, D) float32 matrix of the (unit-normalized) fact embeddings"""
+        if memory.embeddings is not None:
+            return memory.embeddings
+
+        contents = memory.contents
+        embeddings = await self._compute_embeddings_async(contents.tolist())
+
+        # Facts stored while encoding reorder the rows: the matrix no longer lines up
+        if embeddings is None or memory.contents is not contents:
+            return None
+
+        memory.embeddings = embeddings
+        return embeddings
 
-        return facts[:limit]
+    async def _rank_by_similarity(
+        self,
+        memory: CharacterMemory,
+        query: str,
+        limit: int,
+        min_importance: int
+    ) -> Optional[List[MemoryFact]]:
+        """Top facts by cosine similarity x importance, in one matrix-vector product"""
+        query_embedding = await self._compute_embedding_async(query)
+        matrix = await self._get_fact_matrix(memory)
+        if matrix is None or query_embedding is None:
+            return None
+
+        importances = memory.importances.astype(np.float32)
+        eligible = importances >= min_importance
+        k = min(limit, int(eligible.sum()))
+        if k == 0:
+            return []
+
+        # Dot product of unit vectors == cosine similarity
+        scores = (matrix @ query_embedding) * importances
+        scores[~eligible] = -np.inf
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return memory.facts(top)
 
     async def recall_critical(self, character_id: int) -> List[MemoryFact]:
         """
         Recall critical facts (importance >= 4) that should always be included
         These are things like user's name, key preferences, etc.
+
+        Cached per character for CRITICAL_CACHE_TTL seconds; storing a fact
+        with importance >= 4 invalidates the entry.
         """
+        cached = self._critical_cache.get(character_id)
+        if cached and time.monotonic() - cached[0] < self.CRITICAL_CACHE_TTL:
+            return list(cached[1])
+
         collection = self._get_collection(character_id)
         if collection:
             try:
@@ -383,14 +963,17 @@ class VectorMemoryService:
                     for metadata in results['metadatas']:
                         facts.append(MemoryFact.from_dict(metadata))
 
-                return facts
+                self._critical_cache[character_id] = (time.monotonic(), facts)
+                return list(facts)
 
             except Exception as e:
                 print(f"[VectorMemory] Critical recall error: {e}")
 
         # Fallback
-        all_facts = self.memory_cache.get(character_id, [])
-        return [f for f in all_facts if f.importance >= 4][:10]
+        memory = self.memory_cache.get(character_id)
+        if not memory:
+            return []
+        return memory.facts(np.flatnonzero(memory.importances >= 4)[:10])
 
     async def get_user_name(self, character_id: int) -> Optional[str]:
         """Get the user's name if stored"""
@@ -398,20 +981,10 @@ class VectorMemoryService:
 
         for fact in critical_facts:
             if fact.fact_type == "personal":
-                content_lower = fact.content.lower()
-                # Look for name patterns
-                name_patterns = [
-                    "name is", "s'appelle", "called", "je suis", "i am",
-                    "mon nom", "my name", "prénom"
-                ]
-                for pattern in name_patterns:
-                    if pattern in content_lower:
-                        # Extract the name (word after pattern)
-                        idx = content_lower.find(pattern) + len(pattern)
-                        rest = fact.content[idx:].strip()
-                        name = rest.split()[0] if rest else None
-                        if name:
-                            return name.strip(".,!?")
+                # Look for name patterns (word after pattern)
+                match = _NAME_RE.search(fact.content)
+                if match:
+                    return match.group(1).strip(".,!?")
 
         return None
 
@@ -432,47 +1005,27 @@ class VectorMemoryService:
         # Get query-relevant facts
         relevant = await self.recall_relevant(character_id, query, limit=max_facts)
 
-        # Combine and deduplicate
-        all_facts = []
-        seen_hashes = set()
-
+        # Deduplicate and group by type in one pass (content equality, first seen wins)
+        seen = set()
+        by_type: Dict[str, List[str]] = {}
         for fact in critical + relevant:
-            fact_hash = self._hash_content(fact.content)
-            if fact_hash not in seen_hashes:
-                all_facts.append(fact)
-                seen_hashes.add(fact_hash)
+            if fact.content in seen:
+                continue
+            seen.add(fact.content)
+            by_type.setdefault(fact.fact_type, []).append(fact.content)
 
-        if not all_facts:
+        if not by_type:
             return ""
 
-        # Format by type
-        formatted_parts = []
-
-        # Group by type
-        by_type: Dict[str, List[str]] = {}
-        for fact in all_facts:
-            if fact.fact_type not in by_type:
-                by_type[fact.fact_type] = []
-            by_type[fact.fact_type].append(fact.content)
-
-        # Format each type
-        type_labels = {
-            "personal": "INFO PERSONNELLE",
-            "intimate": "PREFERENCES INTIMES",
-            "preference": "PREFERENCES",
-            "relationship": "RELATION",
-            "emotional": "EMOTIONS",
-            "event": "EVENEMENTS",
-            "casual": "DIVERS"
-        }
-
-        for fact_type, contents in by_type.items():
-            label = type_labels.get(fact_type, fact_type.upper())
-            formatted_parts.append(f"[{label}]")
-            for content in contents[:3]:  # Max 3 per type
-                formatted_parts.append(f"- {content}")
-
-        return "\n".join(formatted_parts)
+        # Format each type, max 3 facts per type
+        return "\n".join(
+            line
+            for fact_type, contents in by_type.items()
+            for line in (
+                f"[{_TYPE_LABEL_GET(fact_type) or fact_type.upper()}]",
+                *(f"- {content}" for content in contents[:3])
+            )
+        )
 
     async def clear_character_memory(self, character_id: int) -> bool:
         """Clear all memory for a character"""
@@ -488,6 +1041,8 @@ class VectorMemoryService:
         # Clear cache
         if character_id in self.memory_cache:
             del self.memory_cache[character_id]
+        self._critical_cache.pop(character_id, None)
+        self._known_ids.pop(character_id, None)
 
         # Clear Redis
         if self.redis_client:
@@ -525,13 +1080,13 @@ class VectorMemoryService:
             except Exception:
                 pass
         else:
-            facts = self.memory_cache.get(character_id, [])
-            stats["total_facts"] = len(facts)
+            memory = self.memory_cache.get(character_id) or CharacterMemory()
+            stats["total_facts"] = len(memory)
             stats["storage_backend"] = "memory" if not self.redis_client else "redis"
 
-            for fact in facts:
-                stats["by_type"][fact.fact_type] = stats["by_type"].get(fact.fact_type, 0) + 1
-                stats["by_importance"][fact.importance] = stats["by_importance"].get(fact.importance, 0) + 1
+            stats["by_type"] = dict(Counter(memory.fact_types.tolist()))
+            for importance, count in Counter(memory.importances.tolist()).items():
+                stats["by_importance"][importance] = stats["by_importance"].get(importance, 0) + count
 
         return stats
 
@@ -3,14 +3,29 @@ Test Diverse Batch Generation - 15 varied images across all NSFW levels
 Validates diversity and quality improvements
 """
 import asyncio
-import sys
+import os
 
-# Fix Windows event loop
-if sys.platform == 'win32':
-    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+from _test_utils import banner, use_fast_event_loop
+
+use_fast_event_loop()
 
 from image_service_v2 import image_service_v2
 
+# Max batches hitting the image backend at once
+BATCH_CONCURRENCY = int(os.getenv("IMAGE_BATCH_CONCURRENCY", "4"))
+
+
+async def _run_batch(sem: asyncio.Semaphore, title: str, count: int, nsfw_level: int) -> list:
+    """Run one generate_batch call once a concurrency slot is free"""
+    async with sem:
+        banner(title)
+        return await image_service_v2.generate_batch(
+            count=count,
+            nsfw_level=nsfw_level,
+            width=1024,
+            height=1024
+        )
+
 
 async def test_complete_diversity():
     """
@@ -27,9 +42,7 @@ async def test_complete_diversity():
     - Contexts (bedroom, car, bathroom, etc.)
     """
 
-    print("\n" + "="*70)
-    print("🎨 COMPREHENSIVE DIVERSITY TEST - V2 Service")
-    print("="*70)
+    banner("🎨 COMPREHENSIVE DIVERSITY TEST - V2 Service")
     print("\nObjectif: Générer 15 images TOUTES DIFFÉRENTES")
     print("Critères:")
     print("  ✓ Ethnicités variées (pas toutes caucasiennes)")
@@ -39,73 +52,29 @@ async def test_complete_diversity():
     print("  ✓ PAS de 'same face syndrome'")
     print("="*70)
 
-    all_results = []
-
-    # Batch 1: SFW (5 images)
-    print("\n" + "="*70)
-    print("BATCH 1: 5 SFW Images (Safe for Work)")
-    print("="*70)
-    results_sfw = await image_service_v2.generate_batch(
-        count=5,
-        nsfw_level=0,
-        width=1024,
-        height=1024,
-        delay=3
-    )
-    all_results.extend(results_sfw)
-
-    # Batch 2: Sensual/Lingerie (5 images)
-    print("\n" + "="*70)
-    print("BATCH 2: 5 Sensual/Lingerie Images (NSFW 1)")
-    print("="*70)
-    results_sensual = await image_service_v2.generate_batch(
-        count=5,
-        nsfw_level=1,
-        width=1024,
-        height=1024,
-        delay=3
-    )
-    all_results.extend(results_sensual)
-
-    # Batch 3: Topless (3 images)
-    print("\n" + "="*70)
-    print("BATCH 3: 3 Topless Images (NSFW 2)")
-    print("="*70)
-    results_topless = await image_service_v2.generate_batch(
-        count=3,
-        nsfw_level=2,
-        width=1024,
-        height=1024,
-        delay=3
-    )
-    all_results.extend(results_topless)
-
-    # Batch 4: Full Nude (2 images)
-    print("\n" + "="*70)
-    print("BATCH 4: 2 Full Nude Images (NSFW 3)")
-    print("="*70)
-    results_nude = await image_service_v2.generate_batch(
-        count=2,
-        nsfw_level=3,
-        width=1024,
-        height=1024,
-        delay=3
-    )
-    all_results.extend(results_nude)
+    # The four batches run concurrently, at most BATCH_CONCURRENCY at a time
+    # and share one HTTP session (connection keep-alive, DNS cache)
+    sem = asyncio.Semaphore(BATCH_CONCURRENCY)
+    async with image_service_v2.session():
+        results_sfw, results_sensual, results_topless, results_nude = await asyncio.gather(
+            _run_batch(sem, "BATCH 1: 5 SFW Images (Safe for Work)", count=5, nsfw_level=0),
+            _run_batch(sem, "BATCH 2: 5 Sensual/Lingerie Images (NSFW 1)", count=5, nsfw_level=1),
+            _run_batch(sem, "BATCH 3: 3 Topless Images (NSFW 2)", count=3, nsfw_level=2),
+            _run_batch(sem, "BATCH 4: 2 Full Nude Images (NSFW 3)", count=2, nsfw_level=3)
+        )
+    all_results = results_sfw + results_sensual + results_topless + results_nude
 
     # Final Summary
-    print("\n" + "="*70)
-    print("📊 FINAL SUMMARY - DIVERSITY TEST")
-    print("="*70)
+    banner("📊 FINAL SUMMARY - DIVERSITY TEST")
 
-    success_count = len([r for r in all_results if r])
+    success_count = sum(map(bool, all_results))
     print(f"\n✅ Generated: {success_count}/15 images")
 
     print("\nBreakdown by NSFW Level:")
-    print(f"  Level 0 (SFW):     {len([r for r in results_sfw if r])}/5")
-    print(f"  Level 1 (Sensual): {len([r for r in results_sensual if r])}/5")
-    print(f"  Level 2 (Topless): {len([r for r in results_topless if r])}/3")
-    print(f"  Level 3 (Nude):    {len([r for r in results_nude if r])}/2")
+    print(f"  Level 0 (SFW):     {sum(map(bool, results_sfw))}/5")
+    print(f"  Level 1 (Sensual): {sum(map(bool, results_sensual))}/5")
+    print(f"  Level 2 (Topless): {sum(map(bool, results_topless))}/3")
+    print(f"  Level 3 (Nude):    {sum(map(bool, results_nude))}/2")
 
     # Diversity stats
     stats = image_service_v2.get_stats()
@@ -113,9 +82,7 @@ async def test_complete_diversity():
     print(f"  Total prompts generated: {stats['total_prompts_generated']}")
     print(f"  Diversity enforcement: {stats['diversity_enforcement']}")
 
-    print("\n" + "="*70)
-    print("🔍 VALIDATION MANUELLE REQUISE")
-    print("="*70)
+    banner("🔍 VALIDATION MANUELLE REQUISE")
     print("\nVérifier visuellement chaque image pour:")
     print("  1. Visages TOUS DIFFÉRENTS (ethnicité, traits, âge)")
     print("  2. Imperfections naturelles visibles")
@@ -132,9 +99,9 @@ async def test_complete_diversity():
 
 if __name__ == "__main__":
     print("\n🚀 Starting Comprehensive Diversity Test...")
-    print("⏱️  Estimated time: ~60 seconds (15 images × 3s delay)")
+    print(f"⏱️  {BATCH_CONCURRENCY} batches in parallel, paced only if the backend throttles")
 
     results = asyncio.run(test_complete_diversity())
 
     print("\n✅ Test completed!")
-    print(f"📊 Results: {len([r for r in results if r])}/15 successful")
+    print(f"📊 Results: {sum(map(bool, results))}/15 successful")
@@ -5,57 +5,79 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from image_service import image_service
-
+from _test_utils import banner, use_fast_event_loop
 
-async def test_sfw():
-    """Test SFW generation with Z-Image-Turbo via fal-ai"""
-    print("\n" + "=" * 60)
-    print("TEST 1: SFW Content (Z-Image-Turbo via fal-ai)")
-    print("=" * 60)
-
-    prompt = "beautiful woman with long brown hair, professional portrait, elegant dress, studio lighting"
+use_fast_event_loop()
 
+from image_service import image_service
+import _test_image_cache
+
+
+SFW_REQUEST = dict(
+    prompt="beautiful woman with long brown hair, professional portrait, elegant dress, studio lighting",
+    nsfw=False,
+    nsfw_level=0,
+    width=1024,
+    height=1024
+)
+
+NSFW_REQUEST = dict(
+    prompt="beautiful woman, bedroom, seductive pose, looking at camera",
+    nsfw=True,
+    nsfw_level=3,
+    width=1024,
+    height=1024
+)
+
+
+async def _generate_many_cached(requests):
+    """image_service.generate_many for the requests not already in the test image cache"""
+    keys = [
+        _test_image_cache.make_key(r["prompt"], r["nsfw_level"], r["width"], r["height"])
+        for r in requests
+    ]
+    results = [None] * len(requests)
+    if _test_image_cache.enabled():
+        for i, key in enumerate(keys):
+            path = _test_image_cache.get(key)
+            if path is not None:
+                print(f"(cached) {path.name}")
+                results[i] = path.name
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    generated = await image_service.generate_many([requests[i] for i in missing]) if missing else []
+    for i, result in zip(missing, generated):
+        results[i] = result
+        if isinstance(result, str) and _test_image_cache.enabled():
+            _test_image_cache.put(keys[i], image_service.get_image_path(result))
+
+    return results
+
+
+def _report(label, result):
+    """Print the outcome of one generation, returning the filename or None"""
     try:
-        filename = await image_service.generate(
-            prompt=prompt,
-            width=1024,
-            height=1024,
-            nsfw=False,
-            nsfw_level=0
-        )
-        filepath = image_service.get_image_path(filename)
+        if isinstance(result, Exception):
+            raise result
+        filepath = image_service.get_image_path(result)
         size = os.path.getsize(filepath)
-        print(f"\nSUCCESS: {filename} ({size/1024:.1f} KB)")
-        return filename
+        print(f"\n{label} SUCCESS: {result} ({size/1024:.1f} KB)")
+        return result
     except Exception as e:
-        print(f"\nFAILED: {e}")
+        print(f"\n{label} FAILED: {e}")
         return None
 
 
-async def test_nsfw():
-    """Test NSFW generation"""
-    print("\n" + "=" * 60)
-    print("TEST 2: NSFW Content (Spaces or Pollinations fallback)")
-    print("=" * 60)
+async def test_sfw():
+    """Test SFW generation with Z-Image-Turbo via fal-ai"""
+    banner("TEST 1: SFW Content (Z-Image-Turbo via fal-ai)", width=60)
+    return _report("SFW", (await _generate_many_cached([SFW_REQUEST]))[0])
 
-    prompt = "beautiful woman, bedroom, seductive pose, looking at camera"
 
-    try:
-        filename = await image_service.generate(
-            prompt=prompt,
-            width=1024,
-            height=1024,
-            nsfw=True,
-            nsfw_level=3
-        )
-        filepath = image_service.get_image_path(filename)
-        size = os.path.getsize(filepath)
-        print(f"\nSUCCESS: {filename} ({size/1024:.1f} KB)")
-        return filename
-    except Exception as e:
-        print(f"\nFAILED: {e}")
-        return None
+async def test_nsfw():
+    """Test NSFW generation"""
+    banner("TEST 2: NSFW Content (Spaces or Pollinations fallback)", width=60)
+    return _report("NSFW", (await _generate_many_cached([NSFW_REQUEST]))[0])
 
 
 async def main():
@@ -63,11 +85,11 @@ async def main():
     print("IMAGE SERVICE v6.0 - FINAL TEST")
     print("=" * 60)
 
-    # Test SFW
-    sfw_result = await test_sfw()
-
-    # Test NSFW
-    nsfw_result = await test_nsfw()
+    # Both tests in one generate_many call
+    banner("TEST 1 + 2: SFW and NSFW Content", width=60)
+    sfw_result, nsfw_result = await _generate_many_cached([SFW_REQUEST, NSFW_REQUEST])
+    sfw_result = _report("SFW", sfw_result)
+    nsfw_result = _report("NSFW", nsfw_result)
 
     print("\n" + "=" * 60)
     print("SUMMARY")
@@ -79,5 +101,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    # --no-cache: regenerate even if an identical image is cached
     success = asyncio.run(main())
     sys.exit(0 if success else 1)
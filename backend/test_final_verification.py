@@ -8,10 +8,36 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-if sys.platform == 'win32':
-    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+from _test_utils import banner, use_fast_event_loop
+
+use_fast_event_loop()
 
 from image_service_free import free_image_service
+import _test_image_cache
+
+# Max generations in flight against the free image backend
+MAX_CONCURRENT_TESTS = 3
+
+
+async def _run_one(i: int, test: dict, sem: asyncio.Semaphore, total: int):
+    """Generate one test image once a slot is free"""
+    async with sem:
+        print(f"\n[{i}/{total}] {test['name']}")
+        print(f"Prompt: {test['prompt']}")
+        print(f"NSFW Level: {test['nsfw_level']}")
+        print(f"Attendu: {test['expected']}")
+        print("-" * 70)
+
+        return await _test_image_cache.cached_generate(
+            _test_image_cache.make_key(test['prompt'], test['nsfw_level'], 512, 512),
+            lambda: free_image_service.generate(
+                prompt=test['prompt'],
+                nsfw_level=test['nsfw_level'],
+                width=512,
+                height=512,
+                model="flux"
+            )
+        )
 
 
 async def run_final_tests():
@@ -50,62 +76,42 @@ async def run_final_tests():
         }
     ]
 
-    print("\n" + "="*70)
-    print("🔥 TESTS DE VÉRIFICATION FINALE")
-    print("="*70)
+    banner("🔥 TESTS DE VÉRIFICATION FINALE")
     print("Objectif: Vérifier cohérence et qualité sur 5 exemples variés")
     print("="*70)
 
-    results = []
+    # Tests run concurrently; the semaphore rate-limits the free backend
+    sem = asyncio.Semaphore(MAX_CONCURRENT_TESTS)
+    raw = await asyncio.gather(
+        *[_run_one(i, test, sem, len(tests)) for i, test in enumerate(tests, 1)],
+        return_exceptions=True
+    )
 
-    for i, test in enumerate(tests, 1):
-        print(f"\n[{i}/5] {test['name']}")
-        print(f"Prompt: {test['prompt']}")
-        print(f"NSFW Level: {test['nsfw_level']}")
-        print(f"Attendu: {test['expected']}")
-        print("-" * 70)
-
-        try:
-            image_path = await free_image_service.generate(
-                prompt=test['prompt'],
-                nsfw_level=test['nsfw_level'],
-                width=512,
-                height=512,
-                model="flux"
-            )
-
-            if image_path:
-                print(f"✅ SUCCESS: {image_path}")
-                results.append({
-                    "test": test['name'],
-                    "status": "SUCCESS",
-                    "path": image_path
-                })
-            else:
-                print(f"❌ FAILED: No image generated")
-                results.append({
-                    "test": test['name'],
-                    "status": "FAILED"
-                })
-
-            # Wait between requests
-            if i < len(tests):
-                print("⏱️  Waiting 5s...")
-                await asyncio.sleep(5)
-
-        except Exception as e:
-            print(f"❌ ERROR: {e}")
+    results = []
+    for test, image_path in zip(tests, raw):
+        if isinstance(image_path, Exception):
+            print(f"❌ ERROR ({test['name']}): {image_path}")
             results.append({
                 "test": test['name'],
                 "status": "ERROR",
-                "error": str(e)
+                "error": str(image_path)
+            })
+        elif image_path:
+            print(f"✅ SUCCESS ({test['name']}): {image_path}")
+            results.append({
+                "test": test['name'],
+                "status": "SUCCESS",
+                "path": image_path
+            })
+        else:
+            print(f"❌ FAILED ({test['name']}): No image generated")
+            results.append({
+                "test": test['name'],
+                "status": "FAILED"
             })
-            await asyncio.sleep(5)
 
     # Summary
-    print("\n" + "="*70)
-    print("📊 RÉSUMÉ FINAL")
-    print("="*70)
+    banner("📊 RÉSUMÉ FINAL")
 
     success_count = sum(1 for r in results if r['status'] == 'SUCCESS')
 
@@ -115,9 +121,7 @@ async def run_final_tests():
         if result['status'] == 'SUCCESS':
             print(f"    → {result['path']}")
 
-    print(f"\n{'='*70}")
-    print(f"RÉSULTAT: {success_count}/5 tests réussis")
-    print(f"{'='*70}")
+    banner(f"RÉSULTAT: {success_count}/5 tests réussis")
 
     if success_count == 5:
         print("\n🎉 TOUS LES TESTS PASSÉS!")
@@ -141,4 +145,5 @@ async def run_final_tests():
 
 
 if __name__ == "__main__":
+    # --no-cache: regenerate even if an identical image is cached
     asyncio.run(run_final_tests())
@@ -1,25 +1,102 @@
 """Test script for image generation with new character fields"""
 import sys
 import io
+import re
 import asyncio
+import threading
+from functools import lru_cache
+from sqlalchemy.orm import load_only
 from database import SessionLocal
 from models import Character
-from services.image_prompt_agents import CharacterDescriptionAgent, ImagePromptOrchestrator
+from _test_utils import banner
+from services.image_prompt_agents import CharacterDescriptionAgent, ImagePromptOrchestrator, image_prompt_orchestrator
 
 # Fix Windows console encoding
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
 
 
+# Test characters created by test_character_creation.py, fetched once by _load_characters()
+TEST_CHARACTER_IDS = [7, 8, 9]
+_CHAR_CACHE = {}
+
+# The only Character columns the tests read
+_CHARACTER_COLUMNS = [
+    Character.id, Character.name, Character.ethnicity, Character.age_range,
+    Character.body_type, Character.breast_size, Character.butt_size,
+    Character.hair_color, Character.hair_length, Character.hair_style,
+    Character.eye_color, Character.face_shape, Character.lip_style,
+    Character.nose_shape, Character.eyebrow_style, Character.skin_tone,
+    Character.skin_details, Character.waist_type, Character.hip_type,
+    Character.leg_type, Character.physical_description,
+]
+
+
+# char_dict keys: the basic creation fields, then the detailed appearance fields
+_BASIC_FIELDS = (
+    "name", "ethnicity", "age_range", "body_type", "breast_size", "butt_size",
+    "hair_color", "hair_length", "eye_color",
+)
+_DETAILED_FIELDS = (
+    "hair_style", "face_shape", "lip_style", "nose_shape", "eyebrow_style",
+    "skin_tone", "skin_details", "waist_type", "hip_type", "leg_type",
+    "physical_description",
+)
+
+
+# Agents shared by all tests, built on first use (tests 1-3 run in threads)
+_AGENT = None
+_ORCH = None
+_AGENTS_LOCK = threading.Lock()
+
+
+def _agent() -> CharacterDescriptionAgent:
+    global _AGENT
+    with _AGENTS_LOCK:
+        if _AGENT is None:
+            _AGENT = CharacterDescriptionAgent()
+    return _AGENT
+
+
+def _orchestrator() -> ImagePromptOrchestrator:
+    # The module already built one at import: reuse it rather than building a second
+    global _ORCH
+    with _AGENTS_LOCK:
+        if _ORCH is None:
+            _ORCH = image_prompt_orchestrator
+    return _ORCH
+
+
+@lru_cache(maxsize=16)
+def _make_char_dict(char_id: int, include_detailed: bool = True) -> dict:
+    """char_dict for a cached test character (shared between tests: treat as read-only)"""
+    character = _CHAR_CACHE[char_id]
+    fields = _BASIC_FIELDS + _DETAILED_FIELDS if include_detailed else _BASIC_FIELDS
+    return {field: getattr(character, field) for field in fields}
+
+
+def _load_characters():
+    """Fetch all test characters in one query, detached so they outlive the session"""
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(Character)
+            .options(load_only(*_CHARACTER_COLUMNS))
+            .filter(Character.id.in_(TEST_CHARACTER_IDS))
+            .all()
+        )
+        _CHAR_CACHE.update({c.id: c for c in rows})
+        db.expunge_all()
+    finally:
+        db.close()
+
+
 def test_basic_character_image_prompt():
     """Test 1: Image prompt from basic character fields"""
-    print("\n" + "="*70)
-    print("TEST 1: Basic Character Image Prompt")
-    print("="*70)
+    banner("TEST 1: Basic Character Image Prompt")
 
-    db = SessionLocal()
     try:
         # Get the basic character we created (ID 7)
-        character = db.query(Character).filter(Character.id == 7).first()
+        character = _CHAR_CACHE.get(7)
 
         if not character:
             print("❌ Character ID 7 not found. Run test_character_creation.py first.")
@@ -32,18 +109,8 @@ def test_basic_character_image_prompt():
         print(f"   - Body: {character.body_type}")
 
         # Build character description
-        agent = CharacterDescriptionAgent()
-        char_dict = {
-            "name": character.name,
-            "ethnicity": character.ethnicity,
-            "age_range": character.age_range,
-            "body_type": character.body_type,
-            "breast_size": character.breast_size,
-            "butt_size": character.butt_size,
-            "hair_color": character.hair_color,
-            "hair_length": character.hair_length,
-            "eye_color": character.eye_color,
-        }
+        agent = _agent()
+        char_dict = _make_char_dict(7, include_detailed=False)
 
         description = agent.build_description(char_dict)
 
@@ -58,20 +125,15 @@ def test_basic_character_image_prompt():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        db.close()
 
 
 def test_detailed_character_image_prompt():
     """Test 2: Image prompt from detailed character fields"""
-    print("\n" + "="*70)
-    print("TEST 2: Detailed Character Image Prompt")
-    print("="*70)
+    banner("TEST 2: Detailed Character Image Prompt")
 
-    db = SessionLocal()
     try:
         # Get the detailed character (ID 8)
-        character = db.query(Character).filter(Character.id == 8).first()
+        character = _CHAR_CACHE.get(8)
 
         if not character:
             print("❌ Character ID 8 not found. Run test_character_creation.py first.")
@@ -86,29 +148,8 @@ def test_detailed_character_image_prompt():
         print(f"   - Hips: {character.hip_type}")
 
         # Build character description
-        agent = CharacterDescriptionAgent()
-        char_dict = {
-            "name": character.name,
-            "ethnicity": character.ethnicity,
-            "age_range": character.age_range,
-            "body_type": character.body_type,
-            "breast_size": character.breast_size,
-            "butt_size": character.butt_size,
-            "hair_color": character.hair_color,
-            "hair_length": character.hair_length,
-            "eye_color": character.eye_color,
-            # NEW FIELDS
-            "hair_style": character.hair_style,
-            "face_shape": character.face_shape,
-            "lip_style": character.lip_style,
-            "nose_shape": character.nose_shape,
-            "eyebrow_style": character.eyebrow_style,
-            "skin_tone": character.skin_tone,
-            "skin_details": character.skin_details,
-            "waist_type": character.waist_type,
-            "hip_type": character.hip_type,
-            "leg_type": character.leg_type,
-        }
+        agent = _agent()
+        char_dict = _make_char_dict(8)
 
         description = agent.build_description(char_dict)
 
@@ -116,14 +157,16 @@ def test_detailed_character_image_prompt():
         print(f"   {description.physical_prompt[:400]}...")
 
         # Check if new fields are included
+        # Single words are checked against the prompt's word set, phrases as substrings
         prompt_lower = description.physical_prompt.lower()
+        words = set(re.findall(r"[a-z]+", prompt_lower))
         checks = [
-            ("hair style" in prompt_lower or "waves" in prompt_lower, "Hair style"),
-            ("oval" in prompt_lower, "Face shape"),
-            ("lips" in prompt_lower or "lipstick" in prompt_lower, "Lip style"),
-            ("olive" in prompt_lower or "tan" in prompt_lower, "Skin tone"),
-            ("waist" in prompt_lower, "Waist type"),
-            ("hips" in prompt_lower, "Hip type"),
+            ("hair style" in prompt_lower or "waves" in words, "Hair style"),
+            ("oval" in words, "Face shape"),
+            ("lips" in words or "lipstick" in words, "Lip style"),
+            ("olive" in words or "tan" in words, "Skin tone"),
+            ("waist" in words, "Waist type"),
+            ("hips" in words, "Hip type"),
         ]
 
         print(f"\n🔍 Field inclusion check:")
@@ -146,20 +189,15 @@ def test_detailed_character_image_prompt():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        db.close()
 
 
 def test_custom_physical_description():
     """Test 3: Image prompt from custom physical_description (PRIORITY)"""
-    print("\n" + "="*70)
-    print("TEST 3: Custom Physical Description (CRITICAL PRIORITY)")
-    print("="*70)
+    banner("TEST 3: Custom Physical Description (CRITICAL PRIORITY)")
 
-    db = SessionLocal()
     try:
         # Get the custom character (ID 9)
-        character = db.query(Character).filter(Character.id == 9).first()
+        character = _CHAR_CACHE.get(9)
 
         if not character:
             print("❌ Character ID 9 not found. Run test_character_creation.py first.")
@@ -170,17 +208,8 @@ def test_custom_physical_description():
         print(f"   {character.physical_description[:200]}...")
 
         # Build character description
-        agent = CharacterDescriptionAgent()
-        char_dict = {
-            "name": character.name,
-            "ethnicity": character.ethnicity,
-            "age_range": character.age_range,
-            "body_type": character.body_type,
-            "hair_color": character.hair_color,
-            "eye_color": character.eye_color,
-            # CRITICAL: Custom physical description
-            "physical_description": character.physical_description,
-        }
+        agent = _agent()
+        char_dict = _make_char_dict(9)
 
         description = agent.build_description(char_dict)
 
@@ -203,20 +232,15 @@ def test_custom_physical_description():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        db.close()
 
 
 async def test_full_image_prompt_builder():
     """Test 4: Complete image prompt with pose/location/outfit"""
-    print("\n" + "="*70)
-    print("TEST 4: Full Image Prompt Builder")
-    print("="*70)
+    banner("TEST 4: Full Image Prompt Builder")
 
-    db = SessionLocal()
     try:
         # Use the detailed character
-        character = db.query(Character).filter(Character.id == 8).first()
+        character = _CHAR_CACHE.get(8)
 
         if not character:
             print("❌ Character ID 8 not found.")
@@ -225,26 +249,9 @@ async def test_full_image_prompt_builder():
         print(f"\n📋 Character: {character.name}")
 
         # Create prompt orchestrator
-        orchestrator = ImagePromptOrchestrator()
-
-        char_dict = {
-            "name": character.name,
-            "ethnicity": character.ethnicity,
-            "age_range": character.age_range,
-            "body_type": character.body_type,
-            "breast_size": character.breast_size,
-            "butt_size": character.butt_size,
-            "hair_color": character.hair_color,
-            "hair_length": character.hair_length,
-            "hair_style": character.hair_style,
-            "eye_color": character.eye_color,
-            "face_shape": character.face_shape,
-            "lip_style": character.lip_style,
-            "skin_tone": character.skin_tone,
-            "waist_type": character.waist_type,
-            "hip_type": character.hip_type,
-            "leg_type": character.leg_type,
-        }
+        orchestrator = _orchestrator()
+
+        char_dict = _make_char_dict(8)
 
         # Build full prompt with context
         result = await orchestrator.generate_prompt(
@@ -259,11 +266,12 @@ async def test_full_image_prompt_builder():
 
         # Check if all elements are present
         prompt_lower = full_prompt.lower()
+        words = set(re.findall(r"[a-z]+", prompt_lower))
         checks = [
-            ("standing" in prompt_lower or "hand on hip" in prompt_lower, "Pose"),
-            ("penthouse" in prompt_lower or "luxury" in prompt_lower, "Location"),
-            ("dress" in prompt_lower or "red" in prompt_lower, "Outfit"),
-            ("oval" in prompt_lower or "face" in prompt_lower, "Character details"),
+            ("standing" in words or "hand on hip" in prompt_lower, "Pose"),
+            ("penthouse" in words or "luxury" in words, "Location"),
+            ("dress" in words or "red" in words, "Outfit"),
+            ("oval" in words or "face" in words, "Character details"),
         ]
 
         print(f"\n🔍 Prompt components check:")
@@ -286,24 +294,25 @@ async def test_full_image_prompt_builder():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        db.close()
 
 
 async def main():
-    print("\n" + "="*70)
-    print("🧪 IMAGE GENERATION PROMPT TEST SUITE")
-    print("="*70)
-
-    # Run all tests
-    test1 = test_basic_character_image_prompt()
-    test2 = test_detailed_character_image_prompt()
-    test3 = test_custom_physical_description()
-    test4 = await test_full_image_prompt_builder()
-
-    print("\n" + "="*70)
-    print("📊 TEST SUMMARY")
-    print("="*70)
+    banner("🧪 IMAGE GENERATION PROMPT TEST SUITE")
+
+    _load_characters()
+    if not _CHAR_CACHE:
+        print(f"\n❌ No test characters found (IDs {TEST_CHARACTER_IDS}). Run test_character_creation.py first.")
+        return
+
+    # Run all tests: the sync ones in threads, overlapping test 4's LLM call
+    test1, test2, test3, test4 = await asyncio.gather(
+        asyncio.to_thread(test_basic_character_image_prompt),
+        asyncio.to_thread(test_detailed_character_image_prompt),
+        asyncio.to_thread(test_custom_physical_description),
+        test_full_image_prompt_builder()
+    )
+
+    banner("📊 TEST SUMMARY")
     print(f"Test 1 (Basic):    {'✅ PASSED' if test1 else '❌ FAILED'}")
     print(f"Test 2 (Detailed): {'✅ PASSED' if test2 else '❌ FAILED'}")
     print(f"Test 3 (Custom):   {'✅ PASSED' if test3 else '❌ FAILED'}")
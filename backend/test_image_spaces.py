@@ -2,9 +2,12 @@
 import sys
 import io
 import asyncio
-import requests
+import importlib.util
+import httpx
+from concurrent.futures import ThreadPoolExecutor
 from gradio_client import Client as GradioClient
 from config import settings
+from _test_utils import banner
 
 # Fix Windows console encoding
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
@@ -15,79 +18,102 @@ SPACES_TO_TEST = [
     "Heartsync/NSFW-image"
 ]
 
-def test_space_availability(space_name):
-    """Test if a space is available"""
-    print(f"\n{'='*60}")
-    print(f"Testing: {space_name}")
-    print(f"{'='*60}")
+# Seconds to wait for a Gradio client to connect
+CONNECT_TIMEOUT = 30
 
-    # 1. Check space status via API
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Gradio clients connect synchronously; never waited on at exit so a hung
+# connection attempt can't block the report
+_CONNECT_EXECUTOR = ThreadPoolExecutor(max_workers=len(SPACES_TO_TEST), thread_name_prefix="gradio-connect")
+
+# Connected Gradio clients by space name (connecting re-fetches the space config)
+_CLIENT_CACHE: dict = {}
+
+
+def _get_client(space_name):
+    client = _CLIENT_CACHE.get(space_name)
+    if client is None:
+        client = _CLIENT_CACHE[space_name] = GradioClient(space_name, hf_token=settings.HF_API_TOKEN)
+    return client
+
+
+async def test_space_availability(space_name, client: httpx.AsyncClient):
+    """Test if a space is available (report printed in one block once done)"""
+    lines = []
     try:
-        print("1. Checking space status via HF API...")
-        response = requests.get(
-            f"https://huggingface.co/api/spaces/{space_name}",
-            timeout=10
-        )
-        if response.status_code == 200:
-            data = response.json()
-            print(f"   Status: {data.get('runtime', {}).get('stage', 'UNKNOWN')}")
-            print(f"   SDK: {data.get('sdk', 'UNKNOWN')}")
-            print(f"   Likes: {data.get('likes', 0)}")
-        else:
-            print(f"   ERROR: HTTP {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"   ERROR: {e}")
+        return await _probe(space_name, client, lines.append)
+    finally:
+        banner(f"Testing: {space_name}", width=60)
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+async def _probe(space_name, client: httpx.AsyncClient, out) -> bool:
+    # 1 + 2. Space status and runtime status, requested together
+    status, runtime = await asyncio.gather(
+        client.get(f"https://huggingface.co/api/spaces/{space_name}"),
+        client.get(f"https://huggingface.co/api/spaces/{space_name}/runtime"),
+        return_exceptions=True
+    )
+
+    out("1. Checking space status via HF API...")
+    if isinstance(status, Exception):
+        out(f"   ERROR: {status}")
         return False
+    if status.status_code != 200:
+        out(f"   ERROR: HTTP {status.status_code}")
+        return False
+    data = status.json()
+    out(f"   Status: {data.get('runtime', {}).get('stage', 'UNKNOWN')}")
+    out(f"   SDK: {data.get('sdk', 'UNKNOWN')}")
+    out(f"   Likes: {data.get('likes', 0)}")
+
+    out("2. Checking runtime status...")
+    if isinstance(runtime, Exception):
+        out(f"   ERROR: {runtime}")
+    elif runtime.status_code != 200:
+        out(f"   ERROR: HTTP {runtime.status_code}")
+    else:
+        data = runtime.json()
+        out(f"   Stage: {data.get('stage', 'UNKNOWN')}")
+        out(f"   Hardware: {data.get('hardware', {}).get('current', 'UNKNOWN')}")
 
-    # 2. Check runtime status
+    # 3. Test connection with Gradio Client
+    out("3. Testing Gradio Client connection...")
+    loop = asyncio.get_running_loop()
     try:
-        print("2. Checking runtime status...")
-        response = requests.get(
-            f"https://huggingface.co/api/spaces/{space_name}/runtime",
-            timeout=10
+        gradio_client = await asyncio.wait_for(
+            loop.run_in_executor(_CONNECT_EXECUTOR, _get_client, space_name),
+            timeout=CONNECT_TIMEOUT
         )
-        if response.status_code == 200:
-            data = response.json()
-            print(f"   Stage: {data.get('stage', 'UNKNOWN')}")
-            print(f"   Hardware: {data.get('hardware', {}).get('current', 'UNKNOWN')}")
-        else:
-            print(f"   ERROR: HTTP {response.status_code}")
+    except asyncio.TimeoutError:
+        out(f"   FAILED: Connection timeout after {CONNECT_TIMEOUT}s")
+        return False
     except Exception as e:
-        print(f"   ERROR: {e}")
+        out(f"   FAILED: {e}")
+        return False
 
-    # 3. Test connection with Gradio Client
-    try:
-        print("3. Testing Gradio Client connection...")
-        print("   (This may take 10-30 seconds...)")
-
-        # Timeout after 30 seconds
-        import signal
-
-        def timeout_handler(signum, frame):
-            raise TimeoutError("Connection timeout")
-
-        # Set alarm for 30 seconds (Unix only)
-        # For Windows, we'll use a different approach
-        try:
-            client = GradioClient(space_name, hf_token=settings.HF_API_TOKEN)
-            print(f"   SUCCESS! Connected to {space_name}")
-            print(f"   API endpoints: {len(client.endpoints) if hasattr(client, 'endpoints') else 'Unknown'}")
-            return True
-        except Exception as e:
-            print(f"   FAILED: {e}")
-            return False
+    out(f"   SUCCESS! Connected to {space_name}")
+    out(f"   API endpoints: {len(gradio_client.endpoints) if hasattr(gradio_client, 'endpoints') else 'Unknown'}")
+    return True
 
-    except Exception as e:
-        print(f"   ERROR: {e}")
-        return False
+
+async def probe_all_spaces() -> dict:
+    """Probe every space concurrently over one pooled HTTP client"""
+    transport = httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, retries=2)
+    async with httpx.AsyncClient(
+        transport=transport,
+        timeout=10,
+        limits=httpx.Limits(max_connections=32)
+    ) as client:
+        results = await asyncio.gather(*[test_space_availability(space, client) for space in SPACES_TO_TEST])
+    return dict(zip(SPACES_TO_TEST, results))
 
 
 def test_alternative_models():
     """Suggest alternative models that might work better"""
-    print("\n" + "="*60)
-    print("ALTERNATIVE MODELS TO CONSIDER")
-    print("="*60)
+    banner("ALTERNATIVE MODELS TO CONSIDER", width=60)
 
     alternatives = [
         {
@@ -123,13 +149,10 @@ def main():
     print("="*60)
     print(f"\nHF Token: {'SET' if settings.HF_API_TOKEN else 'NOT SET'}")
 
-    results = {}
-    for space in SPACES_TO_TEST:
-        results[space] = test_space_availability(space)
+    print("(Probing all spaces, Gradio connections may take 10-30 seconds...)")
+    results = asyncio.run(probe_all_spaces())
 
-    print("\n" + "="*60)
-    print("SUMMARY")
-    print("="*60)
+    banner("SUMMARY", width=60)
     for space, success in results.items():
         status = "OK" if success else "FAILED"
         emoji = "✓" if success else "✗"
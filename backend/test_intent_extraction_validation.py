@@ -20,44 +20,173 @@ Sources:
 """
 
 import asyncio
+import json
+import os
+import re
 import sys
-from typing import List, Dict, Any, Tuple
-from dataclasses import dataclass
-from enum import Enum
+import unicodedata
+from collections import defaultdict, deque
+from contextlib import aclosing
+from typing import List, Dict, Any, Optional, Tuple, FrozenSet, Set, AsyncIterator, ClassVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add parent directory to path for imports
 sys.path.append('.')
 
-from services.image_prompt_agents import generate_image_prompt
+from services.image_prompt_agents import image_prompt_orchestrator, iter_image_prompts
+from _test_prompt_cache import ExactPromptCache, SemanticPromptCache
 
+# Soft matches (rapidfuzz 0-100) tolerating conjugations and typos:
+# partial_ratio of a keyword against the prompt, ratio of an extracted against an expected object
+FUZZY_KEYWORD_THRESHOLD = 80
+FUZZY_OBJECT_THRESHOLD = 70
 
-class ValidationCriterion(Enum):
-    """Validation criteria based on research"""
-    OBJECT_EXTRACTION = "object_extraction"  # TIFA-based
-    ACTION_DETECTION = "action_detection"    # Task decomposition
-    LOCATION_IDENTIFICATION = "location_identification"  # NER-based
-    NSFW_CLASSIFICATION = "nsfw_classification"  # Intent classification
-    SEMANTIC_CONSISTENCY = "semantic_consistency"  # VIEScore SC
-    PROMPT_COMPLETENESS = "prompt_completeness"  # Coverage metric
-    MULTILINGUAL = "multilingual"  # Language invariance
+# Failures whose details are kept for the end-of-run report
+MAX_FAILED_DETAILS = 50
 
+# Default for cases in flight at once; each one is a chain of LLM calls on the provider
+MAX_CONCURRENT_CASES = 32
 
-@dataclass
+# Character every test request is addressed to (read-only: shared by all cases)
+TEST_CHARACTER = MappingProxyType({
+    "name": "Test Character",
+    "personality": "friendly, helpful",
+    "age": "25",
+    "ethnicity": "european",
+})
+
+
+class ValidationCriterion(IntEnum):
+    """Validation criteria based on research (values index score vectors)"""
+    OBJECT_EXTRACTION = 0  # TIFA-based
+    ACTION_DETECTION = 1    # Task decomposition
+    LOCATION_IDENTIFICATION = 2  # NER-based
+    NSFW_CLASSIFICATION = 3  # Intent classification
+    SEMANTIC_CONSISTENCY = 4  # VIEScore SC
+    PROMPT_COMPLETENESS = 5  # Coverage metric
+    MULTILINGUAL = 6  # Language invariance
+
+
+# Report names, indexed by ValidationCriterion
+CRITERION_NAMES = (
+    "object_extraction",
+    "action_detection",
+    "location_identification",
+    "nsfw_classification",
+    "semantic_consistency",
+    "prompt_completeness",
+    "multilingual",
+)
+
+# Weight of each criterion in the overall score, indexed by ValidationCriterion
+CRITERION_WEIGHTS = np.ones(len(ValidationCriterion), dtype=np.float64)
+
+
+@dataclass(slots=True, frozen=True)
 class TestCase:
     """Single test case with ground truth"""
     id: int
     category: str
     language: str
     user_request: str
-    expected_objects: List[str]
+    expected_objects: Tuple[str, ...]
     expected_action: str
     expected_location: str
     expected_nsfw_level: int  # 0-3
-    expected_in_prompt: List[str]  # Keywords that must appear in final prompt
+    expected_in_prompt: Tuple[str, ...]  # Keywords that must appear in final prompt (casefolded)
     description: str
-
-
-@dataclass
+    # expected_objects casefolded, as a tuple and as a set for exact hits
+    expected_objects_folded: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _expected_objects_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    # Finds an expected object inside an extracted one; the joined form finds the reverse
+    _objects_re: Optional[re.Pattern] = field(init=False, repr=False, compare=False)
+    _objects_joined: str = field(init=False, repr=False, compare=False)
+    # user_request encoded once, for hashing into cache keys
+    user_request_utf8: bytes = field(init=False, repr=False, compare=False)
+    # One-pass matcher for expected_in_prompt, and the keywords each match implies
+    _keyword_re: Optional[re.Pattern] = field(init=False, repr=False, compare=False)
+    _keyword_closure: Dict[str, FrozenSet[str]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # NFC so "é" typed as e + combining accent reaches the LLM and cache keys as one form
+        user_request = unicodedata.normalize("NFC", self.user_request)
+        object.__setattr__(self, "user_request", user_request)
+        object.__setattr__(self, "user_request_utf8", user_request.encode("utf-8"))
+        object.__setattr__(self, "expected_in_prompt", tuple(kw.casefold() for kw in self.expected_in_prompt))
+        objects_folded = tuple(obj.casefold() for obj in self.expected_objects)
+        object.__setattr__(self, "expected_objects_folded", objects_folded)
+        object.__setattr__(self, "_expected_objects_set", frozenset(objects_folded))
+        object.__setattr__(
+            self, "_objects_re",
+            re.compile("|".join(map(re.escape, objects_folded))) if objects_folded else None
+        )
+        object.__setattr__(self, "_objects_joined", "\0".join(objects_folded))
+
+        # Longest first inside a lookahead: every start position is tried, and a
+        # shorter keyword hidden inside a longer match is recovered via the closure
+        keywords = sorted(set(self.expected_in_prompt), key=len, reverse=True)
+        pattern = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))") if keywords else None
+        closure = {kw: frozenset(k for k in keywords if k in kw) for kw in keywords}
+        object.__setattr__(self, "_keyword_re", pattern)
+        object.__setattr__(self, "_keyword_closure", closure)
+
+    def object_matches(self, objects_folded: List[str]) -> List[bool]:
+        """Per extracted object (casefolded): equal to, containing or contained in an expected object"""
+        if self._objects_re is None:
+            return [False] * len(objects_folded)
+        # Equal, else expected inside obj (one regex scan), else obj inside an expected one
+        # (one scan of the NUL-joined expected objects; NUL never occurs in either)
+        return [
+            bool(obj in self._expected_objects_set
+                 or self._objects_re.search(obj)
+                 or obj in self._objects_joined)
+            for obj in objects_folded
+        ]
+
+    def object_true_positives(self, objects_folded: List[str]) -> int:
+        """Extracted objects matching an expected one, exactly/by containment or softly"""
+        matched = self.object_matches(objects_folded)
+        unmatched = [obj for obj, hit in zip(objects_folded, matched) if not hit]
+        true_positives = sum(matched)
+        if unmatched and self.expected_objects_folded:
+            # Soft true positives: near-spellings of an expected object
+            similarity = process.cdist(unmatched, self.expected_objects_folded, scorer=fuzz.ratio)
+            true_positives += int(np.count_nonzero(similarity.max(axis=1) >= FUZZY_OBJECT_THRESHOLD))
+        return true_positives
+
+    def canonical_request(self) -> str:
+        """user_request up to case and whitespace: requests equal here get the same LLM answer"""
+        return " ".join(self.user_request.casefold().split())
+
+    def keywords_in(self, prompt_folded: str) -> Set[str]:
+        """expected_in_prompt keywords occurring in an already casefolded prompt"""
+        if self._keyword_re is None:
+            return set()
+        found = set()
+        for match in self._keyword_re.finditer(prompt_folded):
+            found |= self._keyword_closure[match.group(1)]
+        return found
+
+
+@dataclass(slots=True, frozen=True)
 class ValidationResult:
     """Result of validation for a test case"""
     test_id: int
@@ -72,6 +201,611 @@ class ValidationResult:
     failures: List[str]
 
 
+def _f1_batch_loop(true_positives: np.ndarray, n_expected: np.ndarray, n_extracted: np.ndarray) -> np.ndarray:
+    """Object F1 per run, one loop iteration per run (compiled with numba, runs in parallel)"""
+    out = np.empty(true_positives.shape[0])
+    for i in prange(true_positives.shape[0]):
+        precision = true_positives[i] / n_extracted[i] if n_extracted[i] else 0.0
+        recall = true_positives[i] / n_expected[i] if n_expected[i] else 0.0
+        out[i] = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+    return out
+
+
+def _f1_batch_numpy(true_positives: np.ndarray, n_expected: np.ndarray, n_extracted: np.ndarray) -> np.ndarray:
+    """Object F1 per run, vectorized with NumPy"""
+    tp = true_positives.astype(np.float64)
+    precision = np.divide(tp, n_extracted, out=np.zeros_like(tp), where=n_extracted != 0)
+    recall = np.divide(tp, n_expected, out=np.zeros_like(tp), where=n_expected != 0)
+    total = precision + recall
+    return np.divide(2 * precision * recall, total, out=np.zeros_like(tp), where=total > 0)
+
+
+# Same formula as validate_test_case's object F1, over many runs at once
+f1_batch = njit(parallel=True, cache=True)(_f1_batch_loop) if NUMBA_AVAILABLE else _f1_batch_numpy
+
+
+# ============================================================================
+# Test Corpus
+# ============================================================================
+
+# Test ids are positions in this table, starting at 1
+_RAW_CASES: Tuple[Dict[str, Any], ...] = (
+    # ===================================================================
+    # CATEGORY 1: SIMPLE OBJECTS (10 tests)
+    # ===================================================================
+
+    # Test 1: Single object - lollipop (French)
+    dict(category="simple_object", language="fr",
+         user_request="Envoie moi une photo de toi avec une sucette",
+         expected_objects=("lollipop", "candy"),
+         expected_action="holding",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("lollipop", "holding", "candy"),
+         description="Single object - lollipop in French"),
+
+    # Test 2: Single object - book (English)
+    dict(category="simple_object", language="en",
+         user_request="Send me a photo of you reading a book",
+         expected_objects=("book",),
+         expected_action="reading",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("book", "reading"),
+         description="Single object - book with action"),
+
+    # Test 3: Single object - glasses (French)
+    dict(category="simple_object", language="fr",
+         user_request="Une photo avec des lunettes",
+         expected_objects=("glasses",),
+         expected_action="wearing",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("glasses", "wearing"),
+         description="Single object - glasses"),
+
+    # Test 4: Single object - phone (English)
+    dict(category="simple_object", language="en",
+         user_request="Show me a selfie with your phone",
+         expected_objects=("phone", "smartphone"),
+         expected_action="holding",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("phone", "holding", "selfie"),
+         description="Single object - phone selfie"),
+
+    # Test 5: Single object - coffee (French)
+    dict(category="simple_object", language="fr",
+         user_request="Photo de toi avec un café",
+         expected_objects=("coffee", "cup"),
+         expected_action="holding",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("coffee", "cup", "holding"),
+         description="Single object - coffee cup"),
+
+    # Test 6: Single object - flower (English)
+    dict(category="simple_object", language="en",
+         user_request="I want a picture with a rose",
+         expected_objects=("rose", "flower"),
+         expected_action="holding",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("rose", "flower", "holding"),
+         description="Single object - rose flower"),
+
+    # Test 7: Single object - wine glass (French)
+    dict(category="simple_object", language="fr",
+         user_request="Montre moi une photo avec un verre de vin",
+         expected_objects=("wine glass", "wine"),
+         expected_action="holding",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("wine", "glass", "holding"),
+         description="Single object - wine glass"),
+
+    # Test 8: Single object - umbrella (English)
+    dict(category="simple_object", language="en",
+         user_request="Photo with an umbrella",
+         expected_objects=("umbrella",),
+         expected_action="holding",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("umbrella", "holding"),
+         description="Single object - umbrella"),
+
+    # Test 9: Single object - headphones (French)
+    dict(category="simple_object", language="fr",
+         user_request="Une photo avec des écouteurs",
+         expected_objects=("headphones", "earphones"),
+         expected_action="wearing",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("headphones", "wearing"),
+         description="Single object - headphones"),
+
+    # Test 10: Single object - necklace (English)
+    dict(category="simple_object", language="en",
+         user_request="Show me a photo wearing a necklace",
+         expected_objects=("necklace", "jewelry"),
+         expected_action="wearing",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("necklace", "wearing"),
+         description="Single object - necklace jewelry"),
+
+    # ===================================================================
+    # CATEGORY 2: MULTIPLE OBJECTS (10 tests)
+    # ===================================================================
+
+    # Test 11: Two objects - book and coffee
+    dict(category="multiple_objects", language="en",
+         user_request="Photo of you reading a book with coffee",
+         expected_objects=("book", "coffee", "cup"),
+         expected_action="reading",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("book", "coffee", "reading"),
+         description="Two objects - book and coffee"),
+
+    # Test 12: Two objects - phone and sunglasses (French)
+    dict(category="multiple_objects", language="fr",
+         user_request="Selfie avec ton téléphone et des lunettes de soleil",
+         expected_objects=("phone", "sunglasses"),
+         expected_action="taking selfie",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("phone", "sunglasses", "selfie"),
+         description="Two objects - phone and sunglasses"),
+
+    # Test 13: Three objects - laptop, coffee, headphones
+    dict(category="multiple_objects", language="en",
+         user_request="Working photo with laptop, coffee and headphones",
+         expected_objects=("laptop", "coffee", "headphones"),
+         expected_action="working",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("laptop", "coffee", "headphones", "working"),
+         description="Three objects - work setup"),
+
+    # Test 14: Two objects - wine and candle (French)
+    dict(category="multiple_objects", language="fr",
+         user_request="Photo romantique avec du vin et des bougies",
+         expected_objects=("wine", "candles"),
+         expected_action="sitting",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("wine", "candles", "romantic"),
+         description="Two objects - wine and candles romantic"),
+
+    # Test 15: Two objects - book and glasses
+    dict(category="multiple_objects", language="en",
+         user_request="I want a photo reading with glasses on",
+         expected_objects=("book", "glasses"),
+         expected_action="reading",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("reading", "glasses", "book"),
+         description="Two objects - reading with glasses"),
+
+    # Test 16: Three objects - flowers, hat, sunglasses (French)
+    dict(category="multiple_objects", language="fr",
+         user_request="Photo d'été avec des fleurs, un chapeau et des lunettes de soleil",
+         expected_objects=("flowers", "hat", "sunglasses"),
+         expected_action="posing",
+         expected_location="outdoor",
+         expected_nsfw_level=0,
+         expected_in_prompt=("flowers", "hat", "sunglasses", "summer"),
+         description="Three objects - summer accessories"),
+
+    # Test 17: Two objects - pen and notebook
+    dict(category="multiple_objects", language="en",
+         user_request="Show me writing with a pen and notebook",
+         expected_objects=("pen", "notebook"),
+         expected_action="writing",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("pen", "notebook", "writing"),
+         description="Two objects - pen and notebook"),
+
+    # Test 18: Two objects - camera and bag (French)
+    dict(category="multiple_objects", language="fr",
+         user_request="Photo avec un appareil photo et un sac",
+         expected_objects=("camera", "bag"),
+         expected_action="holding",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("camera", "bag", "holding"),
+         description="Two objects - camera and bag"),
+
+    # Test 19: Four objects - lipstick, mirror, brush, perfume
+    dict(category="multiple_objects", language="en",
+         user_request="Makeup photo with lipstick, mirror, brush and perfume",
+         expected_objects=("lipstick", "mirror", "brush", "perfume"),
+         expected_action="applying makeup",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("lipstick", "mirror", "brush", "perfume", "makeup"),
+         description="Four objects - makeup items"),
+
+    # Test 20: Three objects - guitar, microphone, headphones (French)
+    dict(category="multiple_objects", language="fr",
+         user_request="Photo musicale avec une guitare, un micro et des écouteurs",
+         expected_objects=("guitar", "microphone", "headphones"),
+         expected_action="playing music",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("guitar", "microphone", "headphones", "music"),
+         description="Three objects - music equipment"),
+
+    # ===================================================================
+    # CATEGORY 3: ACTIONS (10 tests)
+    # ===================================================================
+
+    # Test 21: Action - sucking lollipop (French) - KEY TEST
+    dict(category="action", language="fr",
+         user_request="Envoie moi une photo de toi en train de sucer une sucette",
+         expected_objects=("lollipop", "candy"),
+         expected_action="sucking lollipop",
+         expected_location="",
+         expected_nsfw_level=1,
+         expected_in_prompt=("sucking", "lollipop", "tongue"),
+         description="KEY TEST: Sucking lollipop action"),
+
+    # Test 22: Action - dancing (English)
+    dict(category="action", language="en",
+         user_request="I want to see you dancing",
+         expected_objects=(),
+         expected_action="dancing",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("dancing", "movement"),
+         description="Action - dancing"),
+
+    # Test 23: Action - stretching (French)
+    dict(category="action", language="fr",
+         user_request="Photo de toi en train de t'étirer",
+         expected_objects=(),
+         expected_action="stretching",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("stretching", "arms"),
+         description="Action - stretching"),
+
+    # Test 24: Action - blowing kiss (English)
+    dict(category="action", language="en",
+         user_request="Send me a photo blowing a kiss",
+         expected_objects=(),
+         expected_action="blowing kiss",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("blowing kiss", "lips", "hand"),
+         description="Action - blowing kiss"),
+
+    # Test 25: Action - winking (French)
+    dict(category="action", language="fr",
+         user_request="Fais moi un clin d'œil",
+         expected_objects=(),
+         expected_action="winking",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("winking", "eye", "playful"),
+         description="Action - winking"),
+
+    # Test 26: Action - laughing (English)
+    dict(category="action", language="en",
+         user_request="Photo of you laughing",
+         expected_objects=(),
+         expected_action="laughing",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("laughing", "smiling", "happy"),
+         description="Action - laughing"),
+
+    # Test 27: Action - looking back (French)
+    dict(category="action", language="fr",
+         user_request="Photo où tu regardes en arrière",
+         expected_objects=(),
+         expected_action="looking back",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("looking back", "over shoulder"),
+         description="Action - looking back"),
+
+    # Test 28: Action - touching hair (English)
+    dict(category="action", language="en",
+         user_request="I want a photo of you touching your hair",
+         expected_objects=(),
+         expected_action="touching hair",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("touching", "hair", "hand"),
+         description="Action - touching hair"),
+
+    # Test 29: Action - biting lip (French)
+    dict(category="action", language="fr",
+         user_request="Photo en train de te mordre la lèvre",
+         expected_objects=(),
+         expected_action="biting lip",
+         expected_location="",
+         expected_nsfw_level=1,
+         expected_in_prompt=("biting", "lip", "seductive"),
+         description="Action - biting lip (sensual)"),
+
+    # Test 30: Action - lying down (English)
+    dict(category="action", language="en",
+         user_request="Show me you lying down relaxed",
+         expected_objects=(),
+         expected_action="lying down",
+         expected_location="bed",
+         expected_nsfw_level=0,
+         expected_in_prompt=("lying", "relaxed", "bed"),
+         description="Action - lying down"),
+
+    # ===================================================================
+    # CATEGORY 4: LOCATIONS (10 tests)
+    # ===================================================================
+
+    # Test 31: Location - classroom (French) - KEY TEST
+    dict(category="location", language="fr",
+         user_request="Photo sexy de toi en prof dans ta classe",
+         expected_objects=("glasses", "desk", "blackboard"),
+         expected_action="standing",
+         expected_location="classroom",
+         expected_nsfw_level=1,
+         expected_in_prompt=("classroom", "teacher", "blackboard", "desk"),
+         description="KEY TEST: Classroom teacher location"),
+
+    # Test 32: Location - beach (English)
+    dict(category="location", language="en",
+         user_request="Send me a photo at the beach",
+         expected_objects=(),
+         expected_action="standing",
+         expected_location="beach",
+         expected_nsfw_level=0,
+         expected_in_prompt=("beach", "sand", "ocean"),
+         description="Location - beach"),
+
+    # Test 33: Location - car (French)
+    dict(category="location", language="fr",
+         user_request="Selfie dans ta voiture",
+         expected_objects=("phone",),
+         expected_action="taking selfie",
+         expected_location="car interior",
+         expected_nsfw_level=0,
+         expected_in_prompt=("car", "interior", "driver seat"),
+         description="Location - car interior"),
+
+    # Test 34: Location - gym (English)
+    dict(category="location", language="en",
+         user_request="Photo at the gym working out",
+         expected_objects=(),
+         expected_action="working out",
+         expected_location="gym",
+         expected_nsfw_level=0,
+         expected_in_prompt=("gym", "fitness", "exercise"),
+         description="Location - gym"),
+
+    # Test 35: Location - kitchen (French)
+    dict(category="location", language="fr",
+         user_request="Photo de toi dans la cuisine",
+         expected_objects=(),
+         expected_action="cooking",
+         expected_location="kitchen",
+         expected_nsfw_level=0,
+         expected_in_prompt=("kitchen", "cooking", "counter"),
+         description="Location - kitchen"),
+
+    # Test 36: Location - bathroom (English)
+    dict(category="location", language="en",
+         user_request="Bathroom mirror selfie",
+         expected_objects=("phone", "mirror"),
+         expected_action="taking selfie",
+         expected_location="bathroom",
+         expected_nsfw_level=0,
+         expected_in_prompt=("bathroom", "mirror", "selfie"),
+         description="Location - bathroom mirror"),
+
+    # Test 37: Location - office (French)
+    dict(category="location", language="fr",
+         user_request="Photo professionnelle au bureau",
+         expected_objects=("desk", "computer"),
+         expected_action="working",
+         expected_location="office",
+         expected_nsfw_level=0,
+         expected_in_prompt=("office", "desk", "professional"),
+         description="Location - office"),
+
+    # Test 38: Location - park (English)
+    dict(category="location", language="en",
+         user_request="Outdoor photo in the park",
+         expected_objects=(),
+         expected_action="standing",
+         expected_location="park",
+         expected_nsfw_level=0,
+         expected_in_prompt=("park", "outdoor", "trees"),
+         description="Location - park outdoor"),
+
+    # Test 39: Location - bedroom (French)
+    dict(category="location", language="fr",
+         user_request="Photo de toi dans ta chambre au lit",
+         expected_objects=("bed",),
+         expected_action="lying",
+         expected_location="bedroom",
+         expected_nsfw_level=0,
+         expected_in_prompt=("bedroom", "bed", "lying"),
+         description="Location - bedroom bed"),
+
+    # Test 40: Location - cafe (English)
+    dict(category="location", language="en",
+         user_request="Coffee shop photo with a latte",
+         expected_objects=("coffee", "cup"),
+         expected_action="sitting",
+         expected_location="cafe",
+         expected_nsfw_level=0,
+         expected_in_prompt=("cafe", "coffee shop", "latte"),
+         description="Location - cafe coffee shop"),
+
+    # ===================================================================
+    # CATEGORY 5: NSFW LEVELS (10 tests)
+    # ===================================================================
+
+    # Test 41: NSFW Level 0 - SFW casual
+    dict(category="nsfw", language="en",
+         user_request="Cute photo in casual clothes",
+         expected_objects=(),
+         expected_action="smiling",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("casual", "clothes", "cute"),
+         description="NSFW 0 - SFW casual"),
+
+    # Test 42: NSFW Level 1 - Suggestive (French)
+    dict(category="nsfw", language="fr",
+         user_request="Photo sexy en lingerie",
+         expected_objects=("lingerie",),
+         expected_action="posing",
+         expected_location="",
+         expected_nsfw_level=1,
+         expected_in_prompt=("lingerie", "sexy", "seductive"),
+         description="NSFW 1 - Suggestive lingerie"),
+
+    # Test 43: NSFW Level 1 - Flirty
+    dict(category="nsfw", language="en",
+         user_request="Send a flirty photo",
+         expected_objects=(),
+         expected_action="posing",
+         expected_location="",
+         expected_nsfw_level=1,
+         expected_in_prompt=("flirty", "seductive", "playful"),
+         description="NSFW 1 - Flirty pose"),
+
+    # Test 44: NSFW Level 2 - Topless (French)
+    dict(category="nsfw", language="fr",
+         user_request="Photo topless seins nus",
+         expected_objects=(),
+         expected_action="posing",
+         expected_location="",
+         expected_nsfw_level=2,
+         expected_in_prompt=("topless", "bare breasts", "nude"),
+         description="NSFW 2 - Topless"),
+
+    # Test 45: NSFW Level 2 - Bikini
+    dict(category="nsfw", language="en",
+         user_request="Show me in a tiny bikini",
+         expected_objects=("bikini",),
+         expected_action="posing",
+         expected_location="",
+         expected_nsfw_level=1,
+         expected_in_prompt=("bikini", "revealing", "beach"),
+         description="NSFW 1-2 - Tiny bikini"),
+
+    # Test 46: NSFW Level 3 - Full nude (French)
+    dict(category="nsfw", language="fr",
+         user_request="Photo complètement nue",
+         expected_objects=(),
+         expected_action="posing",
+         expected_location="",
+         expected_nsfw_level=3,
+         expected_in_prompt=("nude", "naked", "bare"),
+         description="NSFW 3 - Full nude"),
+
+    # Test 47: NSFW Level 1 - Tight dress
+    dict(category="nsfw", language="en",
+         user_request="Photo in a tight dress",
+         expected_objects=("dress",),
+         expected_action="posing",
+         expected_location="",
+         expected_nsfw_level=1,
+         expected_in_prompt=("tight dress", "figure", "sexy"),
+         description="NSFW 1 - Tight dress"),
+
+    # Test 48: NSFW Level 0 - Pajamas (French)
+    dict(category="nsfw", language="fr",
+         user_request="Photo en pyjama",
+         expected_objects=("pajamas",),
+         expected_action="lying",
+         expected_location="bed",
+         expected_nsfw_level=0,
+         expected_in_prompt=("pajamas", "bed", "cozy"),
+         description="NSFW 0 - Pajamas"),
+
+    # Test 49: NSFW Level 1 - Wet t-shirt
+    dict(category="nsfw", language="en",
+         user_request="Photo with wet shirt",
+         expected_objects=("shirt",),
+         expected_action="posing",
+         expected_location="",
+         expected_nsfw_level=1,
+         expected_in_prompt=("wet", "shirt", "revealing"),
+         description="NSFW 1 - Wet shirt"),
+
+    # Test 50: NSFW Level 2 - Shower (French)
+    dict(category="nsfw", language="fr",
+         user_request="Photo sous la douche",
+         expected_objects=("shower",),
+         expected_action="showering",
+         expected_location="bathroom",
+         expected_nsfw_level=2,
+         expected_in_prompt=("shower", "wet", "bathroom"),
+         description="NSFW 2 - Shower scene"),
+
+    # ===================================================================
+    # CATEGORY 6: EDGE CASES & COMPLEX (5 tests)
+    # ===================================================================
+
+    # Test 51: Complex - Multiple objects + action + location
+    dict(category="complex", language="en",
+         user_request="Photo of you reading a book with coffee in bed at home",
+         expected_objects=("book", "coffee"),
+         expected_action="reading",
+         expected_location="bedroom",
+         expected_nsfw_level=0,
+         expected_in_prompt=("reading", "book", "coffee", "bed", "bedroom"),
+         description="Complex - multiple elements combined"),
+
+    # Test 52: Ambiguous - "hot" could mean temperature or sexy (French)
+    dict(category="edge_case", language="fr",
+         user_request="Photo chaude de toi",
+         expected_objects=(),
+         expected_action="posing",
+         expected_location="",
+         expected_nsfw_level=1,  # Should interpret as sexy
+         expected_in_prompt=("sexy", "hot", "seductive"),
+         description="Ambiguous - 'hot' interpretation"),
+
+    # Test 53: Minimal request
+    dict(category="edge_case", language="en",
+         user_request="Pic",
+         expected_objects=(),
+         expected_action="posing",
+         expected_location="",
+         expected_nsfw_level=0,
+         expected_in_prompt=("photo", "picture"),
+         description="Edge case - minimal request"),
+
+    # Test 54: Very long detailed request (French)
+    dict(category="complex", language="fr",
+         user_request="Je voudrais une très belle photo de toi dans ta chambre, allongée sur ton lit avec un livre et un café, portant tes lunettes et un pyjama confortable",
+         expected_objects=("book", "coffee", "glasses", "pajamas", "bed"),
+         expected_action="lying down",
+         expected_location="bedroom",
+         expected_nsfw_level=0,
+         expected_in_prompt=("bedroom", "bed", "lying", "book", "coffee", "glasses", "pajamas"),
+         description="Complex - very detailed long request"),
+
+    # Test 55: Mixed language elements
+    dict(category="edge_case", language="mixed",
+         user_request="Send me une photo sexy avec un coffee",
+         expected_objects=("coffee",),
+         expected_action="posing",
+         expected_location="",
+         expected_nsfw_level=1,
+         expected_in_prompt=("sexy", "coffee"),
+         description="Edge case - mixed language"),
+)
+
+
 class IntentExtractionValidator:
     """
     Comprehensive validator for intent extraction quality.
@@ -86,10 +820,25 @@ class IntentExtractionValidator:
     7. Multilingual Robustness
     """
 
-    def __init__(self):
-        self.test_cases = self._generate_test_cases()
-
-    def _generate_test_cases(self) -> List[TestCase]:
+    _CACHED_CASES: ClassVar[Optional[Tuple[TestCase, ...]]] = None
+
+    def __init__(self, parallel: int = MAX_CONCURRENT_CASES):
+        # Cases whose pipeline runs at the same time (1 = sequential)
+        self.parallel = max(1, parallel)
+        self.test_cases = type(self)._get_cases()
+        fingerprint = image_prompt_orchestrator.pipeline_fingerprint()
+        self.exact_cache = ExactPromptCache(fingerprint)
+        self.prompt_cache = SemanticPromptCache(fingerprint)
+
+    @classmethod
+    def _get_cases(cls) -> Tuple[TestCase, ...]:
+        """The corpus, built on first use and shared by every validator (cases are frozen)"""
+        if cls._CACHED_CASES is None:
+            cls._CACHED_CASES = tuple(cls._generate_test_cases())
+        return cls._CACHED_CASES
+
+    @staticmethod
+    def _generate_test_cases() -> List[TestCase]:
         """
         Generate 50+ comprehensive test cases covering:
         - Simple objects (1 object)
@@ -101,770 +850,14 @@ class IntentExtractionValidator:
         - Edge cases (ambiguous, complex)
         """
 
-        test_cases = []
-        test_id = 1
-
-        # ===================================================================
-        # CATEGORY 1: SIMPLE OBJECTS (10 tests)
-        # ===================================================================
-
-        # Test 1: Single object - lollipop (French)
-        test_cases.append(TestCase(
-            id=test_id, category="simple_object", language="fr",
-            user_request="Envoie moi une photo de toi avec une sucette",
-            expected_objects=["lollipop", "candy"],
-            expected_action="holding",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["lollipop", "holding", "candy"],
-            description="Single object - lollipop in French"
-        ))
-        test_id += 1
-
-        # Test 2: Single object - book (English)
-        test_cases.append(TestCase(
-            id=test_id, category="simple_object", language="en",
-            user_request="Send me a photo of you reading a book",
-            expected_objects=["book"],
-            expected_action="reading",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["book", "reading"],
-            description="Single object - book with action"
-        ))
-        test_id += 1
-
-        # Test 3: Single object - glasses (French)
-        test_cases.append(TestCase(
-            id=test_id, category="simple_object", language="fr",
-            user_request="Une photo avec des lunettes",
-            expected_objects=["glasses"],
-            expected_action="wearing",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["glasses", "wearing"],
-            description="Single object - glasses"
-        ))
-        test_id += 1
-
-        # Test 4: Single object - phone (English)
-        test_cases.append(TestCase(
-            id=test_id, category="simple_object", language="en",
-            user_request="Show me a selfie with your phone",
-            expected_objects=["phone", "smartphone"],
-            expected_action="holding",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["phone", "holding", "selfie"],
-            description="Single object - phone selfie"
-        ))
-        test_id += 1
-
-        # Test 5: Single object - coffee (French)
-        test_cases.append(TestCase(
-            id=test_id, category="simple_object", language="fr",
-            user_request="Photo de toi avec un café",
-            expected_objects=["coffee", "cup"],
-            expected_action="holding",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["coffee", "cup", "holding"],
-            description="Single object - coffee cup"
-        ))
-        test_id += 1
-
-        # Test 6: Single object - flower (English)
-        test_cases.append(TestCase(
-            id=test_id, category="simple_object", language="en",
-            user_request="I want a picture with a rose",
-            expected_objects=["rose", "flower"],
-            expected_action="holding",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["rose", "flower", "holding"],
-            description="Single object - rose flower"
-        ))
-        test_id += 1
-
-        # Test 7: Single object - wine glass (French)
-        test_cases.append(TestCase(
-            id=test_id, category="simple_object", language="fr",
-            user_request="Montre moi une photo avec un verre de vin",
-            expected_objects=["wine glass", "wine"],
-            expected_action="holding",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["wine", "glass", "holding"],
-            description="Single object - wine glass"
-        ))
-        test_id += 1
-
-        # Test 8: Single object - umbrella (English)
-        test_cases.append(TestCase(
-            id=test_id, category="simple_object", language="en",
-            user_request="Photo with an umbrella",
-            expected_objects=["umbrella"],
-            expected_action="holding",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["umbrella", "holding"],
-            description="Single object - umbrella"
-        ))
-        test_id += 1
-
-        # Test 9: Single object - headphones (French)
-        test_cases.append(TestCase(
-            id=test_id, category="simple_object", language="fr",
-            user_request="Une photo avec des écouteurs",
-            expected_objects=["headphones", "earphones"],
-            expected_action="wearing",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["headphones", "wearing"],
-            description="Single object - headphones"
-        ))
-        test_id += 1
-
-        # Test 10: Single object - necklace (English)
-        test_cases.append(TestCase(
-            id=test_id, category="simple_object", language="en",
-            user_request="Show me a photo wearing a necklace",
-            expected_objects=["necklace", "jewelry"],
-            expected_action="wearing",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["necklace", "wearing"],
-            description="Single object - necklace jewelry"
-        ))
-        test_id += 1
-
-        # ===================================================================
-        # CATEGORY 2: MULTIPLE OBJECTS (10 tests)
-        # ===================================================================
-
-        # Test 11: Two objects - book and coffee
-        test_cases.append(TestCase(
-            id=test_id, category="multiple_objects", language="en",
-            user_request="Photo of you reading a book with coffee",
-            expected_objects=["book", "coffee", "cup"],
-            expected_action="reading",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["book", "coffee", "reading"],
-            description="Two objects - book and coffee"
-        ))
-        test_id += 1
-
-        # Test 12: Two objects - phone and sunglasses (French)
-        test_cases.append(TestCase(
-            id=test_id, category="multiple_objects", language="fr",
-            user_request="Selfie avec ton téléphone et des lunettes de soleil",
-            expected_objects=["phone", "sunglasses"],
-            expected_action="taking selfie",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["phone", "sunglasses", "selfie"],
-            description="Two objects - phone and sunglasses"
-        ))
-        test_id += 1
-
-        # Test 13: Three objects - laptop, coffee, headphones
-        test_cases.append(TestCase(
-            id=test_id, category="multiple_objects", language="en",
-            user_request="Working photo with laptop, coffee and headphones",
-            expected_objects=["laptop", "coffee", "headphones"],
-            expected_action="working",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["laptop", "coffee", "headphones", "working"],
-            description="Three objects - work setup"
-        ))
-        test_id += 1
-
-        # Test 14: Two objects - wine and candle (French)
-        test_cases.append(TestCase(
-            id=test_id, category="multiple_objects", language="fr",
-            user_request="Photo romantique avec du vin et des bougies",
-            expected_objects=["wine", "candles"],
-            expected_action="sitting",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["wine", "candles", "romantic"],
-            description="Two objects - wine and candles romantic"
-        ))
-        test_id += 1
-
-        # Test 15: Two objects - book and glasses
-        test_cases.append(TestCase(
-            id=test_id, category="multiple_objects", language="en",
-            user_request="I want a photo reading with glasses on",
-            expected_objects=["book", "glasses"],
-            expected_action="reading",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["reading", "glasses", "book"],
-            description="Two objects - reading with glasses"
-        ))
-        test_id += 1
-
-        # Test 16: Three objects - flowers, hat, sunglasses (French)
-        test_cases.append(TestCase(
-            id=test_id, category="multiple_objects", language="fr",
-            user_request="Photo d'été avec des fleurs, un chapeau et des lunettes de soleil",
-            expected_objects=["flowers", "hat", "sunglasses"],
-            expected_action="posing",
-            expected_location="outdoor",
-            expected_nsfw_level=0,
-            expected_in_prompt=["flowers", "hat", "sunglasses", "summer"],
-            description="Three objects - summer accessories"
-        ))
-        test_id += 1
-
-        # Test 17: Two objects - pen and notebook
-        test_cases.append(TestCase(
-            id=test_id, category="multiple_objects", language="en",
-            user_request="Show me writing with a pen and notebook",
-            expected_objects=["pen", "notebook"],
-            expected_action="writing",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["pen", "notebook", "writing"],
-            description="Two objects - pen and notebook"
-        ))
-        test_id += 1
-
-        # Test 18: Two objects - camera and bag (French)
-        test_cases.append(TestCase(
-            id=test_id, category="multiple_objects", language="fr",
-            user_request="Photo avec un appareil photo et un sac",
-            expected_objects=["camera", "bag"],
-            expected_action="holding",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["camera", "bag", "holding"],
-            description="Two objects - camera and bag"
-        ))
-        test_id += 1
-
-        # Test 19: Four objects - lipstick, mirror, brush, perfume
-        test_cases.append(TestCase(
-            id=test_id, category="multiple_objects", language="en",
-            user_request="Makeup photo with lipstick, mirror, brush and perfume",
-            expected_objects=["lipstick", "mirror", "brush", "perfume"],
-            expected_action="applying makeup",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["lipstick", "mirror", "brush", "perfume", "makeup"],
-            description="Four objects - makeup items"
-        ))
-        test_id += 1
-
-        # Test 20: Three objects - guitar, microphone, headphones (French)
-        test_cases.append(TestCase(
-            id=test_id, category="multiple_objects", language="fr",
-            user_request="Photo musicale avec une guitare, un micro et des écouteurs",
-            expected_objects=["guitar", "microphone", "headphones"],
-            expected_action="playing music",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["guitar", "microphone", "headphones", "music"],
-            description="Three objects - music equipment"
-        ))
-        test_id += 1
-
-        # ===================================================================
-        # CATEGORY 3: ACTIONS (10 tests)
-        # ===================================================================
-
-        # Test 21: Action - sucking lollipop (French) - KEY TEST
-        test_cases.append(TestCase(
-            id=test_id, category="action", language="fr",
-            user_request="Envoie moi une photo de toi en train de sucer une sucette",
-            expected_objects=["lollipop", "candy"],
-            expected_action="sucking lollipop",
-            expected_location="",
-            expected_nsfw_level=1,
-            expected_in_prompt=["sucking", "lollipop", "tongue"],
-            description="KEY TEST: Sucking lollipop action"
-        ))
-        test_id += 1
-
-        # Test 22: Action - dancing (English)
-        test_cases.append(TestCase(
-            id=test_id, category="action", language="en",
-            user_request="I want to see you dancing",
-            expected_objects=[],
-            expected_action="dancing",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["dancing", "movement"],
-            description="Action - dancing"
-        ))
-        test_id += 1
-
-        # Test 23: Action - stretching (French)
-        test_cases.append(TestCase(
-            id=test_id, category="action", language="fr",
-            user_request="Photo de toi en train de t'étirer",
-            expected_objects=[],
-            expected_action="stretching",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["stretching", "arms"],
-            description="Action - stretching"
-        ))
-        test_id += 1
-
-        # Test 24: Action - blowing kiss (English)
-        test_cases.append(TestCase(
-            id=test_id, category="action", language="en",
-            user_request="Send me a photo blowing a kiss",
-            expected_objects=[],
-            expected_action="blowing kiss",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["blowing kiss", "lips", "hand"],
-            description="Action - blowing kiss"
-        ))
-        test_id += 1
-
-        # Test 25: Action - winking (French)
-        test_cases.append(TestCase(
-            id=test_id, category="action", language="fr",
-            user_request="Fais moi un clin d'œil",
-            expected_objects=[],
-            expected_action="winking",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["winking", "eye", "playful"],
-            description="Action - winking"
-        ))
-        test_id += 1
-
-        # Test 26: Action - laughing (English)
-        test_cases.append(TestCase(
-            id=test_id, category="action", language="en",
-            user_request="Photo of you laughing",
-            expected_objects=[],
-            expected_action="laughing",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["laughing", "smiling", "happy"],
-            description="Action - laughing"
-        ))
-        test_id += 1
-
-        # Test 27: Action - looking back (French)
-        test_cases.append(TestCase(
-            id=test_id, category="action", language="fr",
-            user_request="Photo où tu regardes en arrière",
-            expected_objects=[],
-            expected_action="looking back",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["looking back", "over shoulder"],
-            description="Action - looking back"
-        ))
-        test_id += 1
-
-        # Test 28: Action - touching hair (English)
-        test_cases.append(TestCase(
-            id=test_id, category="action", language="en",
-            user_request="I want a photo of you touching your hair",
-            expected_objects=[],
-            expected_action="touching hair",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["touching", "hair", "hand"],
-            description="Action - touching hair"
-        ))
-        test_id += 1
-
-        # Test 29: Action - biting lip (French)
-        test_cases.append(TestCase(
-            id=test_id, category="action", language="fr",
-            user_request="Photo en train de te mordre la lèvre",
-            expected_objects=[],
-            expected_action="biting lip",
-            expected_location="",
-            expected_nsfw_level=1,
-            expected_in_prompt=["biting", "lip", "seductive"],
-            description="Action - biting lip (sensual)"
-        ))
-        test_id += 1
-
-        # Test 30: Action - lying down (English)
-        test_cases.append(TestCase(
-            id=test_id, category="action", language="en",
-            user_request="Show me you lying down relaxed",
-            expected_objects=[],
-            expected_action="lying down",
-            expected_location="bed",
-            expected_nsfw_level=0,
-            expected_in_prompt=["lying", "relaxed", "bed"],
-            description="Action - lying down"
-        ))
-        test_id += 1
-
-        # ===================================================================
-        # CATEGORY 4: LOCATIONS (10 tests)
-        # ===================================================================
-
-        # Test 31: Location - classroom (French) - KEY TEST
-        test_cases.append(TestCase(
-            id=test_id, category="location", language="fr",
-            user_request="Photo sexy de toi en prof dans ta classe",
-            expected_objects=["glasses", "desk", "blackboard"],
-            expected_action="standing",
-            expected_location="classroom",
-            expected_nsfw_level=1,
-            expected_in_prompt=["classroom", "teacher", "blackboard", "desk"],
-            description="KEY TEST: Classroom teacher location"
-        ))
-        test_id += 1
-
-        # Test 32: Location - beach (English)
-        test_cases.append(TestCase(
-            id=test_id, category="location", language="en",
-            user_request="Send me a photo at the beach",
-            expected_objects=[],
-            expected_action="standing",
-            expected_location="beach",
-            expected_nsfw_level=0,
-            expected_in_prompt=["beach", "sand", "ocean"],
-            description="Location - beach"
-        ))
-        test_id += 1
-
-        # Test 33: Location - car (French)
-        test_cases.append(TestCase(
-            id=test_id, category="location", language="fr",
-            user_request="Selfie dans ta voiture",
-            expected_objects=["phone"],
-            expected_action="taking selfie",
-            expected_location="car interior",
-            expected_nsfw_level=0,
-            expected_in_prompt=["car", "interior", "driver seat"],
-            description="Location - car interior"
-        ))
-        test_id += 1
-
-        # Test 34: Location - gym (English)
-        test_cases.append(TestCase(
-            id=test_id, category="location", language="en",
-            user_request="Photo at the gym working out",
-            expected_objects=[],
-            expected_action="working out",
-            expected_location="gym",
-            expected_nsfw_level=0,
-            expected_in_prompt=["gym", "fitness", "exercise"],
-            description="Location - gym"
-        ))
-        test_id += 1
-
-        # Test 35: Location - kitchen (French)
-        test_cases.append(TestCase(
-            id=test_id, category="location", language="fr",
-            user_request="Photo de toi dans la cuisine",
-            expected_objects=[],
-            expected_action="cooking",
-            expected_location="kitchen",
-            expected_nsfw_level=0,
-            expected_in_prompt=["kitchen", "cooking", "counter"],
-            description="Location - kitchen"
-        ))
-        test_id += 1
-
-        # Test 36: Location - bathroom (English)
-        test_cases.append(TestCase(
-            id=test_id, category="location", language="en",
-            user_request="Bathroom mirror selfie",
-            expected_objects=["phone", "mirror"],
-            expected_action="taking selfie",
-            expected_location="bathroom",
-            expected_nsfw_level=0,
-            expected_in_prompt=["bathroom", "mirror", "selfie"],
-            description="Location - bathroom mirror"
-        ))
-        test_id += 1
-
-        # Test 37: Location - office (French)
-        test_cases.append(TestCase(
-            id=test_id, category="location", language="fr",
-            user_request="Photo professionnelle au bureau",
-            expected_objects=["desk", "computer"],
-            expected_action="working",
-            expected_location="office",
-            expected_nsfw_level=0,
-            expected_in_prompt=["office", "desk", "professional"],
-            description="Location - office"
-        ))
-        test_id += 1
-
-        # Test 38: Location - park (English)
-        test_cases.append(TestCase(
-            id=test_id, category="location", language="en",
-            user_request="Outdoor photo in the park",
-            expected_objects=[],
-            expected_action="standing",
-            expected_location="park",
-            expected_nsfw_level=0,
-            expected_in_prompt=["park", "outdoor", "trees"],
-            description="Location - park outdoor"
-        ))
-        test_id += 1
-
-        # Test 39: Location - bedroom (French)
-        test_cases.append(TestCase(
-            id=test_id, category="location", language="fr",
-            user_request="Photo de toi dans ta chambre au lit",
-            expected_objects=["bed"],
-            expected_action="lying",
-            expected_location="bedroom",
-            expected_nsfw_level=0,
-            expected_in_prompt=["bedroom", "bed", "lying"],
-            description="Location - bedroom bed"
-        ))
-        test_id += 1
-
-        # Test 40: Location - cafe (English)
-        test_cases.append(TestCase(
-            id=test_id, category="location", language="en",
-            user_request="Coffee shop photo with a latte",
-            expected_objects=["coffee", "cup"],
-            expected_action="sitting",
-            expected_location="cafe",
-            expected_nsfw_level=0,
-            expected_in_prompt=["cafe", "coffee shop", "latte"],
-            description="Location - cafe coffee shop"
-        ))
-        test_id += 1
-
-        # ===================================================================
-        # CATEGORY 5: NSFW LEVELS (10 tests)
-        # ===================================================================
-
-        # Test 41: NSFW Level 0 - SFW casual
-        test_cases.append(TestCase(
-            id=test_id, category="nsfw", language="en",
-            user_request="Cute photo in casual clothes",
-            expected_objects=[],
-            expected_action="smiling",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["casual", "clothes", "cute"],
-            description="NSFW 0 - SFW casual"
-        ))
-        test_id += 1
-
-        # Test 42: NSFW Level 1 - Suggestive (French)
-        test_cases.append(TestCase(
-            id=test_id, category="nsfw", language="fr",
-            user_request="Photo sexy en lingerie",
-            expected_objects=["lingerie"],
-            expected_action="posing",
-            expected_location="",
-            expected_nsfw_level=1,
-            expected_in_prompt=["lingerie", "sexy", "seductive"],
-            description="NSFW 1 - Suggestive lingerie"
-        ))
-        test_id += 1
-
-        # Test 43: NSFW Level 1 - Flirty
-        test_cases.append(TestCase(
-            id=test_id, category="nsfw", language="en",
-            user_request="Send a flirty photo",
-            expected_objects=[],
-            expected_action="posing",
-            expected_location="",
-            expected_nsfw_level=1,
-            expected_in_prompt=["flirty", "seductive", "playful"],
-            description="NSFW 1 - Flirty pose"
-        ))
-        test_id += 1
-
-        # Test 44: NSFW Level 2 - Topless (French)
-        test_cases.append(TestCase(
-            id=test_id, category="nsfw", language="fr",
-            user_request="Photo topless seins nus",
-            expected_objects=[],
-            expected_action="posing",
-            expected_location="",
-            expected_nsfw_level=2,
-            expected_in_prompt=["topless", "bare breasts", "nude"],
-            description="NSFW 2 - Topless"
-        ))
-        test_id += 1
-
-        # Test 45: NSFW Level 2 - Bikini
-        test_cases.append(TestCase(
-            id=test_id, category="nsfw", language="en",
-            user_request="Show me in a tiny bikini",
-            expected_objects=["bikini"],
-            expected_action="posing",
-            expected_location="",
-            expected_nsfw_level=1,
-            expected_in_prompt=["bikini", "revealing", "beach"],
-            description="NSFW 1-2 - Tiny bikini"
-        ))
-        test_id += 1
-
-        # Test 46: NSFW Level 3 - Full nude (French)
-        test_cases.append(TestCase(
-            id=test_id, category="nsfw", language="fr",
-            user_request="Photo complètement nue",
-            expected_objects=[],
-            expected_action="posing",
-            expected_location="",
-            expected_nsfw_level=3,
-            expected_in_prompt=["nude", "naked", "bare"],
-            description="NSFW 3 - Full nude"
-        ))
-        test_id += 1
-
-        # Test 47: NSFW Level 1 - Tight dress
-        test_cases.append(TestCase(
-            id=test_id, category="nsfw", language="en",
-            user_request="Photo in a tight dress",
-            expected_objects=["dress"],
-            expected_action="posing",
-            expected_location="",
-            expected_nsfw_level=1,
-            expected_in_prompt=["tight dress", "figure", "sexy"],
-            description="NSFW 1 - Tight dress"
-        ))
-        test_id += 1
-
-        # Test 48: NSFW Level 0 - Pajamas (French)
-        test_cases.append(TestCase(
-            id=test_id, category="nsfw", language="fr",
-            user_request="Photo en pyjama",
-            expected_objects=["pajamas"],
-            expected_action="lying",
-            expected_location="bed",
-            expected_nsfw_level=0,
-            expected_in_prompt=["pajamas", "bed", "cozy"],
-            description="NSFW 0 - Pajamas"
-        ))
-        test_id += 1
-
-        # Test 49: NSFW Level 1 - Wet t-shirt
-        test_cases.append(TestCase(
-            id=test_id, category="nsfw", language="en",
-            user_request="Photo with wet shirt",
-            expected_objects=["shirt"],
-            expected_action="posing",
-            expected_location="",
-            expected_nsfw_level=1,
-            expected_in_prompt=["wet", "shirt", "revealing"],
-            description="NSFW 1 - Wet shirt"
-        ))
-        test_id += 1
-
-        # Test 50: NSFW Level 2 - Shower (French)
-        test_cases.append(TestCase(
-            id=test_id, category="nsfw", language="fr",
-            user_request="Photo sous la douche",
-            expected_objects=["shower"],
-            expected_action="showering",
-            expected_location="bathroom",
-            expected_nsfw_level=2,
-            expected_in_prompt=["shower", "wet", "bathroom"],
-            description="NSFW 2 - Shower scene"
-        ))
-        test_id += 1
-
-        # ===================================================================
-        # CATEGORY 6: EDGE CASES & COMPLEX (5 tests)
-        # ===================================================================
-
-        # Test 51: Complex - Multiple objects + action + location
-        test_cases.append(TestCase(
-            id=test_id, category="complex", language="en",
-            user_request="Photo of you reading a book with coffee in bed at home",
-            expected_objects=["book", "coffee"],
-            expected_action="reading",
-            expected_location="bedroom",
-            expected_nsfw_level=0,
-            expected_in_prompt=["reading", "book", "coffee", "bed", "bedroom"],
-            description="Complex - multiple elements combined"
-        ))
-        test_id += 1
-
-        # Test 52: Ambiguous - "hot" could mean temperature or sexy (French)
-        test_cases.append(TestCase(
-            id=test_id, category="edge_case", language="fr",
-            user_request="Photo chaude de toi",
-            expected_objects=[],
-            expected_action="posing",
-            expected_location="",
-            expected_nsfw_level=1,  # Should interpret as sexy
-            expected_in_prompt=["sexy", "hot", "seductive"],
-            description="Ambiguous - 'hot' interpretation"
-        ))
-        test_id += 1
-
-        # Test 53: Minimal request
-        test_cases.append(TestCase(
-            id=test_id, category="edge_case", language="en",
-            user_request="Pic",
-            expected_objects=[],
-            expected_action="posing",
-            expected_location="",
-            expected_nsfw_level=0,
-            expected_in_prompt=["photo", "picture"],
-            description="Edge case - minimal request"
-        ))
-        test_id += 1
-
-        # Test 54: Very long detailed request (French)
-        test_cases.append(TestCase(
-            id=test_id, category="complex", language="fr",
-            user_request="Je voudrais une très belle photo de toi dans ta chambre, allongée sur ton lit avec un livre et un café, portant tes lunettes et un pyjama confortable",
-            expected_objects=["book", "coffee", "glasses", "pajamas", "bed"],
-            expected_action="lying down",
-            expected_location="bedroom",
-            expected_nsfw_level=0,
-            expected_in_prompt=["bedroom", "bed", "lying", "book", "coffee", "glasses", "pajamas"],
-            description="Complex - very detailed long request"
-        ))
-        test_id += 1
-
-        # Test 55: Mixed language elements
-        test_cases.append(TestCase(
-            id=test_id, category="edge_case", language="mixed",
-            user_request="Send me une photo sexy avec un coffee",
-            expected_objects=["coffee"],
-            expected_action="posing",
-            expected_location="",
-            expected_nsfw_level=1,
-            expected_in_prompt=["sexy", "coffee"],
-            description="Edge case - mixed language"
-        ))
-        test_id += 1
-
-        return test_cases
-
-    async def validate_test_case(self, test_case: TestCase) -> ValidationResult:
-        """Validate a single test case by running intent extraction"""
+        return [TestCase(id=i, **raw) for i, raw in enumerate(_RAW_CASES, 1)]
+
+    def validate_test_case(self, test_case: TestCase, result: Any) -> ValidationResult:
+        """Score the intent extraction result (or the exception) for one test case"""
 
         try:
-            # Run the intent extraction system
-            character_data = {
-                "name": "Test Character",
-                "personality": "friendly, helpful",
-                "age": "25",
-                "ethnicity": "european",
-            }
-
-            result = await generate_image_prompt(
-                user_message=test_case.user_request,
-                character_data=character_data,
-                relationship_level=0,
-                current_mood="neutral",
-                conversation_context="",
-                style="realistic"
-            )
+            if isinstance(result, Exception):
+                raise result
 
             # Extract results
             extracted_objects = result.get("objects", [])
@@ -873,19 +866,28 @@ class IntentExtractionValidator:
             extracted_nsfw = result.get("nsfw_level", 0)
             final_prompt = result.get("prompt", "")
 
+            # Casefold everything compared below once, not per comparison
+            objects_folded = [obj.casefold() for obj in extracted_objects]
+            action_folded = extracted_action.casefold()
+            expected_action_folded = test_case.expected_action.casefold()
+            location_folded = extracted_location.casefold()
+            expected_location_folded = test_case.expected_location.casefold()
+            prompt_folded = final_prompt.casefold()
+
             # Calculate scores
             failures = []
-            scores = []
+            # Score per criterion; applied marks the criteria this case is scored on
+            scores = np.zeros(len(ValidationCriterion), dtype=np.float64)
+            applied = np.zeros(len(ValidationCriterion), dtype=np.float64)
 
             # 1. Object Extraction Score (F1)
             if test_case.expected_objects:
-                true_positives = sum(1 for obj in extracted_objects
-                                    if any(exp.lower() in obj.lower() or obj.lower() in exp.lower()
-                                          for exp in test_case.expected_objects))
+                true_positives = test_case.object_true_positives(objects_folded)
                 precision = true_positives / len(extracted_objects) if extracted_objects else 0
                 recall = true_positives / len(test_case.expected_objects)
                 object_f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
-                scores.append(object_f1)
+                scores[ValidationCriterion.OBJECT_EXTRACTION] = object_f1
+                applied[ValidationCriterion.OBJECT_EXTRACTION] = 1
 
                 if object_f1 < 0.5:
                     failures.append(f"Object extraction F1 low: {object_f1:.2f} (expected {test_case.expected_objects}, got {extracted_objects})")
@@ -893,12 +895,13 @@ class IntentExtractionValidator:
             # 2. Action Detection Score
             if test_case.expected_action:
                 action_match = (
-                    test_case.expected_action.lower() in extracted_action.lower() or
-                    extracted_action.lower() in test_case.expected_action.lower() or
-                    any(word in extracted_action.lower() for word in test_case.expected_action.lower().split())
+                    expected_action_folded in action_folded or
+                    action_folded in expected_action_folded or
+                    any(word in action_folded for word in expected_action_folded.split())
                 )
                 action_score = 1.0 if action_match else 0.0
-                scores.append(action_score)
+                scores[ValidationCriterion.ACTION_DETECTION] = action_score
+                applied[ValidationCriterion.ACTION_DETECTION] = 1
 
                 if not action_match:
                     failures.append(f"Action mismatch: expected '{test_case.expected_action}', got '{extracted_action}'")
@@ -906,11 +909,12 @@ class IntentExtractionValidator:
             # 3. Location Detection Score
             if test_case.expected_location:
                 location_match = (
-                    test_case.expected_location.lower() in extracted_location.lower() or
-                    extracted_location.lower() in test_case.expected_location.lower()
+                    expected_location_folded in location_folded or
+                    location_folded in expected_location_folded
                 )
                 location_score = 1.0 if location_match else 0.0
-                scores.append(location_score)
+                scores[ValidationCriterion.LOCATION_IDENTIFICATION] = location_score
+                applied[ValidationCriterion.LOCATION_IDENTIFICATION] = 1
 
                 if not location_match:
                     failures.append(f"Location mismatch: expected '{test_case.expected_location}', got '{extracted_location}'")
@@ -918,23 +922,32 @@ class IntentExtractionValidator:
             # 4. NSFW Classification Score (allow ±1 tolerance)
             nsfw_diff = abs(extracted_nsfw - test_case.expected_nsfw_level)
             nsfw_score = max(0, 1.0 - (nsfw_diff * 0.5))  # 0.5 penalty per level off
-            scores.append(nsfw_score)
+            scores[ValidationCriterion.NSFW_CLASSIFICATION] = nsfw_score
+            applied[ValidationCriterion.NSFW_CLASSIFICATION] = 1
 
             if nsfw_diff > 1:
                 failures.append(f"NSFW level off: expected {test_case.expected_nsfw_level}, got {extracted_nsfw}")
 
             # 5. Semantic Consistency (keyword presence in final prompt)
-            keywords_found = sum(1 for kw in test_case.expected_in_prompt
-                                if kw.lower() in final_prompt.lower())
+            found = test_case.keywords_in(prompt_folded)
+            unfound = [kw for kw in set(test_case.expected_in_prompt) if kw not in found]
+            if unfound and prompt_folded:
+                # Soft hits: keywords appearing inflected or misspelled in the prompt
+                similarity = process.cdist(unfound, [prompt_folded], scorer=fuzz.partial_ratio)
+                soft_hits = np.flatnonzero(similarity[:, 0] >= FUZZY_KEYWORD_THRESHOLD)
+                found.update(unfound[i] for i in soft_hits)
+            keywords_found = sum(1 for kw in test_case.expected_in_prompt if kw in found)
             semantic_score = keywords_found / len(test_case.expected_in_prompt) if test_case.expected_in_prompt else 1.0
-            scores.append(semantic_score)
+            scores[ValidationCriterion.SEMANTIC_CONSISTENCY] = semantic_score
+            applied[ValidationCriterion.SEMANTIC_CONSISTENCY] = 1
 
             if semantic_score < 0.5:
-                missing = [kw for kw in test_case.expected_in_prompt if kw.lower() not in final_prompt.lower()]
+                missing = [kw for kw in test_case.expected_in_prompt if kw not in found]
                 failures.append(f"Missing keywords in prompt: {missing}")
 
-            # Overall score
-            overall_score = sum(scores) / len(scores) if scores else 0.0
+            # Overall score: weighted mean over the applied criteria
+            weights = CRITERION_WEIGHTS * applied
+            overall_score = float(weights @ scores / weights.sum())
             passed = overall_score >= 0.7 and len(failures) == 0
 
             return ValidationResult(
@@ -969,8 +982,73 @@ class IntentExtractionValidator:
                 failures=[f"Exception: {str(e)}"]
             )
 
-    async def run_all_tests(self) -> Dict[str, Any]:
-        """Run all test cases and generate comprehensive report"""
+    async def run_all(self) -> AsyncIterator[Tuple[TestCase, ValidationResult]]:
+        """Validate every test case, yielding each one as soon as it is scored"""
+        keys = [self.exact_cache.make_key(tc.user_request_utf8, TEST_CHARACTER) for tc in self.test_cases]
+
+        exact_misses = []
+        for i, (test_case, key) in enumerate(zip(self.test_cases, keys)):
+            result = self.exact_cache.get(key)
+            if result is None:
+                exact_misses.append(i)
+            else:
+                yield test_case, self.validate_test_case(test_case, result)
+
+        embeddings = dict(zip(exact_misses, await asyncio.to_thread(
+            lambda: [self.prompt_cache.embed(self.test_cases[i].user_request) for i in exact_misses]
+        )))
+
+        misses = []
+        for i in exact_misses:
+            test_case = self.test_cases[i]
+            result = self.prompt_cache.get(test_case.category, embeddings[i])
+            if result is None:
+                misses.append(i)
+            else:
+                yield test_case, self.validate_test_case(test_case, result)
+
+        # Cache misses go through one batch, one request per distinct canonical
+        # request text, and every case sharing that text is scored on the result
+        groups: Dict[str, List[int]] = {}
+        for i in misses:
+            groups.setdefault(self.test_cases[i].canonical_request(), []).append(i)
+        unique = list(groups.values())
+
+        pending = set(misses)
+        try:
+            async with aclosing(iter_image_prompts(
+                [self.test_cases[members[0]].user_request for members in unique],
+                TEST_CHARACTER,
+                max_concurrency=self.parallel
+            )) as generated:
+                async for j, result in generated:
+                    for i in unique[j]:
+                        pending.discard(i)
+                        if not isinstance(result, Exception):
+                            self.exact_cache.put(keys[i], result)
+                            self.prompt_cache.put(self.test_cases[i].category, embeddings[i], result)
+                        yield self.test_cases[i], self.validate_test_case(self.test_cases[i], result)
+        except Exception as e:
+            for i in sorted(pending):
+                yield self.test_cases[i], self.validate_test_case(self.test_cases[i], e)
+
+    def run_regression_sweep(self, runs: List[Tuple[TestCase, List[str]]]) -> np.ndarray:
+        """
+        Object F1 for many (test case, extracted objects) pairs, e.g. cached
+        results across model or prompt variants. String matching stays in
+        Python; the F1 arithmetic runs in f1_batch.
+        """
+        true_positives = np.empty(len(runs), dtype=np.int64)
+        n_expected = np.empty(len(runs), dtype=np.int64)
+        n_extracted = np.empty(len(runs), dtype=np.int64)
+        for i, (test_case, extracted_objects) in enumerate(runs):
+            true_positives[i] = test_case.object_true_positives([obj.casefold() for obj in extracted_objects])
+            n_expected[i] = len(test_case.expected_objects)
+            n_extracted[i] = len(extracted_objects)
+        return f1_batch(true_positives, n_expected, n_extracted)
+
+    async def run_all_tests(self, fail_fast: bool = False) -> Dict[str, Any]:
+        """Run all test cases and generate comprehensive report (stop at the first failure if fail_fast)"""
 
         print("\n" + "="*80)
         print("INTENT EXTRACTION VALIDATION - COMPREHENSIVE TEST SUITE")
@@ -980,40 +1058,55 @@ class IntentExtractionValidator:
         print(f"Languages: French, English, Mixed")
         print("\n" + "="*80 + "\n")
 
-        results = []
+        # Only a summary of the latest failures is kept for the detail section;
+        # everything else is aggregated as results stream in
+        failed_details = deque(maxlen=MAX_FAILED_DETAILS)
+        completed = 0
         passed_count = 0
         failed_count = 0
+        total_score = 0.0
+
+        category_stats = defaultdict(lambda: {"passed": 0, "failed": 0, "total": 0, "sum_score": 0.0})
+
+        async with aclosing(self.run_all()) as stream:
+            async for test_case, result in stream:
+                completed += 1
+                total_score += result.score
+                # One write per case: lines of concurrent cases never interleave
+                parts = [f"[{completed}/{len(self.test_cases)}] #{test_case.id} {test_case.description}... "]
+
+                # Track stats
+                stats = category_stats[test_case.category]
+                stats["total"] += 1
+                stats["sum_score"] += result.score
+
+                if result.passed:
+                    passed_count += 1
+                    stats["passed"] += 1
+                    parts.append(f"✅ PASS ({result.score:.2f})\n")
+                else:
+                    failed_count += 1
+                    failed_details.append((
+                        test_case.id, test_case.description, test_case.user_request,
+                        result.score, result.failures
+                    ))
+                    stats["failed"] += 1
+                    parts.append(f"❌ FAIL ({result.score:.2f})\n")
+                    for failure in result.failures[:2]:  # Show first 2 failures
+                        parts.append(f"    └─ {failure}\n")
 
-        category_stats = {}
-
-        for i, test_case in enumerate(self.test_cases, 1):
-            print(f"[{i}/{len(self.test_cases)}] Running: {test_case.description}...", end=" ")
-
-            result = await self.validate_test_case(test_case)
-            results.append(result)
-
-            # Track stats
-            if test_case.category not in category_stats:
-                category_stats[test_case.category] = {"passed": 0, "failed": 0, "total": 0, "avg_score": 0.0}
-
-            category_stats[test_case.category]["total"] += 1
-            category_stats[test_case.category]["avg_score"] += result.score
+                sys.stdout.write("".join(parts))
+                if completed % 10 == 0:
+                    sys.stdout.flush()
 
-            if result.passed:
-                passed_count += 1
-                category_stats[test_case.category]["passed"] += 1
-                print(f"✅ PASS ({result.score:.2f})")
-            else:
-                failed_count += 1
-                category_stats[test_case.category]["failed"] += 1
-                print(f"❌ FAIL ({result.score:.2f})")
-                if result.failures:
-                    for failure in result.failures[:2]:  # Show first 2 failures
-                        print(f"    └─ {failure}")
+                if fail_fast and not result.passed:
+                    print("\n--fail-fast: stopping at first failure")
+                    break
 
         # Calculate category averages
-        for category in category_stats:
-            category_stats[category]["avg_score"] /= category_stats[category]["total"]
+        category_stats = dict(category_stats)
+        for stats in category_stats.values():
+            stats["avg_score"] = stats.pop("sum_score") / stats["total"]
 
         # Generate report
         print("\n" + "="*80)
@@ -1021,12 +1114,12 @@ class IntentExtractionValidator:
         print("="*80 + "\n")
 
         # Overall stats
-        pass_rate = (passed_count / len(self.test_cases)) * 100
-        avg_score = sum(r.score for r in results) / len(results)
+        pass_rate = (passed_count / completed) * 100 if completed else 0.0
+        avg_score = total_score / completed if completed else 0.0
 
         print(f"Overall Results:")
-        print(f"  ✅ Passed: {passed_count}/{len(self.test_cases)} ({pass_rate:.1f}%)")
-        print(f"  ❌ Failed: {failed_count}/{len(self.test_cases)} ({100-pass_rate:.1f}%)")
+        print(f"  ✅ Passed: {passed_count}/{completed} ({pass_rate:.1f}%)")
+        print(f"  ❌ Failed: {failed_count}/{completed} ({100-pass_rate:.1f}%)")
         print(f"  📊 Average Score: {avg_score:.3f}/1.0")
 
         # Category breakdown
@@ -1038,13 +1131,14 @@ class IntentExtractionValidator:
         # Failed tests detail
         if failed_count > 0:
             print(f"\nFailed Tests Detail:")
-            for result in results:
-                if not result.passed:
-                    print(f"\n  Test #{result.test_id}: {result.details.get('description', 'N/A')}")
-                    print(f"    Request: {result.details.get('user_request', 'N/A')}")
-                    print(f"    Score: {result.score:.2f}")
-                    for failure in result.failures:
-                        print(f"    └─ {failure}")
+            if failed_count > len(failed_details):
+                print(f"  (last {len(failed_details)} of {failed_count} failures)")
+            for test_id, description, user_request, score, failures in sorted(failed_details):
+                print(f"\n  Test #{test_id}: {description}")
+                print(f"    Request: {user_request}")
+                print(f"    Score: {score:.2f}")
+                for failure in failures:
+                    print(f"    └─ {failure}")
 
         print("\n" + "="*80)
 
@@ -1062,20 +1156,33 @@ class IntentExtractionValidator:
 
         return {
             "total_tests": len(self.test_cases),
+            "completed": completed,
             "passed": passed_count,
             "failed": failed_count,
             "pass_rate": pass_rate,
             "average_score": avg_score,
             "category_stats": category_stats,
             "acceptance_criteria_met": overall_passed,
-            "results": results
+            "failed_details": list(failed_details)
         }
 
 
+def dump_report(report: Dict[str, Any], path: str):
+    """Write the run_all_tests report as indented JSON (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        Path(path).write_bytes(orjson.dumps(report, option=orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_INDENT_2))
+    else:
+        Path(path).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
 async def main():
     """Main entry point"""
-    validator = IntentExtractionValidator()
-    report = await validator.run_all_tests()
+    parallel = int(os.getenv("INTENT_VALIDATION_PARALLEL", MAX_CONCURRENT_CASES))
+    validator = IntentExtractionValidator(parallel=parallel)
+    report = await validator.run_all_tests(fail_fast="--fail-fast" in sys.argv)
+
+    # Machine-readable copy for CI
+    dump_report(report, os.getenv("INTENT_VALIDATION_REPORT", "report.json"))
 
     # Return exit code based on acceptance
     return 0 if report["acceptance_criteria_met"] else 1
@@ -1083,7 +1190,8 @@ async def main():
 
 if __name__ == "__main__":
     if sys.platform == 'win32':
-        sys.stdout.reconfigure(encoding='utf-8')
+        # Block buffering: run_all_tests flushes every 10 cases
+        sys.stdout.reconfigure(encoding='utf-8', line_buffering=False, write_through=False)
 
     exit_code = asyncio.run(main())
     sys.exit(exit_code)
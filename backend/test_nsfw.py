@@ -5,13 +5,14 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from huggingface_hub import InferenceClient
-from config import settings
 from datetime import datetime
 
 
 async def test_nsfw():
     """Test NSFW content generation"""
+    # Imported here so importing this module stays cheap
+    from huggingface_hub import InferenceClient
+    from config import settings
 
     print("=" * 60)
     print("Z-Image-Turbo NSFW Test")
@@ -6,7 +6,31 @@ import sys
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
-from services.image_prompt_agents import IntentionAnalyzer
+from dataclasses import asdict
+
+from services.image_prompt_agents import IntentionAnalyzer, IntentionResult, SceneType, MoodType, image_prompt_orchestrator
+from _test_prompt_cache import CACHE_DIR, ExactPromptCache
+
+# Answers are reused until the agent pipeline changes (--no-cache to bypass)
+intention_cache = ExactPromptCache(image_prompt_orchestrator.pipeline_fingerprint(), cache_dir=CACHE_DIR / "intention")
+
+
+async def cached_analyze(analyzer: IntentionAnalyzer, request: str) -> IntentionResult:
+    """analyzer.analyze(request) through the intention cache"""
+    key = intention_cache.make_key(request.encode("utf-8"), {})
+    stored = intention_cache.get(key)
+    if stored is not None:
+        return IntentionResult(**{
+            **stored,
+            "scene_type": SceneType(stored["scene_type"]),
+            "mood": MoodType(stored["mood"]),
+        })
+
+    result = await analyzer.analyze(request)
+    stored = asdict(result)
+    stored["scene_type"], stored["mood"] = result.scene_type.value, result.mood.value
+    intention_cache.put(key, stored)
+    return result
 
 async def test_nsfw5():
     analyzer = IntentionAnalyzer()
@@ -28,7 +52,7 @@ async def test_nsfw5():
         print(f"{'='*80}")
         print(f"Request: {request}")
 
-        result = await analyzer.analyze(request)
+        result = await cached_analyze(analyzer, request)
 
         print(f"\nRESULTS:")
         print(f"  NSFW Level: {result.nsfw_level}")
@@ -1,10 +1,46 @@
 """Test NSFW Z-Image-Turbo Spaces"""
+import contextlib
+import io
+import json
 import sys
 import os
+import time
+from pathlib import Path
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from gradio_client import Client
+# One Client per space: connecting downloads the space config, so do it once
+_CLIENT_CACHE: dict = {}
+
+# API schemas from view_api(), reused for a day
+API_CACHE_DIR = Path(".cache") / "spaces"
+API_CACHE_TTL = 86400
+
+
+def _get_client(space_name):
+    client = _CLIENT_CACHE.get(space_name)
+    if client is None:
+        # Imported on first connect so importing this module stays cheap
+        from gradio_client import Client
+        # Suppress the connection banner
+        with contextlib.redirect_stdout(io.StringIO()):
+            client = _CLIENT_CACHE[space_name] = Client(space_name)
+    return client
+
+
+def cached_view_api(client, space_name):
+    """client.view_api() as a dict, from API_CACHE_DIR while younger than API_CACHE_TTL"""
+    path = API_CACHE_DIR / f"{space_name.replace('/', '_')}.json"
+    try:
+        if time.time() - path.stat().st_mtime < API_CACHE_TTL:
+            return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+
+    api_info = client.view_api(print_info=False, return_format="dict")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(api_info), encoding="utf-8")
+    return api_info
 
 
 def test_space(space_name):
@@ -14,19 +50,14 @@ def test_space(space_name):
     print("=" * 60)
 
     try:
-        # Suppress output
-        import io
-        old_stdout = sys.stdout
-        sys.stdout = io.StringIO()
-        client = Client(space_name)
-        sys.stdout = old_stdout
+        client = _get_client(space_name)
 
         print("Connected!")
         print("\nAPI Endpoints:")
         print("-" * 40)
 
         # Get API info
-        api_info = client.view_api(print_info=False, return_format="dict")
+        api_info = cached_view_api(client, space_name)
 
         if api_info and "named_endpoints" in api_info:
             for name, info in api_info["named_endpoints"].items():
@@ -61,5 +92,6 @@ spaces = [
     "ClickyGPT/NSFW_Z-Image-Turbo",
 ]
 
-for space in spaces:
-    test_space(space)
+if __name__ == "__main__":
+    for space in spaces:
+        test_space(space)
@@ -12,7 +12,23 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='repla
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-from image_service_free import free_image_service
+# Request starts at least 3s apart; the free backend throttles bursts.
+# Unlike a sleep before each test, a slow generation already counts as waiting.
+REQUEST_INTERVAL = 3.0
+_LIMITER = None
+
+
+async def _generate(**kwargs):
+    """free_image_service.generate behind the shared rate limiter"""
+    global _LIMITER
+    # Imported on first use so importing this module stays cheap
+    from image_service_free import free_image_service
+    from image_service_v2 import AdaptiveRateLimiter
+
+    if _LIMITER is None:
+        _LIMITER = AdaptiveRateLimiter(interval=REQUEST_INTERVAL)
+    await _LIMITER.acquire()
+    return await free_image_service.generate(**kwargs)
 
 
 async def test_ultra_realistic_portrait():
@@ -21,7 +37,7 @@ async def test_ultra_realistic_portrait():
     print("TEST 1: Ultra Realistic Portrait")
     print("="*70)
 
-    result = await free_image_service.generate(
+    result = await _generate(
         prompt=(
             "stunning 25 year old woman with long flowing hair, "
             "piercing green eyes, natural beauty, flawless complexion, "
@@ -47,9 +63,7 @@ async def test_nsfw_level_1():
     print("TEST 2: NSFW Level 1 - Sensual")
     print("="*70)
 
-    await asyncio.sleep(3)  # Rate limit
-
-    result = await free_image_service.generate(
+    result = await _generate(
         prompt=(
             "beautiful 28 year old woman in luxurious bedroom, "
             "wearing elegant lingerie, sensual pose on silk sheets, "
@@ -75,9 +89,7 @@ async def test_nsfw_level_2():
     print("TEST 3: NSFW Level 2 - Explicit Topless")
     print("="*70)
 
-    await asyncio.sleep(3)
-
-    result = await free_image_service.generate(
+    result = await _generate(
         prompt=(
             "gorgeous 26 year old woman with perfect body, "
             "topless nude from waist up, bare breasts visible, "
@@ -104,9 +116,7 @@ async def test_nsfw_level_3():
     print("TEST 4: NSFW Level 3 - Full Frontal Nude")
     print("="*70)
 
-    await asyncio.sleep(3)
-
-    result = await free_image_service.generate(
+    result = await _generate(
         prompt=(
             "stunning 24 year old woman completely naked, "
             "full frontal nudity, full body nude photo, "
@@ -133,9 +143,7 @@ async def test_beach_nude():
     print("TEST 5: Beach Nude Scene")
     print("="*70)
 
-    await asyncio.sleep(3)
-
-    result = await free_image_service.generate(
+    result = await _generate(
         prompt=(
             "beautiful naked woman on private beach at sunset, "
             "completely nude walking in shallow water, "
@@ -163,27 +171,16 @@ async def main():
     print("\nTesting with OPTIMIZED prompts for maximum photorealism")
     print("and explicit NSFW/nude content...")
 
-    results = []
-
-    # Test 1: Portrait (SFW)
-    r1 = await test_ultra_realistic_portrait()
-    results.append(("Portrait SFW", r1))
-
-    # Test 2: Sensual (NSFW 1)
-    r2 = await test_nsfw_level_1()
-    results.append(("Sensual NSFW 1", r2))
-
-    # Test 3: Topless (NSFW 2)
-    r3 = await test_nsfw_level_2()
-    results.append(("Topless NSFW 2", r3))
-
-    # Test 4: Full Nude (NSFW 3)
-    r4 = await test_nsfw_level_3()
-    results.append(("Full Nude NSFW 3", r4))
-
-    # Test 5: Beach Nude
-    r5 = await test_beach_nude()
-    results.append(("Beach Nude", r5))
+    # Independent tests: run together, starts spaced out by the limiter
+    names = ["Portrait SFW", "Sensual NSFW 1", "Topless NSFW 2", "Full Nude NSFW 3", "Beach Nude"]
+    outcomes = await asyncio.gather(
+        test_ultra_realistic_portrait(),
+        test_nsfw_level_1(),
+        test_nsfw_level_2(),
+        test_nsfw_level_3(),
+        test_beach_nude(),
+    )
+    results = list(zip(names, outcomes))
 
     # Summary
     print("\n" + "="*70)
@@ -0,0 +1,86 @@
+"""Test that the critical facts cache never keeps a list older than a store"""
+import asyncio
+import sys
+import os
+import tempfile
+
+# Only when missing: running a script already puts its directory first
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np
+
+from services.vector_memory import VectorMemoryService, CHROMA_AVAILABLE
+from _test_utils import banner
+
+CHARACTER_ID = 1
+
+
+async def test_store_during_recall_critical():
+    """A recall_critical that runs while a store is encoding must not re-cache the old list"""
+    banner("Critical cache: store interleaved with recall_critical", width=60)
+
+    if not CHROMA_AVAILABLE:
+        print("SKIPPED: chromadb not installed (the critical cache only covers Chroma)")
+        return True
+
+    with tempfile.TemporaryDirectory() as persist_dir:
+        memory = VectorMemoryService(redis_url="redis://localhost:1", persist_dir=persist_dir)
+        if not memory.chroma_client:
+            print("SKIPPED: ChromaDB could not start")
+            return True
+
+        # Fixed embeddings, so the test needs no model; encoding parks on `release`
+        release = asyncio.Event()
+        release.set()
+        encoding = asyncio.Event()
+
+        async def fake_embeddings(texts):
+            encoding.set()
+            await release.wait()
+            return np.full((len(texts), 8), 1 / np.sqrt(8), dtype=np.float32)
+
+        async def fake_embedding(text):
+            return (await fake_embeddings([text]))[0]
+
+        memory._compute_embeddings_async = fake_embeddings
+        memory._compute_embedding_async = fake_embedding
+
+        await memory.store_fact(CHARACTER_ID, "My name is Bob", "personal", importance=5)
+        await memory.store_fact(CHARACTER_ID, "I like pizza", "preference", importance=4)
+        print(f"Before: {[f.content for f in await memory.recall_critical(CHARACTER_ID)]}")
+
+        async def interleaved(store):
+            """Park the store on its encode await, recall in between, then let it finish"""
+            release.clear()
+            encoding.clear()
+            task = asyncio.create_task(store)
+            await encoding.wait()
+            print(f"During store: {[f.content for f in await memory.recall_critical(CHARACTER_ID)]}")
+            release.set()
+            await task
+            after = [f.content for f in await memory.recall_critical(CHARACTER_ID)]
+            print(f"After: {after}")
+            return after
+
+        after_single = await interleaved(
+            memory.store_fact(CHARACTER_ID, "I live in Lyon", "personal", importance=5)
+        )
+        after_batch = await interleaved(
+            memory.store_facts_batch(CHARACTER_ID, [
+                {"content": "I work as a nurse", "type": "personal", "importance": 5},
+                {"content": "It rained today", "type": "casual", "importance": 1},
+            ])
+        )
+
+        memory._encode_executor.shutdown(wait=False)
+
+    ok = "I live in Lyon" in after_single and "I work as a nurse" in after_batch
+    print("SUCCESS!" if ok else "FAILED: the cache kept the list from before the store")
+    return ok
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_store_during_recall_critical())
+    sys.exit(0 if success else 1)
@@ -2,19 +2,26 @@
 import asyncio
 import sys
 import os
+from pathlib import Path
 
-# Add parent to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add parent to path, only when missing: running a script already puts its directory first
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
 from image_service import image_service
+import _test_image_cache
+
+SEP = "=" * 60
+DASH = "-" * 60
 
 
 async def test_generation():
     """Test image generation with Z-Image-Turbo"""
 
-    print("=" * 60)
+    print(SEP)
     print("Testing Z-Image-Turbo via fal-ai")
-    print("=" * 60)
+    print(SEP)
 
     # Test prompt - NSFW content similar to your screenshot
     test_prompt = """beautiful woman, long brown hair cascading down her back,
@@ -23,25 +30,28 @@ async def test_generation():
 
     print(f"\nPrompt: {test_prompt[:80]}...")
     print(f"NSFW Level: 3 (explicit)")
-    print("-" * 60)
+    print(DASH)
 
     try:
-        filename = await image_service.generate(
-            prompt=test_prompt,
-            style="realistic",
-            width=1024,
-            height=1024,
-            nsfw=True,
-            nsfw_level=3,
-            seed=42
+        filename = await _test_image_cache.cached_generate(
+            _test_image_cache.make_key(test_prompt, 3, 1024, 1024),
+            lambda: image_service.generate(
+                prompt=test_prompt,
+                style="realistic",
+                width=1024,
+                height=1024,
+                nsfw=True,
+                nsfw_level=3,
+                seed=42
+            )
         )
 
-        filepath = image_service.get_image_path(filename)
-        file_size = os.path.getsize(filepath)
+        filepath = Path(image_service.get_image_path(filename))
+        file_size = filepath.stat().st_size
 
-        print("\n" + "=" * 60)
+        print("\n" + SEP)
         print("SUCCESS!")
-        print("=" * 60)
+        print(SEP)
         print(f"Filename: {filename}")
         print(f"Path: {filepath}")
         print(f"Size: {file_size} bytes")
@@ -50,9 +60,9 @@ async def test_generation():
         return True
 
     except Exception as e:
-        print("\n" + "=" * 60)
+        print("\n" + SEP)
         print("FAILED!")
-        print("=" * 60)
+        print(SEP)
         print(f"Error: {e}")
         return False
 
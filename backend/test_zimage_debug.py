@@ -1,61 +1,119 @@
 """Debug Z-Image-Turbo generation - No size filter"""
 import asyncio
+import io
 import sys
 import os
+from pathlib import Path
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Only when missing: running a script already puts its directory first
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
-from huggingface_hub import InferenceClient
+from huggingface_hub import AsyncInferenceClient
 from config import settings
-from datetime import datetime
-import uuid
+import _test_image_cache
+from _test_utils import make_image_filename
+
+try:
+    import numpy as np
+    import pyspng
+    PYSPNG_AVAILABLE = True
+except ImportError:
+    PYSPNG_AVAILABLE = False
+
+SEP = "=" * 60
+DASH = "-" * 60
+
+
+def save_png(image, filepath: Path) -> int:
+    """
+    Write image as a fast, lightly compressed PNG (debug artifact: size does not matter).
+    Encodes in memory and writes once, returning the byte count so callers need no stat().
+    """
+    if PYSPNG_AVAILABLE:
+        data = pyspng.encode(np.asarray(image.convert("RGB")), compress_level=1)
+    else:
+        buf = io.BytesIO()
+        image.save(buf, "PNG", compress_level=1)
+        data = buf.getvalue()
+
+    with open(filepath, "wb") as f:
+        f.write(data)
+    return len(data)
 
 
 async def test_direct():
     """Test direct API call to Z-Image-Turbo"""
 
-    print("=" * 60)
-    print("Direct Z-Image-Turbo Test via fal-ai")
-    print("=" * 60)
+    # CANDIES_LOCAL_GPU=1: run the pipeline on this machine's GPU instead of fal-ai
+    local_gpu = bool(os.environ.get("CANDIES_LOCAL_GPU"))
+
+    print(SEP)
+    print(f"Direct Z-Image-Turbo Test via {'local CUDA' if local_gpu else 'fal-ai'}")
+    print(SEP)
 
-    token = settings.HF_API_TOKEN
-    print(f"Token: {token[:10]}...{token[-5:]}")
+    if not local_gpu:
+        token = settings.HF_API_TOKEN
+        print(f"Token: {token[:10]}...{token[-5:]}")
 
-    client = InferenceClient(
-        provider="fal-ai",
-        api_key=token
-    )
+        # Async client: the fal-ai round-trip does not block the event loop
+        client = AsyncInferenceClient(
+            provider="fal-ai",
+            api_key=token
+        )
 
     # Simple prompt first
     prompt = "A beautiful woman with long brown hair, photorealistic portrait, professional photography, 8k quality"
 
     print(f"\nPrompt: {prompt}")
-    print("-" * 60)
+    print(DASH)
 
-    try:
+    images_dir = Path(settings.IMAGES_DIR)
+    saved_sizes = {}
+
+    async def generate():
         print("Calling text_to_image...")
 
-        image = client.text_to_image(
-            prompt=prompt,
-            model="Tongyi-MAI/Z-Image-Turbo",
-            width=1024,
-            height=1024,
-            num_inference_steps=8
-        )
+        if local_gpu:
+            import local_zimage
+            image = await asyncio.to_thread(
+                local_zimage.text_to_image,
+                prompt,
+                width=1024,
+                height=1024,
+                num_inference_steps=8
+            )
+        else:
+            image = await client.text_to_image(
+                prompt=prompt,
+                model="Tongyi-MAI/Z-Image-Turbo",
+                width=1024,
+                height=1024,
+                num_inference_steps=8
+            )
 
         print(f"Response type: {type(image)}")
         print(f"Image size: {image.size if hasattr(image, 'size') else 'N/A'}")
         print(f"Image mode: {image.mode if hasattr(image, 'mode') else 'N/A'}")
 
         # Save without checking size
-        images_dir = os.path.join(os.path.dirname(__file__), "images")
-        os.makedirs(images_dir, exist_ok=True)
+        images_dir.mkdir(parents=True, exist_ok=True)
+        filename = make_image_filename("test_debug")
+        saved_sizes[filename] = save_png(image, images_dir / filename)
+        return filename
 
-        filename = f"test_debug_{datetime.now().strftime('%H%M%S')}.png"
-        filepath = os.path.join(images_dir, filename)
-        image.save(filepath, "PNG")
+    try:
+        # Same prompt and settings as the last run: reuse its image
+        filename = await _test_image_cache.cached_generate(
+            _test_image_cache.make_key(prompt, 0, 1024, 1024, backend="local" if local_gpu else "fal-ai"),
+            generate
+        )
 
-        file_size = os.path.getsize(filepath)
+        # Known from the write unless the image came from the cache
+        file_size = saved_sizes.get(filename)
+        if file_size is None:
+            file_size = (images_dir / filename).stat().st_size
         print(f"\nSaved: {filename}")
         print(f"File size: {file_size} bytes ({file_size/1024:.1f} KB)")
 
@@ -1,45 +1,117 @@
 """Test Z-Image-Turbo NSFW Space"""
+import contextlib
 import sys
 import os
 import shutil
-from datetime import datetime
+import threading
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlsplit
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Only when missing: running a script already puts its directory first
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
 
+import httpx
 from gradio_client import Client
+from config import settings
+import _test_image_cache
+from _test_utils import make_image_filename
 
+SEP = "=" * 60
+DASH = "-" * 60
 
-def test_nsfw_generation():
-    """Test NSFW image generation with yingzhac/Z_image_NSFW"""
-
-    print("=" * 60)
-    print("Testing: yingzhac/Z_image_NSFW (Z-Image-Turbo)")
-    print("=" * 60)
-
-    # Connect to space
-    import io
-    old_stdout = sys.stdout
-    sys.stdout = io.StringIO()
-    client = Client("yingzhac/Z_image_NSFW")
-    sys.stdout = old_stdout
 
-    print("Connected!")
+SPACE_NAME = "yingzhac/Z_image_NSFW"
 
-    # NSFW prompt
-    prompt = """masterpiece, best quality, ultra realistic, photorealistic, RAW photo, 8k uhd,
+# NSFW prompt
+PROMPT = """masterpiece, best quality, ultra realistic, photorealistic, RAW photo, 8k uhd,
     beautiful caucasian woman, 25 years old, long brown hair cascading down back,
     on white silk bed sheets, bedroom setting, soft romantic lighting,
     looking directly at camera with seductive bedroom eyes,
     nude, bare breasts, nipples visible, naked body,
     seductive pose, lying on bed, detailed skin texture, sharp focus"""
+CACHE_KEY = _test_image_cache.make_key(PROMPT, 5, 1024, 1024)
+
+# Seconds the warm-up waits for its job; the Space keeps loading after that
+WARMUP_TIMEOUT = 5
+
+_client_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _connect(space_name: str) -> Client:
+    # Suppress the connection banner (discarded, not buffered)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # Files are streamed to IMAGES_DIR by the test, not downloaded to the gradio cache
+        return Client(space_name, download_files=False)
+
+
+def get_space_client(space_name: str) -> Client:
+    """Connected client for space_name, reused by later calls in this process"""
+    # Locked: the warm-up thread and the test may ask at the same time
+    with _client_lock:
+        return _connect(space_name)
+
+
+def _warmup():
+    """Tiny 256x256, 1-step job so a ZeroGPU Space loads its model before the real prompt"""
+    try:
+        job = get_space_client(SPACE_NAME).submit(
+            "test", "", 256, 256, 1, 0.0, 0, False, api_name="/generate_image"
+        )
+        job.result(timeout=WARMUP_TIMEOUT)
+    except Exception:
+        pass
+
+
+# Warm up in the background, unless the test will be served from the image cache
+if not (_test_image_cache.enabled() and _test_image_cache.get(CACHE_KEY)):
+    threading.Thread(target=_warmup, daemon=True).start()
+
+
+def _result_image(result):
+    """First image of a /generate_image result: a local path, or a file dict (url, path)"""
+    match result:
+        case tuple([[{"image": image}, *_], *_]) if image:   # (gallery, seed)
+            return image
+        case tuple([[{"path": path}, *_], *_]):
+            return path
+        case tuple([[str() as path, *_], *_]):
+            return path
+        case str() | dict():                                # single image
+            return result
+    return None
+
+
+def test_nsfw_generation():
+    """Test NSFW image generation with yingzhac/Z_image_NSFW"""
+
+    print(SEP)
+    print(f"Testing: {SPACE_NAME} (Z-Image-Turbo)")
+    print(SEP)
+
+    prompt = PROMPT
+
+    # Same prompt, size, steps and seed as the last run: skip the Space entirely
+    key = CACHE_KEY
+    cached_path = _test_image_cache.get(key) if _test_image_cache.enabled() else None
+    if cached_path is not None:
+        print(f"   (cached) {cached_path.name}")
+        return str(cached_path)
+
+    client = get_space_client(SPACE_NAME)
+    print("Connected!")
 
     print(f"\nPrompt: {prompt[:80]}...")
-    print("-" * 60)
+    print(DASH)
 
     try:
         print("Generating with /generate_image endpoint...")
 
-        result = client.predict(
+        # Queue the job first, then prepare the destination while the Space works
+        job = client.submit(
             prompt,                  # Prompt
             "",                      # Negative Prompt (empty - Z-Image doesn't use it)
             1024,                    # Height
@@ -51,40 +123,48 @@ def test_nsfw_generation():
             api_name="/generate_image"
         )
 
+        images_dir = Path(settings.IMAGES_DIR)
+        images_dir.mkdir(parents=True, exist_ok=True)
+
+        result = job.result()
+
         print(f"\nResult type: {type(result)}")
         print(f"Result: {result}")
 
-        # Handle result - could be tuple (images, seed) or single image
-        image_path = None
-        if isinstance(result, tuple):
-            # (gallery, seed) format
-            gallery = result[0]
-            if isinstance(gallery, list) and len(gallery) > 0:
-                first = gallery[0]
-                if isinstance(first, dict):
-                    image_path = first.get('image') or first.get('path')
-                elif isinstance(first, str):
-                    image_path = first
-        elif isinstance(result, str):
-            image_path = result
-
-        if image_path and os.path.exists(image_path):
-            # Copy to our images folder
-            images_dir = os.path.join(os.path.dirname(__file__), "images")
-            os.makedirs(images_dir, exist_ok=True)
-
-            ext = os.path.splitext(image_path)[1] or ".png"
-            filename = f"zimage_nsfw_{datetime.now().strftime('%H%M%S')}{ext}"
-            dest = os.path.join(images_dir, filename)
-
-            shutil.copy(image_path, dest)
-            file_size = os.path.getsize(dest)
+        image = _result_image(result)
+
+        # download_files=False: files come back as dicts with the remote url
+        url, image_path = None, image
+        if isinstance(image, dict):
+            url, image_path = image.get('url'), image.get('path')
+
+        if url or (image_path and os.path.exists(image_path)):
+            ext = os.path.splitext(image_path or urlsplit(url).path)[1] or ".png"
+            filename = make_image_filename("zimage_nsfw", ext)
+            dest = images_dir / filename
+
+            if url:
+                # Stream straight into our images folder: written once, never buffered whole
+                with httpx.stream("GET", url, timeout=60, follow_redirects=True) as response:
+                    response.raise_for_status()
+                    with open(dest, "wb") as f:
+                        for chunk in response.iter_bytes(65536):
+                            f.write(chunk)
+            else:
+                # Hardlink out of the gradio cache: no bytes copied on the same filesystem
+                try:
+                    os.link(image_path, dest)
+                except OSError:
+                    shutil.copyfile(image_path, dest)
+            if _test_image_cache.enabled():
+                _test_image_cache.put(key, dest)
+            file_size = dest.stat().st_size
 
             print(f"\nSaved: {filename}")
             print(f"Size: {file_size} bytes ({file_size/1024:.1f} KB)")
             print(f"Path: {dest}")
 
-            return dest
+            return str(dest)
         else:
             print(f"No valid image path found in result")
             return None